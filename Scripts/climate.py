@@ -0,0 +1,216 @@
+import time # type: ignore
+import scripts.discord_webhook as discord_webhook
+from scripts.monitors import Monitor
+from scripts.fixedpoint import to_centi, centi_str
+from scripts.pid import TimeProportionalPID
+from scripts.filters import SlopeEstimator
+
+# Controller states
+IDLE = 'idle'         # Inside the band, both relays off
+COOLING = 'cooling'   # AC on
+HEATING = 'heating'   # Heater on
+LOCKOUT = 'lockout'   # Demand, but blocked: no reading, changeover delay or a relay timer
+
+class Setpoint:
+    """
+    Target and swing for one side of the controller, kept as centi-°F ints for
+    the control comparison; target_temp / temp_swing read and write °F for
+    config and display (the scheduler and web handlers use these).
+    """
+    def __init__(self, controller, relay, target_temp, temp_swing):
+        self.controller = controller
+        self.relay = relay
+        self.target_temp = target_temp
+        self.temp_swing = temp_swing
+
+    @property
+    def target_temp(self):
+        return self.target_centi / 100
+
+    @target_temp.setter
+    def target_temp(self, value):
+        self.target_centi = to_centi(value)
+
+    @property
+    def temp_swing(self):
+        return self.swing_centi / 100
+
+    @temp_swing.setter
+    def temp_swing(self, value):
+        self.swing_centi = to_centi(value)
+
+class ClimateController(Monitor):
+    """
+    One decision pass per tick for both relays: idle, cooling, heating or lockout.
+
+    Each tick reads the control probe once from the hub and moves the state
+    machine. Only one relay can be on: a mode starts from idle/lockout only
+    when the other relay is off and `changeover` seconds have passed since the
+    opposite mode ended. ACController / HeaterController still enforce their
+    own min-run and min-off timers; a refused turn_on() shows as lockout and a
+    refused turn_off() keeps the mode until the relay lets go.
+
+    Heating is either hysteresis (on below target - swing, off above target +
+    swing) or, after configure_pid(), a time-proportioning PID that calls for
+    heat during the on-part of each window.
+
+    With ac_lead set, cooling also stops early when the temperature trend (a
+    least-squares slope over the last trend_window decisions) predicts the
+    off threshold will be crossed within ac_lead seconds: the room keeps
+    cooling after the compressor stops, so this trims the overshoot.
+    """
+
+    def __init__(self, ac_controller, heater_controller, sensor_hub, sensor_key='inside',
+                 ac_target=75.0, ac_swing=2.0, heater_target=70.0, heater_swing=2.0,
+                 changeover=300, interval=30, ac_lead=0, trend_window=6):
+        """
+        Args:
+            ac_controller: ACController instance
+            heater_controller: HeaterController instance
+            sensor_hub: SensorHub instance (shared cached readings)
+            sensor_key: Key of the control probe in the hub
+            ac_target / ac_swing: Cooling setpoint and band in °F
+            heater_target / heater_swing: Heating setpoint and band in °F
+            changeover: Seconds between one mode ending and the opposite one starting
+            interval: Seconds between decisions
+            ac_lead: Seconds of look-ahead for switching the AC off early (0 = off)
+            trend_window: Decisions in the temperature trend fit
+        """
+        super().__init__(interval)
+        self.hub = sensor_hub
+        self.sensor_key = sensor_key
+        self.cooling = Setpoint(self, ac_controller, ac_target, ac_swing)
+        self.heating = Setpoint(self, heater_controller, heater_target, heater_swing)
+        self.changeover_ms = int(changeover * 1000)
+        self.state = IDLE
+        self.state_since = time.ticks_ms()
+        self.lockout_reason = None
+        self.last_temp = None       # Reading the last decision used (centi-°F)
+        self.mode_ended = {}        # {COOLING/HEATING: ticks_ms the mode last ended}
+        self.pid = None             # TimeProportionalPID when heating runs in PID mode
+        self.ac_lead = ac_lead
+        self.trend = SlopeEstimator(trend_window)
+        self.trend_rate = None      # centi-°F per minute (None until the trend window fills)
+
+    def configure_pid(self, enabled, kp=30.0, ki=1.0, kd=0.0, window=600):
+        """Switch heating between hysteresis and time-proportioning PID (gains: see TimeProportionalPID)."""
+        if not enabled:
+            self.pid = None
+            return
+        heater = self.heating.relay
+        if self.pid is None or self.pid.window_ms != int(window * 1000):
+            self.pid = TimeProportionalPID(kp, ki, kd, window, heater.min_run_time, heater.min_off_time)
+        else:
+            self.pid.set_gains(kp, ki, kd)  # Keep the integral: retuning shouldn't bump the output
+
+    def _set_state(self, state, reason=None):
+        if state != self.state:
+            print("🌡️ Climate: {} -> {}{}".format(self.state, state, " ({})".format(reason) if reason else ""))
+            self.state = state
+            self.state_since = time.ticks_ms()
+        self.lockout_reason = reason
+
+    def run(self):
+        """Read the control probe once and drive both relays."""
+        temp = self.hub.get_centi(self.sensor_key)
+        self.last_temp = temp
+        self._update_trend(temp)
+        heat_call = self._heat_call(temp)
+        if self.state == COOLING:
+            self._run_mode(COOLING, self.cooling, temp, self._cool_satisfied(temp))
+        elif self.state == HEATING:
+            # Never heat into the AC band, whatever the PID integral says
+            self._run_mode(HEATING, self.heating, temp, not heat_call or temp > self.cooling.target_centi + self.cooling.swing_centi)
+        else:
+            self._start_mode(temp, heat_call)
+
+    def _update_trend(self, temp):
+        """Feed the slope fit; a missing reading breaks the even spacing, so start over."""
+        if temp is None:
+            self.trend.reset()
+            self.trend_rate = None
+            return
+        self.trend.push(temp)
+        slope = self.trend.slope(60)  # centi-°F per decision x 60
+        self.trend_rate = slope // self.interval if slope is not None else None
+
+    def _cool_satisfied(self, temp):
+        """Below the off threshold now, or predicted to be within ac_lead seconds."""
+        if temp is None:
+            return False
+        threshold = self.cooling.target_centi - self.cooling.swing_centi
+        if temp < threshold:
+            return True
+        if not self.ac_lead or self.trend_rate is None or self.trend_rate >= 0:
+            return False
+        return temp + self.trend_rate * self.ac_lead // 60 < threshold
+
+    def _heat_call(self, temp):
+        """Whether heating wants the relay on: PID window on-phase, or the hysteresis band."""
+        if temp is None:
+            return False
+        if self.pid is None:
+            if self.state == HEATING:
+                return temp <= self.heating.target_centi + self.heating.swing_centi
+            return temp < self.heating.target_centi - self.heating.swing_centi
+        if self.state == COOLING:
+            self.pid.reset()  # No integral build-up while the AC is fighting the other way
+            return False
+        self.pid.update(self.heating.target_centi, temp)
+        return self.pid.output()
+
+    def _run_mode(self, mode, side, temp, satisfied):
+        """Keep the running mode until its band is satisfied (or the reading is lost) and the relay turns off."""
+        if not side.relay.get_state():
+            # Forced off elsewhere (web, safety): the mode is over
+            self._end_mode(mode, side, temp)
+            return
+        if temp is None or satisfied:
+            if side.relay.turn_off():
+                self._end_mode(mode, side, temp)
+
+    def _end_mode(self, mode, side, temp):
+        self.mode_ended[mode] = time.ticks_ms()
+        if temp is None:
+            self._set_state(LOCKOUT, "no reading")
+        else:
+            self._set_state(IDLE)
+        if mode == HEATING and self.pid is not None:
+            return  # PID cycles the heater every window; not worth a message each time
+        if mode == COOLING:
+            discord_webhook.queue_discord_message("✅ AC turned OFF - Current: {}°F, Target: {}°F".format(centi_str(temp), centi_str(side.target_centi)))
+        else:
+            discord_webhook.queue_discord_message("✅ Heater turned OFF - Current: {}°F, Target: {}°F".format(centi_str(temp), centi_str(side.target_centi)))
+
+    def _start_mode(self, temp, heat_call):
+        """From idle/lockout: start cooling or heating if the reading calls for it and nothing blocks it."""
+        if temp is None:
+            self._set_state(LOCKOUT, "no reading")
+            return
+        too_hot = temp > self.cooling.target_centi + self.cooling.swing_centi
+        too_cold = heat_call
+        if too_hot and too_cold:
+            self._set_state(LOCKOUT, "heater band overlaps AC band")
+            return
+        if not (too_hot or too_cold):
+            self._set_state(IDLE)
+            return
+        mode, side, other, opposite = (COOLING, self.cooling, self.heating, HEATING) if too_hot else (HEATING, self.heating, self.cooling, COOLING)
+        if other.relay.get_state():
+            other.relay.turn_off()  # Normally already off; never run both
+            self._set_state(LOCKOUT, "{} relay still on".format(opposite))
+            return
+        ended = self.mode_ended.get(opposite)
+        if ended is not None and time.ticks_diff(time.ticks_ms(), ended) < self.changeover_ms:
+            self._set_state(LOCKOUT, "changeover")
+            return
+        if not side.relay.turn_on():
+            self._set_state(LOCKOUT, "relay min-off")
+            return
+        self._set_state(mode)
+        if mode == HEATING and self.pid is not None:
+            return
+        if mode == COOLING:
+            discord_webhook.queue_discord_message("❄️ AC turned ON - Current: {}°F, Target: {}°F".format(centi_str(temp), centi_str(side.target_centi)))
+        else:
+            discord_webhook.queue_discord_message("🔥 Heater turned ON - Current: {}°F, Target: {}°F".format(centi_str(temp), centi_str(side.target_centi)))
@@ -0,0 +1,150 @@
+import time # type: ignore
+from scripts.flash_io import read_json, write_json
+
+CONFIG_FILE = 'config.json'
+# A write waits this long after the last change, so a burst (one web form,
+# a schedule transition) costs one flash write instead of one per key
+FLUSH_DELAY_MS = 10000
+# ...but never longer than this after the first unsaved change
+FLUSH_MAX_DELAY_MS = 60000
+# Hold state is reset on every boot, so writing it to flash buys nothing
+RAM_ONLY = ('schedule_enabled', 'permanent_hold', 'temp_hold_start_time')
+
+class ConfigStore:
+    """
+    The live configuration, shared by main.py, the monitors and the web server.
+
+    config.json is read from flash once, at boot (load()). After that every
+    reader uses this object and every change goes through set() (or
+    config['key'] = value), which bumps `version` and calls the subscribers
+    of that key. The dict reads the rest of the code already uses
+    (config['key'], config.get(), `in`) work unchanged.
+
+    Changes to persistent keys only mark the store dirty; flush(), run from a
+    runtime job, writes config.json once the changes have settled for
+    FLUSH_DELAY_MS. RAM_ONLY keys never reach flash.
+    """
+
+    def __init__(self, data=None, path=CONFIG_FILE):
+        self.data = data if data is not None else {}
+        self.path = path
+        self.version = 0         # Bumped on every change (cheap "has anything changed" check)
+        self._subscribers = []   # [(keys or None for all, fn(store, key))]
+        self.dirty_since = None  # ticks_ms of the first unsaved change (None = flash is current)
+        self.changed_at = 0      # ticks_ms of the latest unsaved change
+        self.writes = 0          # config.json writes this boot (flash wear)
+
+    def load(self):
+        """Read the config file (boot only). Returns False if it is missing or unreadable."""
+        data = read_json(self.path)
+        if data is None:
+            return False
+        self.data = data
+        self.version += 1
+        return True
+
+    def mark_dirty(self):
+        """Queue a write of the whole config (set() does this for persistent keys)."""
+        now = time.ticks_ms()
+        if self.dirty_since is None:
+            self.dirty_since = now
+        self.changed_at = now
+
+    def flush(self, force=False):
+        """
+        Write config.json if there are unsaved changes that have settled (or
+        force), through flash_io.write_json() (temp file + rename). Returns
+        True if the file was written.
+        """
+        if self.dirty_since is None:
+            return False
+        now = time.ticks_ms()
+        if not force and time.ticks_diff(now, self.changed_at) < FLUSH_DELAY_MS \
+                and time.ticks_diff(now, self.dirty_since) < FLUSH_MAX_DELAY_MS:
+            return False
+        data = {key: value for key, value in self.data.items() if key not in RAM_ONLY}
+        try:
+            write_json(self.path, data)
+        except Exception as e:
+            print("❌ Error saving config: {}".format(e))
+            return False
+        self.dirty_since = None
+        self.writes += 1
+        return True
+
+    # ===== START: Dict-style access =====
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def keys(self):
+        return self.data.keys()
+
+    def items(self):
+        return self.data.items()
+    # ===== END: Dict-style access =====
+
+    # ===== START: Typed accessors =====
+    def get_float(self, key, default=0.0):
+        """`key` as a float (default if missing or not a number)."""
+        try:
+            return float(self.data.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_int(self, key, default=0):
+        """`key` as an int (default if missing or not a number)."""
+        try:
+            return int(self.data.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key, default=False):
+        """`key` as a bool; accepts true/false, 0/1 and 'true'/'false' strings."""
+        value = self.data.get(key, default)
+        if isinstance(value, str):
+            return value.lower() in ('1', 'true', 'yes', 'on')
+        return bool(value)
+
+    def get_str(self, key, default=''):
+        """`key` as a string (default if missing or null)."""
+        value = self.data.get(key)
+        return default if value is None else str(value)
+    # ===== END: Typed accessors =====
+
+    def set(self, key, value):
+        """Change one key. Returns True if it changed (subscribers have been called)."""
+        old = self.data.get(key)
+        # The same list/dict counts as a change: the caller edited it in place
+        if key in self.data and old == value and not (old is value and isinstance(value, (list, dict))):
+            return False
+        self.data[key] = value
+        self.version += 1
+        if key not in RAM_ONLY:
+            self.mark_dirty()
+        for keys, fn in self._subscribers:
+            if keys is None or key in keys:
+                try:
+                    fn(self, key)
+                except Exception as e:
+                    print("Config subscriber error ({}): {}".format(key, e))
+        return True
+
+    def update(self, values):
+        """set() every key of a dict. Returns the keys that changed."""
+        return [key for key, value in values.items() if self.set(key, value)]
+
+    def subscribe(self, fn, keys=None):
+        """Call fn(store, key) after `key` changes (any key in `keys`; None = every key)."""
+        self._subscribers.append((keys, fn))
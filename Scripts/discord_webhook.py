@@ -1,7 +1,18 @@
+import scripts.gc_policy as gc_policy
+from scripts.runtime import asyncio
+
 # Minimal module-level state (only what we need)
 _CONFIG = {"discord_webhook_url": None, "discord_alert_webhook_url": None}
 # Cooldown after low-memory failures (epoch seconds)
 _NEXT_ALLOWED_SEND_TS = 0
+# Free heap needed for urequests + TLS handshake (from device testing)
+TLS_HEADROOM = 95000
+# Messages waiting for the background sender: [message, is_alert, attempts]
+_OUTBOX = []
+_OUTBOX_MAX = 8        # Bound RAM use if the network is down for a while
+_MAX_ATTEMPTS = 3
+# A background post (connect, TLS handshake, request, status line) is abandoned after this
+POST_TIMEOUT_S = 15
 
 def set_config(cfg: dict):
     """Initialize module with minimal values from loaded config (call from main)."""
@@ -27,6 +38,44 @@ def _escape_json_str(s: str) -> str:
     s = s.replace("\t", "\\t")
     return s
 
+def _split_url(url):
+    """'https://host[:port]/path' -> (host, port, path, use_tls)."""
+    url = str(url).strip().strip('\'"')
+    use_tls = not url.startswith('http://')
+    if '://' in url:
+        url = url.split('://', 1)[1]
+    slash = url.find('/')
+    host, path = (url, '/') if slash < 0 else (url[:slash], url[slash:])
+    port = 443 if use_tls else 80
+    if ':' in host:
+        host, port = host.split(':', 1)
+        port = int(port)
+    return host, port, path, use_tls
+
+def _payload(message, username):
+    content = _escape_json_str(str(message)[:140])
+    user = _escape_json_str(str(username)[:32])
+    return ('{"content":"%s","username":"%s"}' % (content, user)).encode("utf-8")
+
+def _backing_off():
+    """True while the cooldown after a low-memory failure runs."""
+    try:
+        import time  # type: ignore
+        return bool(_NEXT_ALLOWED_SEND_TS) and time.time() < _NEXT_ALLOWED_SEND_TS
+    except:
+        return False
+
+def _note_failure(e):
+    """Log a failed send; start the cooldown if it ran out of memory."""
+    global _NEXT_ALLOWED_SEND_TS
+    print("Discord send failed:", e)
+    try:
+        if ("ENOMEM" in str(e)) or isinstance(e, MemoryError):
+            import time  # type: ignore
+            _NEXT_ALLOWED_SEND_TS = time.time() + 60
+    except:
+        pass
+
 def send_discord_message(message, username="Auto Garden Bot", is_alert=False, debug: bool = False):
     """
     Send Discord message with aggressive GC and low-memory guard to avoid ENOMEM.
@@ -41,26 +90,21 @@ def send_discord_message(message, username="Auto Garden Bot", is_alert=False, de
         return False
 
     # Respect cooldown if we recently saw ENOMEM
-    try:
-        import time  # type: ignore
-        now = time.time()
-        if _NEXT_ALLOWED_SEND_TS and now < _NEXT_ALLOWED_SEND_TS:
-            if debug: print("DBG: backing off until", _NEXT_ALLOWED_SEND_TS)
-            return False
-    except:
-        pass
+    if _backing_off():
+        if debug: print("DBG: backing off until", _NEXT_ALLOWED_SEND_TS)
+        return False
 
     try:
-        # Lightweight local imports and GC
+        # Lightweight local imports; collect before the TLS setup allocations
         import gc  # type: ignore
         import time  # type: ignore
 
-        gc.collect()
+        gc_policy.prepare(TLS_HEADROOM)
 
         # Quick mem check before importing urequests/SSL
         mem = getattr(gc, "mem_free", lambda: None)()
         # Require larger headroom based on device testing (adjust if you re-test)
-        if mem is not None and mem < 95000:
+        if mem is not None and mem < TLS_HEADROOM:
             print("Discord send skipped: ENOMEM ({} bytes free)".format(mem))
             return False
 
@@ -75,16 +119,14 @@ def send_discord_message(message, username="Auto Garden Bot", is_alert=False, de
                 pass
             return False
 
-        gc.collect()
+        gc_policy.prepare(TLS_HEADROOM)  # Reclaim import garbage before the handshake
         if debug:
             try: print("DBG: mem after import:", gc.mem_free() // 1024, "KB")
             except: pass
 
         # Build tiny payload
         url = str(url).strip().strip('\'"')
-        content = _escape_json_str(str(message)[:140])
-        user = _escape_json_str(str(username)[:32])
-        body_bytes = ('{"content":"%s","username":"%s"}' % (content, user)).encode("utf-8")
+        body_bytes = _payload(message, username)
         headers = {"Content-Type": "application/json"}
 
         resp = requests.post(url, data=body_bytes, headers=headers)
@@ -93,13 +135,7 @@ def send_discord_message(message, username="Auto Garden Bot", is_alert=False, de
         return bool(status and 200 <= status < 300)
 
     except Exception as e:
-        print("Discord send failed:", e)
-        try:
-            if ("ENOMEM" in str(e)) or isinstance(e, MemoryError):
-                import time  # type: ignore
-                _NEXT_ALLOWED_SEND_TS = time.time() + 60
-        except:
-            pass
+        _note_failure(e)
         return False
 
     finally:
@@ -112,8 +148,6 @@ def send_discord_message(message, username="Auto Garden Bot", is_alert=False, de
         try:
             if 'resp' in locals(): del resp
             if 'body_bytes' in locals(): del body_bytes
-            if 'content' in locals(): del content
-            if 'user' in locals(): del user
             if 'headers' in locals(): del headers
             if 'requests' in locals(): del requests
         except:
@@ -129,8 +163,80 @@ def send_discord_message(message, username="Auto Garden Bot", is_alert=False, de
                         pass
         except:
             pass
+        # No collection here: the next prepare() or idle check reclaims it
+
+def queue_discord_message(message, is_alert=False):
+    """
+    Queue a message for the runtime's Discord task instead of posting inline.
+    Control paths call this so a slow HTTPS post never delays relay decisions.
+    Returns False if no webhook is configured for this message.
+    """
+    if not _get_webhook_url(is_alert=is_alert):
+        return False
+    if len(_OUTBOX) >= _OUTBOX_MAX:
+        _OUTBOX.pop(0)  # Drop oldest, newest state matters most
+    _OUTBOX.append([message, is_alert, 0])
+    return True
+
+async def post_discord_message(message, username="Auto Garden Bot", is_alert=False):
+    """
+    Post a message over a uasyncio stream: the connect, TLS handshake and
+    response all await socket I/O, so the runtime keeps dispatching relay
+    and sensor jobs while a post is in flight. Only the DNS lookup and the
+    handshake's crypto steps run without yielding. Returns True on a 2xx.
+    """
+    url = _get_webhook_url(is_alert=is_alert)
+    if not url or _backing_off():
+        return False
+    import gc  # type: ignore
+    gc_policy.prepare(TLS_HEADROOM)
+    mem = getattr(gc, "mem_free", lambda: None)()
+    if mem is not None and mem < TLS_HEADROOM:
+        print("Discord send skipped: ENOMEM ({} bytes free)".format(mem))
+        return False
+    host, port, path, use_tls = _split_url(url)
+    body = _payload(message, username)
+    writer = None
+    try:
         try:
-            import gc # type: ignore
-            gc.collect()
-        except:
-            pass
\ No newline at end of file
+            reader, writer = await asyncio.open_connection(host, port, ssl=True if use_tls else None)
+        except TypeError:
+            # Firmware whose asyncio streams can't do TLS (before MicroPython 1.22): blocking post
+            return send_discord_message(message, username, is_alert)
+        writer.write(("POST {} HTTP/1.0\r\nHost: {}\r\nContent-Type: application/json\r\n"
+                      "Content-Length: {}\r\nConnection: close\r\n\r\n").format(path, host, len(body)).encode("utf-8"))
+        writer.write(body)
+        await writer.drain()
+        status_line = await reader.readline()  # b'HTTP/1.1 204 No Content\r\n'
+        parts = status_line.split()
+        status = int(parts[1]) if len(parts) > 1 else 0
+        return 200 <= status < 300
+    except Exception as e:
+        _note_failure(e)
+        return False
+    finally:
+        if writer is not None:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+async def send_pending():
+    """Post the oldest queued message (a runtime job, runs as its own task). Returns True if one was sent."""
+    if not _OUTBOX:
+        return False
+    entry = _OUTBOX[0]
+    try:
+        sent = await asyncio.wait_for(post_discord_message(entry[0], is_alert=entry[1]), POST_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        print("Discord send timed out")
+        sent = False
+    if sent:
+        _OUTBOX.pop(0)
+        return True
+    entry[2] += 1
+    if entry[2] >= _MAX_ATTEMPTS:
+        print("Discord message dropped after {} attempts".format(entry[2]))
+        _OUTBOX.pop(0)
+    return False
@@ -0,0 +1,111 @@
+from array import array
+
+class SensorFilter:
+    """
+    Spike-rejecting smoother for one probe, in integer centi-degrees.
+
+    Samples go into a ring buffer (array('h')); each push takes the median of
+    the window (drops single-sample glitches) and feeds it to an integer EMA
+    (smooths the rest). Everything is preallocated, so push() doesn't allocate.
+    """
+
+    def __init__(self, window=5, alpha_pct=25):
+        """
+        Args:
+            window: Median window in samples (odd, small: 3-7)
+            alpha_pct: EMA weight of each new median in percent (100 = no smoothing)
+        """
+        self.window = window
+        self.alpha_pct = alpha_pct
+        self.buf = array('h', [0] * window)       # Ring buffer of raw samples
+        self._scratch = array('h', [0] * window)  # Sort space for the median
+        self.head = 0
+        self.count = 0
+        self.raw = 0      # Last raw sample
+        self.ema = 0      # Filtered value
+
+    def push(self, centi):
+        """Add a sample (centi-degrees) and return the filtered value (centi-degrees)."""
+        self.raw = centi
+        self.buf[self.head] = centi
+        self.head = (self.head + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+        med = self.median()
+        if self.count == 1:
+            self.ema = med
+        else:
+            self.ema += ((med - self.ema) * self.alpha_pct + 50) // 100
+        return self.ema
+
+    def median(self):
+        """Median of the samples in the window (insertion sort in scratch space)."""
+        n = self.count
+        if not n:
+            return 0
+        s = self._scratch
+        buf = self.buf
+        for i in range(n):
+            v = buf[i]
+            j = i - 1
+            while j >= 0 and s[j] > v:
+                s[j + 1] = s[j]
+                j -= 1
+            s[j + 1] = v
+        mid = n // 2
+        if n % 2:
+            return s[mid]
+        return (s[mid - 1] + s[mid]) // 2
+
+    def reset(self):
+        self.head = 0
+        self.count = 0
+
+class SlopeEstimator:
+    """
+    Least-squares slope of the last `window` evenly spaced samples, O(1) per push.
+
+    Keeps running sums of y and x*y (x = 0..n-1, oldest first); when the
+    window slides every x drops by one, so sum_xy loses sum_y (minus the
+    sample leaving) and gains (n-1) * the new sample. Sum x and sum x^2 are
+    constants of n, so the slope needs no loop over the buffer.
+    """
+
+    def __init__(self, window=6):
+        n = window
+        self.window = n
+        self.buf = array('l', [0] * n)
+        self.sum_x = n * (n - 1) // 2
+        self.denom = n * n * (n * n - 1) // 12   # n*sum(x^2) - sum(x)^2
+        self.reset()
+
+    def reset(self):
+        self.head = 0     # Oldest sample once the window is full
+        self.count = 0
+        self.sum_y = 0
+        self.sum_xy = 0
+
+    def push(self, y):
+        n = self.window
+        if self.count < n:
+            self.buf[self.count] = y
+            self.sum_xy += self.count * y
+            self.sum_y += y
+            self.count += 1
+            return
+        oldest = self.buf[self.head]
+        self.sum_xy += (n - 1) * y - (self.sum_y - oldest)
+        self.sum_y += y - oldest
+        self.buf[self.head] = y
+        self.head = (self.head + 1) % n
+
+    def ready(self):
+        """True once the window is full (slope() is None before that)."""
+        return self.count == self.window
+
+    def slope(self, scale=1):
+        """Slope in units per sample x `scale` (integer), or None until the window is full."""
+        if self.count < self.window:
+            return None
+        num = self.window * self.sum_xy - self.sum_x * self.sum_y
+        return num * scale // self.denom
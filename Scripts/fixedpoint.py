@@ -0,0 +1,28 @@
+# Temperatures travel through the firmware as integer centi-degrees Fahrenheit
+# (7245 == 72.45°F): small ints never touch the heap on MicroPython, floats do.
+# Convert with these helpers only at the edges (config, forms, display).
+
+def to_centi(value):
+    """Degrees (float, int or numeric string) to centi-degrees (None stays None)."""
+    if value is None:
+        return None
+    value = float(value)
+    return int(value * 100 + (0.5 if value >= 0 else -0.5))
+
+def raw_to_centi_f(raw):
+    """DS18B20 scratchpad reading (signed, 1/16 °C) to centi-°F, integer only."""
+    # °F x 100 = raw / 16 * 9 / 5 * 100 + 3200 = raw * 45 / 4 + 3200
+    return (raw * 45 + 2) // 4 + 3200
+
+def centi_str(centi, places=1):
+    """Format centi-degrees with `places` decimals (0-2), rounding half away from zero."""
+    if centi is None:
+        return "N/A"
+    sign = '-' if centi < 0 else ''
+    centi = -centi if centi < 0 else centi
+    if places >= 2:
+        return "{}{}.{:02d}".format(sign, centi // 100, centi % 100)
+    if places == 1:
+        tenths = (centi + 5) // 10
+        return "{}{}.{}".format(sign, tenths // 10, tenths % 10)
+    return "{}{}".format(sign, (centi + 50) // 100)
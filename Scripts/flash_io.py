@@ -0,0 +1,28 @@
+import json
+import os
+
+def write_json(path, data):
+    """
+    Write `data` as JSON to path + '.tmp', then rename it over `path`, so a
+    power cut leaves the old file or the new one, never half of one.
+    Raises on failure.
+    """
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    try:
+        os.rename(tmp, path)  # littlefs / POSIX: replaces `path` in one step
+    except OSError:
+        # FAT can't rename over an existing file; read_json() covers the gap
+        os.remove(path)
+        os.rename(tmp, path)
+
+def read_json(path):
+    """JSON from `path`, else from the .tmp of a write cut short before its rename; None if neither loads."""
+    for name in (path, path + '.tmp'):
+        try:
+            with open(name, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return None
@@ -0,0 +1,109 @@
+import gc # type: ignore
+import time # type: ignore
+
+# ===== START: Policy settings =====
+# MicroPython collects by itself once this many bytes were allocated since the last collection
+THRESHOLD = 24 * 1024
+# Collect early (during idle time) if the heap gets this low
+LOW_WATER = 40 * 1024
+# Before a known large allocation, skip collecting if less than this was allocated since the last one
+PREPARE_MIN = 2 * 1024
+# ===== END: Policy settings =====
+
+# Telemetry for collections made through this module ('auto' counts the ones
+# gc.threshold() ran by itself; those are only noticed afterwards, so unlike
+# 'count' they carry no pause time)
+_STATS = {'count': 0, 'forced': 0, 'total_us': 0, 'worst_us': 0, 'skipped': 0, 'auto': 0}
+_last_alloc = 0      # gc.mem_alloc() right after the last collection
+_last_check_ms = 0   # When maybe_collect() last sampled the allocation rate
+_last_check_alloc = 0
+_rate = 0            # Allocation rate in bytes/second (moving average)
+
+def _mem_alloc():
+    return gc.mem_alloc() if hasattr(gc, 'mem_alloc') else 0
+
+def _mem_free():
+    return gc.mem_free() if hasattr(gc, 'mem_free') else None
+
+def _ticks_us():
+    if hasattr(time, 'ticks_us'):
+        return time.ticks_us()
+    return int(time.perf_counter() * 1000000)
+
+def _ticks_diff_us(end, start):
+    if hasattr(time, 'ticks_diff'):
+        return time.ticks_diff(end, start)  # ticks_us() wraps every 2**30 us (~18 min)
+    return end - start
+
+def setup(threshold=THRESHOLD):
+    """Hand routine collection to MicroPython's allocation threshold (call once at boot)."""
+    global _last_alloc
+    if hasattr(gc, 'threshold'):
+        gc.threshold(threshold)
+    _last_alloc = _mem_alloc()
+
+def collect():
+    """Run a timed collection. Returns the pause in microseconds."""
+    global _last_alloc
+    start = _ticks_us()
+    gc.collect()
+    pause = _ticks_diff_us(_ticks_us(), start)
+    _STATS['count'] += 1
+    _STATS['total_us'] += pause
+    if pause > _STATS['worst_us']:
+        _STATS['worst_us'] = pause
+    _last_alloc = _mem_alloc()
+    return pause
+
+def prepare(nbytes):
+    """
+    Force a collection before a known large allocation (TLS setup, page render),
+    unless one just ran and the heap already has room for `nbytes`.
+    """
+    free = _mem_free()
+    if free is not None and free >= nbytes and _mem_alloc() - _last_alloc < PREPARE_MIN:
+        _STATS['skipped'] += 1
+        return 0
+    _STATS['forced'] += 1
+    return collect()
+
+def maybe_collect(period=5):
+    """
+    Periodic check (call every `period` seconds): collect only if the heap is
+    getting low, or if the allocation rate says the automatic threshold would
+    otherwise trip before the next check (collecting now, while idle, is cheaper
+    than collecting mid-task).
+    """
+    global _last_check_ms, _last_check_alloc, _last_alloc, _rate
+    free = _mem_free()
+    if free is None:
+        return False  # CPython: leave it to the host collector
+    alloc_now = _mem_alloc()
+    if alloc_now < _last_alloc:
+        _last_alloc = alloc_now  # The automatic threshold collected in between
+        _STATS['auto'] += 1      # At least one; several between checks count once
+    now = time.ticks_ms()
+    if _last_check_ms:
+        elapsed = time.ticks_diff(now, _last_check_ms)
+        grown = alloc_now - _last_check_alloc
+        if grown < 0:
+            grown = alloc_now - _last_alloc
+        if elapsed > 0:
+            _rate = (_rate + grown * 1000 // elapsed) // 2  # Smoothed bytes/second
+    _last_check_ms = now
+    _last_check_alloc = alloc_now
+    if free < LOW_WATER or (alloc_now - _last_alloc) + _rate * period >= THRESHOLD:
+        collect()
+        _last_check_alloc = _last_alloc
+        return True
+    _STATS['skipped'] += 1
+    return False
+
+def stats():
+    """
+    Return collection counts, total and worst pause (us), skipped checks and
+    alloc rate (B/s). The pause figures cover 'count' only, not 'auto'.
+    """
+    result = dict(_STATS)
+    result['alloc_rate'] = _rate
+    return result
@@ -1,5 +1,6 @@
 from machine import Pin # type: ignore
 import time # type: ignore
+from scripts.relay_stats import RelayStats
 
 class HeaterController:
     """Control heater via opto-coupler relay."""
@@ -17,6 +18,7 @@ class HeaterController:
         
         self.is_on = False
         self.last_state_change = time.ticks_ms()
+        self.stats = RelayStats()  # Run-time / cycle counters (persisted by main.py)
     
     def turn_on(self):
         """Turn heater on if minimum off time has elapsed."""
@@ -29,11 +31,13 @@ class HeaterController:
         if time_since_change < self.min_off_time:
             remaining = int(self.min_off_time - time_since_change)
             print(f"Heater cooldown: {remaining}s remaining before can turn on")
+            self.stats.blocked(True)
             return False
         
         self.relay.on()
         self.is_on = True
         self.last_state_change = now
+        self.stats.started(now)
         print("Heater turned ON")
         return True
     
@@ -48,11 +52,13 @@ class HeaterController:
         if time_since_change < self.min_run_time:
             remaining = int(self.min_run_time - time_since_change)
             print(f"Heater minimum runtime: {remaining}s remaining before can turn off")
+            self.stats.blocked(False)
             return False
         
         self.relay.off()
         self.is_on = False
         self.last_state_change = now
+        self.stats.stopped(now)
         print("Heater turned OFF")
         return True
     
@@ -65,4 +71,5 @@ class HeaterController:
         self.relay.off()
         self.is_on = False
         self.last_state_change = time.ticks_ms()
+        self.stats.stopped(self.last_state_change)
         print("Heater FORCE OFF")
\ No newline at end of file
@@ -0,0 +1,92 @@
+# Tick length for the pattern engine (every step duration is a multiple of it)
+TICK_MS = 50
+
+# ===== START: Patterns =====
+# Step durations in ms, alternating LED on / off and starting with on.
+# An empty pattern keeps the LED off.
+PATTERNS = {
+    'off': (),
+    'connected': (1000, 4000),                              # Slow heartbeat
+    'disconnected': (200, 300),                             # Fast blink
+    'reconnecting': (500, 500),                             # Even toggle while joining
+    'error': (100, 100, 100, 100, 100, 1500),               # Triple flash
+}
+# ===== END: Patterns =====
+
+class LedPatterns:
+    """
+    Drives the onboard LED through named blink patterns in the background.
+
+    Patterns advance from a periodic machine.Timer, so callers only pick a
+    pattern with set() and never sleep to blink. Without a usable Timer the
+    runtime can call tick() every TICK_MS instead.
+    """
+
+    def __init__(self, led):
+        """
+        Args:
+            led: machine.Pin (or anything with on()/off())
+        """
+        self.led = led
+        self.pattern = 'off'
+        self._steps = ()
+        self._step = 0
+        self._left_ms = 0
+        self._timer = None
+
+    def start(self):
+        """Start the hardware timer. Returns False if none is available (use tick() instead)."""
+        try:
+            from machine import Timer # type: ignore
+            self._timer = Timer(period=TICK_MS, mode=Timer.PERIODIC, callback=self._on_timer)
+            return True
+        except Exception as e:
+            print("LED timer unavailable ({}), using runtime ticks".format(e))
+            self._timer = None
+            return False
+
+    def stop(self):
+        """Stop the timer and turn the LED off."""
+        if self._timer:
+            try:
+                self._timer.deinit()
+            except Exception:
+                pass
+            self._timer = None
+        self._steps = ()
+        self.led.off()
+
+    def set(self, name):
+        """Switch to pattern `name` (restarts it only if it changed)."""
+        if name == self.pattern:
+            return
+        steps = PATTERNS.get(name)
+        if steps is None:
+            print("Unknown LED pattern: {}".format(name))
+            return
+        self.pattern = name
+        self._steps = steps
+        self._step = 0
+        if steps:
+            self._left_ms = steps[0]
+            self.led.on()
+        else:
+            self.led.off()
+
+    def _on_timer(self, timer):
+        self.tick()
+
+    def tick(self):
+        """Advance the current pattern by one TICK_MS step (no allocation)."""
+        steps = self._steps
+        if not steps:
+            return
+        self._left_ms -= TICK_MS
+        if self._left_ms > 0:
+            return
+        self._step = (self._step + 1) % len(steps)
+        self._left_ms = steps[self._step]
+        if self._step % 2:
+            self.led.off()
+        else:
+            self.led.on()
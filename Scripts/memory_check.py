@@ -1,7 +1,10 @@
 import gc # type: ignore
 
-def check_memory_once():
-    """One-time memory check (for startup diagnostics)."""
+def check_memory_once(timings=None):
+    """
+    One-time memory check (for startup diagnostics).
+    timings: Optional [(step, ms), ...] printed as boot timing
+    """
     gc.collect()
     free = gc.mem_free()
     allocated = gc.mem_alloc()
@@ -19,6 +22,11 @@ def check_memory_once():
         free / 1024,
         (free/total)*100
     ))
+    if timings:
+        print("-"*50)
+        print("Boot timing:")
+        for step, ms in timings:
+            print("  {:<30} {:>7} ms".format(step, ms))
     print("="*50 + "\n")
     
     return {
@@ -0,0 +1,91 @@
+from array import array
+
+# ===== START: Histogram buckets =====
+# Upper bounds in microseconds; one extra overflow bucket follows the last
+BUCKETS_US = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000, 2500000)
+# ===== END: Histogram buckets =====
+
+class TaskMetrics:
+    """Latency histogram plus run/error/drift counters for one task (no allocation per sample)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.buckets = array('L', [0] * (len(BUCKETS_US) + 1))
+        self.runs = 0
+        self.errors = 0
+        self.skipped = 0       # Deadlines skipped because the last run was still going
+        self.total_us = 0
+        self.max_us = 0
+        self.drift_ms = 0      # Lateness of the most recent run vs its deadline
+        self.drift_max_ms = 0
+        self.drift_total_ms = 0
+
+    def observe(self, us):
+        """Record one run that took `us` microseconds."""
+        i = 0
+        n = len(BUCKETS_US)
+        while i < n and us > BUCKETS_US[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.runs += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def drift(self, ms):
+        """Record how late (ms) a run started relative to its deadline."""
+        if ms < 0:
+            ms = 0
+        self.drift_ms = ms
+        self.drift_total_ms += ms
+        if ms > self.drift_max_ms:
+            self.drift_max_ms = ms
+
+    def error(self):
+        self.errors += 1
+
+# Registry: {name: TaskMetrics}, and [(name, fn)] gauges sampled at render time
+_TASKS = {}
+_GAUGES = []
+
+def task(name):
+    """Get (or create) the TaskMetrics for `name`."""
+    m = _TASKS.get(name)
+    if m is None:
+        m = TaskMetrics(name)
+        _TASKS[name] = m
+    return m
+
+def gauge(name, fn):
+    """Register fn() -> number to be reported as `name` on /metrics."""
+    _GAUGES.append((name, fn))
+
+def render():
+    """Plain-text metrics (Prometheus exposition style)."""
+    lines = []
+    for name, fn in _GAUGES:
+        try:
+            lines.append("{} {}".format(name, fn()))
+        except Exception as e:
+            lines.append("# {} error: {}".format(name, e))
+    for name in sorted(_TASKS):
+        m = _TASKS[name]
+        label = 'task="{}"'.format(name)
+        lines.append("task_runs{{{}}} {}".format(label, m.runs))
+        lines.append("task_errors{{{}}} {}".format(label, m.errors))
+        lines.append("task_skipped{{{}}} {}".format(label, m.skipped))
+        lines.append("task_drift_ms{{{}}} {}".format(label, m.drift_ms))
+        lines.append("task_drift_ms_max{{{}}} {}".format(label, m.drift_max_ms))
+        lines.append("task_drift_ms_total{{{}}} {}".format(label, m.drift_total_ms))
+        cumulative = 0
+        for i, bound in enumerate(BUCKETS_US):
+            if m.buckets[i]:  # Empty buckets are implied by the cumulative counts
+                cumulative += m.buckets[i]
+                lines.append('task_latency_us_bucket{{{},le="{}"}} {}'.format(label, bound, cumulative))
+        cumulative += m.buckets[len(BUCKETS_US)]
+        lines.append('task_latency_us_bucket{{{},le="+Inf"}} {}'.format(label, cumulative))
+        lines.append("task_latency_us_sum{{{}}} {}".format(label, m.total_us))
+        lines.append("task_latency_us_count{{{}}} {}".format(label, m.runs))
+        lines.append("task_latency_us_max{{{}}} {}".format(label, m.max_us))
+    lines.append("")
+    return "\n".join(lines)
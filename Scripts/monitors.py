@@ -1,6 +1,6 @@
 import time # type: ignore
 import scripts.discord_webhook as discord_webhook
-from scripts.temperature_sensor import TemperatureSensor
+from scripts.fixedpoint import to_centi, centi_str
 
 class Monitor:
     """Base class for all monitoring tasks."""
@@ -26,14 +26,15 @@ class Monitor:
 class TemperatureMonitor(Monitor):
     """Monitor for tracking temperature readings and alerts."""
     
-    def __init__(self, sensor, label, check_interval=10, report_interval=60, 
+    def __init__(self, sensor_hub, sensor_key, label, check_interval=10, report_interval=60, 
                  alert_high=None, alert_low=None, log_file="/temp_logs.csv",
                  send_alerts_to_separate_channel=False):
         """
         Initialize temperature monitor.
         
         Args:
-            sensor: TemperatureSensor instance
+            sensor_hub: SensorHub instance (shared cached readings)
+            sensor_key: Key of the sensor in the hub (e.g. 'inside')
             label: Label for this sensor
             check_interval: How often to check temp (seconds)
             report_interval: How often to report/log temp (seconds)
@@ -42,44 +43,37 @@ class TemperatureMonitor(Monitor):
             log_file: Path to CSV log file
             send_alerts_to_separate_channel: Use separate Discord channel for alerts
         """
-        self.sensor = sensor
+        super().__init__(check_interval)
+        self.hub = sensor_hub
+        self.sensor_key = sensor_key
         self.label = label
         self.check_interval = check_interval
         self.report_interval = report_interval
         self.alert_high = alert_high
         self.alert_low = alert_low
+        self.alert_high_centi = to_centi(alert_high)
+        self.alert_low_centi = to_centi(alert_low)
         self.log_file = log_file
         self.send_alerts_to_separate_channel = send_alerts_to_separate_channel
         
-        self.last_check = 0
         self.last_report = 0
         self.alert_sent = False
         self.alert_start_time = None  # Track when alert started
-        self.last_temp = None    # Cached Last temperature reading
+        self.last_temp = None    # Cached last reading (centi-°F)
         self.last_read_time = 0     # Timestamp of last reading
     
-    def should_run(self):
-        """Check if it's time to run this monitor."""
-        current_time = time.time()
-        if current_time - self.last_check >= self.check_interval:
-            self.last_check = current_time
-            return True
-        return False
-    
     def run(self):
         """Check temperature and handle alerts/logging."""
         current_time = time.time()
         
-        # Read temperature
-        temps = self.sensor.read_all_temps(unit='F')
-        if not temps:
+        # Read temperature from the hub's cache (no bus access, centi-°F)
+        temp = self.hub.get_centi(self.sensor_key)
+        if temp is None:
             return
         
-        temp = list(temps.values())[0]  # Get first temp reading
-        
         # ===== ADD THIS: Validate temperature is reasonable =====
-        if temp < -50 or temp > 150:  # Sanity check (outside normal range)
-            print("⚠️ Warning: {} sensor returned invalid temp: {:.1f}°F".format(self.label, temp))
+        if temp < -5000 or temp > 15000:  # Sanity check (outside normal range)
+            print("⚠️ Warning: {} sensor returned invalid temp: {}°F".format(self.label, centi_str(temp)))
             return  # Don't cache invalid reading
         # ===== END: Validation =====
         
@@ -91,15 +85,15 @@ class TemperatureMonitor(Monitor):
         alert_condition = False
         alert_message = ""
         
-        if self.alert_high and temp > self.alert_high:
+        if self.alert_high_centi is not None and temp > self.alert_high_centi:
             alert_condition = True
-            alert_message = "⚠️ {} temperature HIGH: {:.1f}°F (threshold: {:.1f}°F)".format(
-                self.label, temp, self.alert_high
+            alert_message = "⚠️ {} temperature HIGH: {}°F (threshold: {}°F)".format(
+                self.label, centi_str(temp), centi_str(self.alert_high_centi)
             )
-        elif self.alert_low and temp < self.alert_low:
+        elif self.alert_low_centi is not None and temp < self.alert_low_centi:
             alert_condition = True
-            alert_message = "⚠️ {} temperature LOW: {:.1f}°F (threshold: {:.1f}°F)".format(
-                self.label, temp, self.alert_low
+            alert_message = "⚠️ {} temperature LOW: {}°F (threshold: {}°F)".format(
+                self.label, centi_str(temp), centi_str(self.alert_low_centi)
             )
         
         # Handle alert state changes
@@ -110,9 +104,9 @@ class TemperatureMonitor(Monitor):
             
             # send alert (use module-level discord_webhook; set_config must be called in main)
             if self.send_alerts_to_separate_channel:
-                discord_webhook.send_discord_message(alert_message, is_alert=True)
+                discord_webhook.queue_discord_message(alert_message, is_alert=True)
             else:
-                discord_webhook.send_discord_message(alert_message)
+                discord_webhook.queue_discord_message(alert_message)
             
             self.alert_sent = True
             
@@ -132,16 +126,16 @@ class TemperatureMonitor(Monitor):
             else:
                 duration_str = "{}s".format(int(duration))
             
-            recovery_message = "✅ {} temperature back to normal: {:.1f}°F (was out of range for {})".format(
-                self.label, temp, duration_str
+            recovery_message = "✅ {} temperature back to normal: {}°F (was out of range for {})".format(
+                self.label, centi_str(temp), duration_str
             )
             print(recovery_message)
             
             # send recovery message
             if self.send_alerts_to_separate_channel:
-                discord_webhook.send_discord_message(recovery_message, is_alert=True)
+                discord_webhook.queue_discord_message(recovery_message, is_alert=True)
             else:
-                discord_webhook.send_discord_message(recovery_message)
+                discord_webhook.queue_discord_message(recovery_message)
             
             self.alert_sent = False
             self.alert_start_time = None
@@ -152,7 +146,7 @@ class TemperatureMonitor(Monitor):
             self._log_temperature(temp)
     
     def _log_temperature(self, temp):
-        """Log temperature to CSV file."""
+        """Log temperature (centi-°F) to CSV file."""
         try:
             # Get timestamp
             t = time.localtime()
@@ -162,140 +156,76 @@ class TemperatureMonitor(Monitor):
             
             # Append to log file
             with open(self.log_file, 'a') as f:
-                f.write("{},{},{:.2f}\n".format(
-                    timestamp, self.label, temp
+                f.write("{},{},{}\n".format(
+                    timestamp, self.label, centi_str(temp, 2)
                 ))
         except Exception as e:
             print("Error logging temperature: {}".format(e))
 
-class ACMonitor(Monitor):
-    def __init__(self, ac_controller, temp_sensor, target_temp=75.0, temp_swing=2.0, interval=30):
-        super().__init__(interval)
-        self.ac = ac_controller
-        self.sensor = temp_sensor  # <-- This is set from main.py
-        self.target_temp = target_temp
-        self.temp_swing = temp_swing
-        self.last_notified_state = None
-    
-    def run(self):
-        """Check temperature and control AC."""
-        temps = self.sensor.read_all_temps(unit='F')
-        if not temps:
-            return
-        
-        # Use first sensor reading (assuming single inside sensor)
-        current_temp = list(temps.values())[0]
-        
-        # Cooling logic with temperature swing
-        # Turn ON if: temp > target + temp_swing
-        # Turn OFF if: temp < target - temp_swing
-        
-        if current_temp > (self.target_temp + self.temp_swing):
-            # Too hot, turn AC on
-            if self.ac.turn_on():
-                if not self.last_notified_state:
-                    discord_webhook.send_discord_message(f"❄️ AC turned ON - Current: {current_temp:.1f}°F, Target: {self.target_temp:.1f}°F")
-                    self.last_notified_state = True
-        
-        elif current_temp < (self.target_temp - self.temp_swing):
-            # Cool enough, turn AC off
-            if self.ac.turn_off():
-                if self.last_notified_state:
-                    discord_webhook.send_discord_message(f"✅ AC turned OFF - Current: {current_temp:.1f}°F, Target: {self.target_temp:.1f}°F")
-                    self.last_notified_state = False
-        
-        # Else: within temp_swing range, maintain current state
-
-class HeaterMonitor(Monitor):
-    """Monitor temperature and control heater automatically."""
-    def __init__(self, heater_controller, temp_sensor, target_temp=70.0, temp_swing=2.0, interval=30):
+class WiFiMonitor(Monitor):
+    """Monitor WiFi connection and handle reconnection without blocking."""
+    def __init__(self, wifi, led, interval=5, reconnect_cooldown=60, config=None, connect_timeout=20):
         """
-        heater_controller: HeaterController instance
-        temp_sensor: TemperatureSensor instance (inside temp)
-        target_temp: Target temperature in °F
-        temp_swing: Temperature swing allowed (prevents rapid cycling)
-        interval: Seconds between checks
+        Args:
+            wifi: WLAN object from connect_wifi (or None)
+            led: LedPatterns driving the onboard LED
+            interval: Seconds between checks
+            reconnect_cooldown: Seconds between reconnect attempts
+            config: Dict with WiFi credentials
+            connect_timeout: Seconds to wait for one reconnect attempt
         """
-        super().__init__(interval)
-        self.heater = heater_controller
-        self.sensor = temp_sensor
-        self.target_temp = target_temp
-        self.temp_swing = temp_swing
-        self.last_notified_state = None
-    
-    def run(self):
-        """Check temperature and control heater."""
-        temps = self.sensor.read_all_temps(unit='F')
-        if not temps:
-            return
-        
-        # Use first sensor reading (assuming single inside sensor)
-        current_temp = list(temps.values())[0]
-        
-        # Heating logic with temperature swing
-        # Turn ON if: temp < target - temp_swing
-        # Turn OFF if: temp > target + temp_swing
-        
-        if current_temp < (self.target_temp - self.temp_swing):
-            # Too cold, turn heater on
-            if self.heater.turn_on():
-                if not self.last_notified_state:
-                    discord_webhook.send_discord_message(f"🔥 Heater turned ON - Current: {current_temp:.1f}°F, Target: {self.target_temp:.1f}°F")
-                    self.last_notified_state = True
-        
-        elif current_temp > (self.target_temp + self.temp_swing):
-            # Warm enough, turn heater off
-            if self.heater.turn_off():
-                if self.last_notified_state:
-                    discord_webhook.send_discord_message(f"✅ Heater turned OFF - Current: {current_temp:.1f}°F, Target: {self.target_temp:.1f}°F")
-                    self.last_notified_state = False
-        
-        # Else: within temp_swing range, maintain current state
-
-class WiFiMonitor(Monitor):
-    """Monitor WiFi connection and handle reconnection."""
-    def __init__(self, wifi, led, interval=5, reconnect_cooldown=60, config=None):
         super().__init__(interval)
         self.wifi = wifi
         self.led = led
         self.reconnect_cooldown = reconnect_cooldown
+        self.connect_timeout = connect_timeout
         self.last_reconnect_attempt = 0
+        self.reconnecting = False  # A join started by begin_connect() is in progress
         self.was_connected = wifi.isconnected() if wifi else False
         self.config = config
     
     def run(self):
-        """Check WiFi status, blink LED, attempt reconnect if needed."""
-        import network # type: ignore
-        from scripts.networking import connect_wifi
+        """Check WiFi status, pick the LED pattern, start or poll a reconnect."""
+        from scripts.networking import begin_connect
         
         is_connected = self.wifi.isconnected() if self.wifi else False
         
-        if not is_connected:
-            # Fast blink when disconnected
-            self.led.on()
-            time.sleep(0.2)
-            self.led.off()
-            
-            # Try reconnect if cooldown passed
-            now = time.ticks_ms()
-            if time.ticks_diff(now, self.last_reconnect_attempt) >= (self.reconnect_cooldown * 1000):
-                self.last_reconnect_attempt = now
-                # print("Attempting WiFi reconnect...")
-                self.wifi = connect_wifi(self.led, config=self.config)
-                
-                if self.wifi and self.wifi.isconnected():
-                    discord_webhook.send_discord_message("WiFi connection restored 🔄")
-                    self.was_connected = True
-        else:
-            # Slow blink when connected
-            self.led.on()
-            time.sleep(1)
-            self.led.off()
-            
+        if is_connected:
+            self.led.set('connected')
+            self.reconnecting = False
             # Notify if connection was just restored
             if not self.was_connected:
-                discord_webhook.send_discord_message("WiFi connection restored 🔄")
+                print("WiFi connection restored")
+                discord_webhook.queue_discord_message("WiFi connection restored 🔄")
                 self.was_connected = True
+            return
+        
+        if self.was_connected:
+            print("WiFi connection lost")
+            self.was_connected = False
+        
+        now = time.ticks_ms()
+        if self.reconnecting:
+            # Join still pending; give up on this attempt after the timeout
+            if time.ticks_diff(now, self.last_reconnect_attempt) >= (self.connect_timeout * 1000):
+                print("WiFi reconnect attempt timed out")
+                self.reconnecting = False
+                self.led.set('disconnected')
+            return
+        
+        # Try reconnect if cooldown passed
+        if not self.last_reconnect_attempt or time.ticks_diff(now, self.last_reconnect_attempt) >= (self.reconnect_cooldown * 1000):
+            self.last_reconnect_attempt = now
+            wlan = begin_connect(self.config, self.wifi)
+            if wlan:
+                self.wifi = wlan
+                self.reconnecting = True
+                self.led.set('reconnecting')
+            else:
+                self.led.set('error')
+            return
+        
+        self.led.set('disconnected')
 
 def run_monitors(monitors):
     """
@@ -1,12 +1,49 @@
 import network # type: ignore
 import time # type: ignore
 
+def _credentials(config):
+    """Return (ssid, password) from config, or (None, None) if missing."""
+    if config is None:
+        return None, None
+    wifi_cfg = config.get('wifi') or {}
+    # support either config['wifi'] = {'ssid','password'} OR top-level 'ssid'/'password'
+    ssid = wifi_cfg.get('ssid') or config.get('ssid')
+    password = wifi_cfg.get('password') or config.get('password')
+    return ssid, password
+
+def begin_connect(config, wlan=None):
+    """
+    Start a WiFi join without waiting for it (for use inside the runtime).
+
+    Args:
+        config: Dict loaded from config.json (same credentials as connect_wifi)
+        wlan: Existing WLAN object to reuse (default: the STA interface)
+
+    Returns:
+        WLAN object whose connection is in progress (poll isconnected()),
+        None if credentials are missing or the radio refused
+    """
+    ssid, password = _credentials(config)
+    if not ssid or not password:
+        print("begin_connect: missing wifi credentials in config['wifi']")
+        return None
+    try:
+        if wlan is None:
+            wlan = network.WLAN(network.STA_IF)
+        if not wlan.active():
+            wlan.active(True)
+        wlan.connect(ssid, password)
+        return wlan
+    except Exception as e:
+        print("WiFi reconnect start failed: {}".format(e))
+        return None
+
 def connect_wifi(led=None, max_retries=3, timeout=20, config=None):
     """
     Connect to WiFi using credentials from provided config dict.
 
     Args:
-        led: Optional LED pin for visual feedback
+        led: Optional LedPatterns for visual feedback (switches pattern, never blinks inline)
         max_retries: Number of connection attempts (default: 3)
         timeout: Seconds to wait for connection per attempt (default: 20)
         config: Dict loaded from config.json, must contain config['wifi'] with 'ssid' and 'password'
@@ -18,10 +55,7 @@ def connect_wifi(led=None, max_retries=3, timeout=20, config=None):
         print("connect_wifi: config is required")
         return None
 
-    wifi_cfg = config.get('wifi') or {}
-# support either config['wifi'] = {'ssid','password'} OR top-level 'ssid'/'password'
-    ssid = wifi_cfg.get('ssid') or config.get('ssid')
-    password = wifi_cfg.get('password') or config.get('password')
+    ssid, password = _credentials(config)
 
     if not ssid or not password:
         print("connect_wifi: missing wifi credentials in config['wifi']")
@@ -49,8 +83,13 @@ def connect_wifi(led=None, max_retries=3, timeout=20, config=None):
             time.sleep(1)
         except Exception as e2:
             print(f"WiFi reset failed: {e2}")
+            if led:
+                led.set('error')
             return None
 
+    if led:
+        led.set('reconnecting')
+
     # Try connecting with retries
     for attempt in range(1, max_retries + 1):
         if wlan.isconnected():
@@ -74,19 +113,6 @@ def connect_wifi(led=None, max_retries=3, timeout=20, config=None):
             if wlan.isconnected():
                 break
 
-            if led:
-                try:
-                    # some LED wrappers use toggle(), others use on/off
-                    if hasattr(led, "toggle"):
-                        led.toggle()
-                    else:
-                        # flash quickly to show activity
-                        led.on()
-                        time.sleep(0.05)
-                        led.off()
-                except Exception:
-                    pass
-
             time.sleep(0.5)
             wait_time += 0.5
 
@@ -108,24 +134,11 @@ def connect_wifi(led=None, max_retries=3, timeout=20, config=None):
     if not wlan.isconnected():
         print('WiFi connection failed after all attempts!')
         if led:
-            try:
-                # prefer available method names
-                if hasattr(led, "off"):
-                    led.off()
-            except Exception:
-                pass
+            led.set('error')
         return None
 
-    # Success feedback
     if led:
-        try:
-            for _ in range(2):
-                led.on()
-                time.sleep(0.2)
-                led.off()
-                time.sleep(0.2)
-        except Exception:
-            pass
+        led.set('connected')
 
     print('Connected to WiFi successfully!')
 
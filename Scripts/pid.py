@@ -0,0 +1,98 @@
+import time # type: ignore
+
+# Duty cycle in hundredths of a percent (10000 = always on)
+DUTY_MAX = 10000
+# Error and rate clamps keep every product a small int (no heap allocation on MicroPython)
+ERROR_LIMIT = 5000    # centi-°F
+RATE_LIMIT = 10000    # centi-°F per minute
+
+class TimeProportionalPID:
+    """
+    PID on integer centi-°F with a time-proportioned on/off output.
+
+    update() turns the error into a duty cycle using gains precomputed as
+    integers (no floats per tick). output() runs fixed windows: the relay is
+    on for duty x window at the start of each window, off for the rest. An
+    on-time shorter than min_on becomes 0 and an off-time shorter than
+    min_off becomes a full window, so the relay's own timers never refuse.
+    The integral is clamped to 0..100 % and frozen while the output is
+    saturated (anti-windup).
+    """
+
+    def __init__(self, kp, ki, kd, window=600, min_on=0, min_off=0):
+        """
+        Args:
+            kp: % duty per °F below target
+            ki: % duty added per °F below target per minute
+            kd: % duty per °F/minute the temperature is falling
+            window: Time-proportioning window in seconds
+            min_on: Shortest on-time in seconds (relay min run time)
+            min_off: Shortest off-time in seconds (relay min off time)
+        """
+        self.set_gains(kp, ki, kd)
+        self.window_ms = int(window * 1000)
+        self.min_on_ms = int(min_on * 1000)
+        self.min_off_ms = int(min_off * 1000)
+        self.reset()
+
+    def set_gains(self, kp, ki, kd):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        # Gains x100, so with centi-°F errors: P = kp_i * err // 100 is already in duty units
+        self.kp_i = int(kp * 100 + 0.5)
+        self.ki_i = int(ki * 100 + 0.5)
+        self.kd_i = int(kd * 100 + 0.5)
+
+    def reset(self):
+        """Forget history (integral, last reading, window)."""
+        self.i_acc = 0            # Integral in duty x 6000 (duty = i_acc // 6000)
+        self.last_temp = None
+        self.last_ms = None
+        self.duty = 0
+        self.window_start = None
+        self.on_ms = 0
+
+    def update(self, target_centi, temp_centi, now=None):
+        """Feed one reading (centi-°F). Returns the new duty (0-DUTY_MAX)."""
+        if now is None:
+            now = time.ticks_ms()
+        err = target_centi - temp_centi
+        err = max(-ERROR_LIMIT, min(ERROR_LIMIT, err))
+        p = self.kp_i * err // 100
+        d = 0
+        dt_s = 0
+        if self.last_ms is not None:
+            dt_ms = time.ticks_diff(now, self.last_ms)
+            dt_s = (dt_ms + 500) // 1000
+            if dt_ms > 0 and self.kd_i:
+                # Derivative on measurement: no kick when the setpoint changes
+                rate = (temp_centi - self.last_temp) * 60000 // dt_ms
+                rate = max(-RATE_LIMIT, min(RATE_LIMIT, rate))
+                d = -self.kd_i * rate // 100
+        i = self.i_acc // 6000
+        out = p + i + d
+        # Anti-windup: don't integrate further into saturation
+        if dt_s and not ((out >= DUTY_MAX and err > 0) or (out <= 0 and err < 0)):
+            # ki_i * err * dt_s / 6000 = ki[%/°F/min] * err[°F] * dt[min] in duty units
+            self.i_acc += self.ki_i * err * min(dt_s, 600)
+            self.i_acc = max(0, min(DUTY_MAX * 6000, self.i_acc))
+            out = p + self.i_acc // 6000 + d
+        self.last_temp = temp_centi
+        self.last_ms = now
+        self.duty = max(0, min(DUTY_MAX, out))
+        return self.duty
+
+    def output(self, now=None):
+        """True if the relay should be on now (the window's on-time is fixed when it starts)."""
+        if now is None:
+            now = time.ticks_ms()
+        if self.window_start is None or time.ticks_diff(now, self.window_start) >= self.window_ms:
+            self.window_start = now
+            on_ms = self.duty * (self.window_ms // 100) // 100
+            if on_ms < self.min_on_ms:
+                on_ms = 0
+            elif self.window_ms - on_ms < self.min_off_ms:
+                on_ms = self.window_ms
+            self.on_ms = on_ms
+        return time.ticks_diff(now, self.window_start) < self.on_ms
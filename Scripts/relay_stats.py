@@ -0,0 +1,112 @@
+import time # type: ignore
+from array import array
+from scripts.flash_io import read_json, write_json
+
+# Starts remembered for the rolling cycles-per-hour figure (more per hour is reported as this)
+CYCLE_HISTORY = 32
+HOUR_MS = 3600000
+
+class RelayStats:
+    """
+    Run-time and cycle accounting for one relay, kept in RAM.
+
+    The controller calls started()/stopped() on every real switch and
+    blocked() when a min-run / min-off timer refuses one. Totals survive
+    reboots through to_dict()/restore() (see flush()); the rolling cycle
+    rate covers this boot only.
+    """
+
+    def __init__(self):
+        self.on_ms = 0              # Completed on-time (the current run is added in total_on_ms())
+        self.cycles = 0             # Off -> on switches
+        self.blocked_on = 0         # turn_on() refused by min off time
+        self.blocked_off = 0        # turn_off() refused by min run time
+        self.on_since = None        # ticks_ms of the current run
+        self.starts = array('L', [0] * CYCLE_HISTORY)   # Ring of recent start ticks
+        self.start_head = 0
+        self.start_count = 0
+        self.dirty = False          # Changed since the last flush
+
+    def started(self, now):
+        self.cycles += 1
+        self.on_since = now
+        self.starts[self.start_head] = now
+        self.start_head = (self.start_head + 1) % CYCLE_HISTORY
+        if self.start_count < CYCLE_HISTORY:
+            self.start_count += 1
+        self.dirty = True
+
+    def stopped(self, now):
+        if self.on_since is not None:
+            self.on_ms += time.ticks_diff(now, self.on_since)
+            self.on_since = None
+        self.dirty = True
+
+    def blocked(self, turning_on):
+        if turning_on:
+            self.blocked_on += 1
+        else:
+            self.blocked_off += 1
+        self.dirty = True
+
+    def total_on_ms(self, now=None):
+        """Lifetime on-time in ms, including the run in progress."""
+        if self.on_since is None:
+            return self.on_ms
+        if now is None:
+            now = time.ticks_ms()
+        return self.on_ms + time.ticks_diff(now, self.on_since)
+
+    def cycles_last_hour(self, now=None):
+        """Starts within the last hour (capped at CYCLE_HISTORY)."""
+        if now is None:
+            now = time.ticks_ms()
+        count = 0
+        for i in range(self.start_count):
+            if time.ticks_diff(now, self.starts[i]) < HOUR_MS:
+                count += 1
+        return count
+
+    def to_dict(self, now=None):
+        return {
+            'on_s': self.total_on_ms(now) // 1000,
+            'cycles': self.cycles,
+            'blocked_on': self.blocked_on,
+            'blocked_off': self.blocked_off,
+        }
+
+    def restore(self, data):
+        """Continue the totals saved by a previous boot."""
+        self.on_ms = int(data.get('on_s', 0)) * 1000
+        self.cycles = int(data.get('cycles', 0))
+        self.blocked_on = int(data.get('blocked_on', 0))
+        self.blocked_off = int(data.get('blocked_off', 0))
+
+def load(path, relays):
+    """Restore saved totals into {name: controller with .stats}; missing file = start from zero."""
+    data = read_json(path)
+    if data is None:
+        return False
+    for name, relay in relays.items():
+        if name in data:
+            relay.stats.restore(data[name])
+    return True
+
+def flush(path, relays):
+    """
+    Write every relay's totals if any changed since the last flush. Run from a
+    slow runtime job so counters coalesce in RAM instead of wearing flash.
+    Returns True if the file was written.
+    """
+    if not any(relay.stats.dirty or relay.stats.on_since is not None for relay in relays.values()):
+        return False
+    now = time.ticks_ms()
+    data = {name: relay.stats.to_dict(now) for name, relay in relays.items()}
+    try:
+        write_json(path, data)  # Temp file + rename: a power cut mid-write keeps the last totals
+    except Exception as e:
+        print("Error saving relay stats: {}".format(e))
+        return False
+    for relay in relays.values():
+        relay.stats.dirty = False
+    return True
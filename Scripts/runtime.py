@@ -0,0 +1,236 @@
+import time # type: ignore
+import heapq # type: ignore
+import scripts.metrics as metrics
+
+try:
+    import uasyncio as asyncio # type: ignore
+except ImportError:
+    import asyncio  # CPython (host runs)
+
+# ===== START: MicroPython / CPython shims =====
+if hasattr(time, 'ticks_ms'):
+    ticks_ms = time.ticks_ms
+    ticks_us = time.ticks_us
+    ticks_diff = time.ticks_diff
+else:
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_us():
+        return int(time.monotonic() * 1000000)
+
+    def ticks_diff(new, old):
+        return new - old
+
+if hasattr(asyncio, 'sleep_ms'):
+    sleep_ms = asyncio.sleep_ms
+else:
+    async def sleep_ms(ms):
+        await asyncio.sleep(ms / 1000)
+# ===== END: MicroPython / CPython shims =====
+
+# Rebase queue deadlines before the monotonic clock leaves small-int range
+_REBASE_MS = 1 << 29
+
+class Job:
+    """One periodic job in the timer queue."""
+    def __init__(self, name, period, fn, monitor=None):
+        self.name = name
+        self.period_ms = int(period * 1000)
+        self.fn = fn
+        self.monitor = monitor  # Monitor instance (keeps its should_run() bookkeeping in sync)
+        # Monitors with next_delay_ms() pick their own next deadline (None = keep the period)
+        self.next_delay = getattr(monitor, 'next_delay_ms', None)
+        self.busy = False       # Coroutine job still running from its last deadline
+        self.task = None        # Its asyncio task while busy (strong ref for CPython)
+        self.metrics = metrics.task(name)
+
+class TimerQueue:
+    """Min-heap of jobs keyed on their next deadline (runtime milliseconds)."""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0  # Tie-breaker so equal deadlines keep registration order
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, deadline, job):
+        heapq.heappush(self._heap, (deadline, self._seq, job))
+        self._seq += 1
+
+    def pop_due(self, now):
+        """Remove and return (deadline, job) for the earliest job due at `now`, else None."""
+        if self._heap and self._heap[0][0] <= now:
+            deadline, _, job = heapq.heappop(self._heap)
+            return deadline, job
+        return None
+
+    def idle_ms(self, now):
+        """Milliseconds until the next deadline (0 if one is due, None if empty)."""
+        if not self._heap:
+            return None
+        wait = self._heap[0][0] - now
+        return wait if wait > 0 else 0
+
+    def move(self, job, deadline):
+        """Give an already queued job a new deadline."""
+        for i, entry in enumerate(self._heap):
+            if entry[2] is job:
+                self._heap[i] = (deadline, entry[1], job)
+                heapq.heapify(self._heap)
+                return True
+        return False
+
+    def rebase(self, offset):
+        """Shift every deadline back by `offset` ms (ordering is unchanged)."""
+        self._heap = [(deadline - offset, seq, job) for deadline, seq, job in self._heap]
+
+class Runtime:
+    """
+    Cooperative task runtime on uasyncio.
+
+    All periodic jobs share one deadline-ordered TimerQueue: the dispatcher runs
+    whatever is due, then sleeps exactly until the next deadline. While it
+    sleeps the uasyncio scheduler sits in poll(), so the web server's listening
+    socket (asyncio.start_server) is still serviced as soon as it is readable.
+    """
+
+    def __init__(self, lightsleep=False):
+        """
+        lightsleep: Use machine.lightsleep() for idle gaps when nothing else
+                    needs the CPU (only sensible without WiFi / web server)
+        """
+        self.queue = TimerQueue()
+        self.coros = []          # Extra long-lived coroutines (web server, ...)
+        self._tasks = []         # Strong refs so CPython never collects a running task
+        self.lightsleep = lightsleep
+        self._busy = 0           # Coroutine jobs currently running
+        self._now = 0            # Monotonic runtime clock (ms), immune to ticks wrap
+        self._last_ticks = ticks_ms()
+        self.wakeups = 0         # Dispatcher wakeups (each one ran at least one job)
+        self.idle_ms_total = 0   # Time spent sleeping between deadlines
+        metrics.gauge("runtime_wakeups", lambda: self.wakeups)
+        metrics.gauge("runtime_idle_ms", lambda: self.idle_ms_total)
+        metrics.gauge("runtime_jobs", lambda: len(self.queue))
+
+    def now(self):
+        """Monotonic runtime milliseconds."""
+        ticks = ticks_ms()
+        self._now += ticks_diff(ticks, self._last_ticks)
+        self._last_ticks = ticks
+        return self._now
+
+    def _rebase(self):
+        """
+        Pull the clock and every deadline back to keep them small ints. Only
+        called at the top of the dispatch loop, while every job is queued: a
+        job popped for running would keep a pre-rebase deadline otherwise.
+        """
+        self.queue.rebase(self._now)
+        self._now = 0
+
+    def every(self, name, period, fn, monitor=None):
+        """
+        Run fn() every `period` seconds (first run immediately).
+
+        Args:
+            name: Label used in error messages
+            period: Seconds between runs (deadline to deadline)
+            fn: Plain function or coroutine function
+            monitor: Optional Monitor the job belongs to
+        """
+        job = Job(name, period, fn, monitor)
+        self.queue.push(self.now(), job)
+        return job
+
+    def add(self, monitor, name=None):
+        """Schedule a Monitor (or anything with interval and run()) on its own interval."""
+        return self.every(name or monitor.__class__.__name__, monitor.interval, monitor.run, monitor)
+
+    def wake(self, job):
+        """
+        Make `job` due now instead of at its deadline. It runs at the next
+        dispatcher wakeup (no later than the next deadline of any other job).
+        """
+        return self.queue.move(job, self.now())
+
+    def spawn(self, coro):
+        """Run an extra coroutine alongside the periodic jobs."""
+        self.coros.append(coro)
+
+    def _run_job(self, job):
+        """Run one job (timed); coroutine jobs continue as their own task."""
+        if job.monitor is not None:
+            job.monitor.last_check_ms = ticks_ms()
+        start = ticks_us()
+        try:
+            result = job.fn()
+            if result is not None and hasattr(result, 'send'):
+                job.busy = True
+                self._busy += 1
+                job.task = asyncio.create_task(self._finish(job, result, start))
+                return
+        except Exception as e:
+            job.metrics.error()
+            print("{} error: {}".format(job.name, e))
+        job.metrics.observe(ticks_diff(ticks_us(), start))
+
+    async def _finish(self, job, coro, start):
+        try:
+            await coro
+        except Exception as e:
+            job.metrics.error()
+            print("{} error: {}".format(job.name, e))
+        finally:
+            job.metrics.observe(ticks_diff(ticks_us(), start))
+            job.busy = False
+            job.task = None
+            self._busy -= 1
+
+    async def _idle(self, ms):
+        self.idle_ms_total += ms
+        if self.lightsleep and ms > 10 and not self._busy:
+            import machine # type: ignore
+            machine.lightsleep(ms)
+            await sleep_ms(0)
+        else:
+            await sleep_ms(ms)
+
+    async def _dispatch(self):
+        queue = self.queue
+        while True:
+            now = self.now()
+            if now >= _REBASE_MS:
+                self._rebase()
+                now = 0
+            due = queue.pop_due(now)
+            if due is None:
+                idle = queue.idle_ms(now)
+                await self._idle(idle if idle is not None else 1000)
+                self.wakeups += 1
+                continue
+            deadline, job = due
+            if job.busy:  # Skip a coroutine job whose last run hasn't finished
+                job.metrics.skipped += 1
+            else:
+                job.metrics.drift(now - deadline)
+                self._run_job(job)
+            now = self.now()
+            delay = job.next_delay() if job.next_delay is not None else None
+            if delay is not None:
+                queue.push(now + delay, job)
+            else:
+                # Keep cadence; if we fell a whole period behind, restart from now
+                deadline += job.period_ms
+                queue.push(deadline if deadline > now else now + job.period_ms, job)
+            await sleep_ms(0)  # Let ready tasks (web clients, conversions) in between jobs
+
+    async def _main(self):
+        for coro in self.coros:
+            self._tasks.append(asyncio.create_task(coro))
+        await self._dispatch()
+
+    def run(self):
+        """Start all jobs and block forever (Ctrl+C raises KeyboardInterrupt)."""
+        asyncio.run(self._main())
@@ -1,6 +1,304 @@
 import time # type: ignore
+from array import array
+from scripts.monitors import Monitor
+from scripts.fixedpoint import to_centi, centi_str
 
-class ScheduleMonitor:
+DAY_MINUTES = 1440
+DAY_SECONDS = 86400
+# Longest sleep between checks, so a clock resync (NTP) is picked up within the hour
+MAX_SLEEP_S = 3600
+# localtime()[6] order (Monday = 0); bit n of a weekday mask is DAY_NAMES[n]
+DAY_NAMES = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+ALL_DAYS = 0x7F
+# Days searched back (active) or ahead (next change) for a day with transitions
+SEARCH_DAYS = 8
+
+# Setpoint ramp modes (config 'schedule_ramp')
+RAMP_OFF = 'off'              # Targets jump at each transition
+RAMP_LINEAR = 'ramp'          # Targets slide to the next schedule over schedule_ramp_minutes
+RAMP_ARRIVE_BY = 'arrive_by'  # Next schedule starts early enough to be at its heater target on time
+RAMP_MODES = (RAMP_OFF, RAMP_LINEAR, RAMP_ARRIVE_BY)
+RAMP_STEP_S = 60              # Check cadence while a ramp or warm-up is under way
+DEFAULT_WARMUP_RATE = 6.0     # °F per hour until a warm-up has been timed
+WARMUP_MIN_RISE = 100         # centi-°F: smaller heater target increases aren't timed
+WARMUP_MIN_S = 300            # Shorter warm-ups are too noisy to learn from
+WARMUP_MAX_S = 6 * 3600       # Stop timing a warm-up that never gets there
+
+def parse_time(time_str):
+    """Convert time string 'HH:MM' to minutes since midnight (None if invalid)."""
+    try:
+        parts = time_str.split(':')
+        minutes = int(parts[0]) * 60 + int(parts[1])
+    except:
+        return None
+    return minutes if 0 <= minutes < DAY_MINUTES else None
+
+def parse_days(days):
+    """Weekday names (list or 'mon,tue' string) to a 7-bit mask; missing or empty = every day."""
+    if not days:
+        return ALL_DAYS
+    if isinstance(days, str):
+        days = days.split(',')
+    mask = 0
+    for name in days:
+        name = name.strip().lower()[:3]
+        if name in DAY_NAMES:
+            mask |= 1 << DAY_NAMES.index(name)
+    return mask
+
+def day_number(year, month, day):
+    """Days since 2000-01-01 (proleptic Gregorian, integers only)."""
+    if month < 3:
+        year -= 1
+        month += 12
+    return 365 * year + year // 4 - year // 100 + year // 400 + (153 * (month - 3) + 2) // 5 + day - 730426
+
+def parse_date(date_str):
+    """
+    'YYYY-MM-DD' -> (True, day_number) for a one-off date,
+    'MM-DD' -> (False, month * 32 + day) for a date every year,
+    None if invalid.
+    """
+    try:
+        parts = [int(p) for p in date_str.strip().split('-')]
+    except:
+        return None
+    if len(parts) == 3:
+        year, month, day = parts
+    elif len(parts) == 2:
+        year = None
+        month, day = parts
+    else:
+        return None
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    if year is None:
+        return False, month * 32 + day
+    return True, day_number(year, month, day)
+
+def describe(schedule):
+    """Short 'when' text for a schedule entry: weekdays and date range ('' = every day)."""
+    parts = []
+    mask = parse_days(schedule.get('days'))
+    if mask != ALL_DAYS:
+        parts.append(','.join(name.capitalize() for n, name in enumerate(DAY_NAMES) if mask & (1 << n)))
+    if schedule.get('from'):
+        until = schedule.get('until')
+        parts.append(schedule['from'] + (' to ' + until if until and until != schedule['from'] else ''))
+    return ' | '.join(parts)
+
+def _bisect(values, x):
+    """Number of items in sorted `values` that are <= x (bisect_right; no bisect module on MicroPython)."""
+    lo, hi = 0, len(values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if values[mid] <= x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+class ScheduleTable:
+    """
+    One day's schedule entries compiled into sorted minute offsets.
+
+    before() and after() are a binary search over the offsets, with no
+    parsing or sorting per call. Equal times keep config order, so of two
+    entries at the same minute the later one wins.
+    """
+
+    def __init__(self, schedules):
+        entries = []
+        for schedule in schedules or ():
+            minutes = parse_time(schedule.get('time'))
+            if minutes is not None:
+                entries.append((minutes, len(entries), schedule))
+        entries.sort()  # Index breaks ties, so equal times keep config order
+        self.minutes = array('H', [e[0] for e in entries])
+        self.schedules = [e[2] for e in entries]
+
+    def __len__(self):
+        return len(self.schedules)
+
+    def before(self, minute):
+        """Latest entry at or before `minute` past midnight (None before the first)."""
+        i = _bisect(self.minutes, minute)
+        return self.schedules[i - 1] if i else None
+
+    def after(self, minute):
+        """First transition after `minute`: (minute of day, entry in force from then), or None."""
+        i = _bisect(self.minutes, minute)
+        if i == len(self.minutes):
+            return None
+        at = self.minutes[i]
+        return at, self.before(at)
+
+class _Ranges:
+    """
+    Date ranges, each owning one week of ScheduleTables, compiled into
+    disjoint segments.
+
+    Where ranges overlap, the latest-starting one owns the days (equal
+    starts: the later one in config order). The sweep below resolves that
+    once, so find() is a single binary search however many ranges have
+    already ended.
+    """
+
+    def __init__(self, ranges):
+        ranges = sorted((start, n, end, week) for n, (start, end, week) in enumerate(ranges))
+        self.count = len(ranges)
+        points = sorted(set([r[0] for r in ranges] + [r[2] + 1 for r in ranges]))
+        starts = []
+        weeks = []      # Week in force from starts[i] up to starts[i + 1] (None: no range)
+        open_ranges = []  # Started ranges in start order; the last one still running owns the day
+        i = 0
+        for point in points:
+            while i < len(ranges) and ranges[i][0] <= point:
+                open_ranges.append(ranges[i])
+                i += 1
+            while open_ranges and open_ranges[-1][2] < point:
+                open_ranges.pop()  # Ended; ranges under it that ended too are dropped once exposed
+            week = open_ranges[-1][3] if open_ranges else None
+            if not weeks or weeks[-1] is not week:
+                starts.append(point)
+                weeks.append(week)
+        self.starts = array('l', starts)
+        self.weeks = weeks
+
+    def __len__(self):
+        return self.count
+
+    def find(self, key):
+        """Week of the latest-starting range that covers `key` (None if none does)."""
+        i = _bisect(self.starts, key)
+        return self.weeks[i - 1] if i else None
+
+class ScheduleIndex:
+    """
+    All schedule entries compiled into a per-day transition index.
+
+    Entry keys besides time/name/targets:
+        days:  weekday names the entry runs on (default every day)
+        from / until: date range; 'YYYY-MM-DD' is a one-off exception
+                      (vacation), 'MM-DD' repeats every year (season, may
+                      wrap past New Year). until defaults to from.
+
+    A day uses the entries of the most specific layer that covers it: a
+    dated range, else a yearly range, else the plain entries; then only
+    those whose weekday mask includes the day. Each distinct set of entries
+    is compiled into one ScheduleTable shared by every day that uses it, so
+    memory grows with the number of entries, not calendar days. A lookup is
+    a binary search for the range, then one over the day's minute offsets.
+    Before a day's first transition the last one from an earlier day is in
+    force.
+    """
+
+    def __init__(self, schedules):
+        groups = {}     # {(dated, start, end) or None: [entries]}
+        for schedule in schedules or ():
+            if parse_time(schedule.get('time')) is None:
+                continue
+            key = None
+            if schedule.get('from'):
+                start = parse_date(schedule['from'])
+                end = parse_date(schedule.get('until') or schedule['from'])
+                if start is None or end is None or start[0] != end[0] or (start[0] and end[1] < start[1]):
+                    print("⚠️ Schedule '{}': bad date range - skipped".format(schedule.get('name', 'Unnamed')))
+                    continue
+                key = (start[0], start[1], end[1])
+            groups.setdefault(key, []).append(schedule)
+        self.count = sum(len(entries) for entries in groups.values())
+        tables = {}     # {tuple of entry ids: ScheduleTable}, shared between identical days
+        dated = []
+        yearly = []
+        self.plain = None
+        for key, entries in groups.items():
+            week = self._compile_week(entries, tables)
+            if key is None:
+                self.plain = week
+            elif key[0]:
+                dated.append((key[1], key[2], week))
+            elif key[1] <= key[2]:
+                yearly.append((key[1], key[2], week))
+            else:  # Wraps past New Year: two ranges
+                yearly.append((key[1], 12 * 32 + 31, week))
+                yearly.append((1 * 32 + 1, key[2], week))
+        self.dated = _Ranges(dated)
+        self.yearly = _Ranges(yearly)
+        self.tables = len(tables)   # Distinct day profiles actually stored
+
+    def _compile_week(self, entries, tables):
+        """Seven ScheduleTables (Monday first) for one group of entries."""
+        masks = [parse_days(entry.get('days')) for entry in entries]
+        week = []
+        for day in range(7):
+            todays = [entry for entry, mask in zip(entries, masks) if mask & (1 << day)]
+            key = tuple(id(entry) for entry in todays)
+            if key not in tables:
+                tables[key] = ScheduleTable(todays)
+            week.append(tables[key])
+        return week
+
+    def __len__(self):
+        return self.count
+
+    def table(self, t):
+        """ScheduleTable for the day of localtime tuple `t` (None if no entry covers it)."""
+        week = self.dated.find(day_number(t[0], t[1], t[2]))
+        if week is None:
+            week = self.yearly.find(t[1] * 32 + t[2])
+        if week is None:
+            week = self.plain
+        return week[t[6]] if week is not None else None
+
+    def active(self, secs):
+        """Entry in force at epoch `secs` (local time), or None."""
+        for back in range(SEARCH_DAYS):
+            t = time.localtime(secs - back * DAY_SECONDS)
+            table = self.table(t)
+            if table is not None:
+                schedule = table.before(t[3] * 60 + t[4] if back == 0 else DAY_MINUTES)
+                if schedule is not None:
+                    return schedule
+        return None
+
+    def next_change(self, secs):
+        """(minutes from `secs` to the next transition, entry in force from then), or (None, None)."""
+        t = time.localtime(secs)
+        now = t[3] * 60 + t[4]
+        for ahead in range(SEARCH_DAYS):
+            if ahead:
+                t = time.localtime(secs + ahead * DAY_SECONDS)
+            table = self.table(t)
+            change = table.after(now if ahead == 0 else -1) if table is not None else None
+            if change is not None:
+                return ahead * DAY_MINUTES + change[0] - now, change[1]
+        return None, None
+
+class SetpointRamp:
+    """
+    Straight-line move of both targets (centi-°F) towards `schedule` between
+    two epoch times. Slopes are fixed when the ramp is built, so each tick
+    is one multiply per target.
+    """
+
+    def __init__(self, schedule, start, end, ac_from, ac_to, heat_from, heat_to):
+        self.schedule = schedule
+        self.start = start
+        self.end = end
+        self.span = max(1, end - start)
+        self.ac_from = ac_from
+        self.heat_from = heat_from
+        # centi-°F per 1000 s (keeps every product a small int)
+        self.ac_slope = (ac_to - ac_from) * 1000 // self.span
+        self.heat_slope = (heat_to - heat_from) * 1000 // self.span
+
+    def at(self, now):
+        """(AC, heater) targets in centi-°F at epoch `now`."""
+        dt = min(max(0, now - self.start), self.span)
+        return self.ac_from + self.ac_slope * dt // 1000, self.heat_from + self.heat_slope * dt // 1000
+
+class ScheduleMonitor(Monitor):
     """Monitor that checks and applies temperature schedules."""
 
     def __init__(self, ac_monitor, heater_monitor, config, interval=60):
@@ -8,42 +306,25 @@ class ScheduleMonitor:
         Initialize schedule monitor.
         
         Args:
-            ac_monitor: ACMonitor instance
-            heater_monitor: HeaterMonitor instance
-            config: Configuration dict with schedules
+            ac_monitor: Cooling Setpoint of the ClimateController
+            heater_monitor: Heating Setpoint of the ClimateController
+            config: ConfigStore (live config with schedules)
             interval: How often to check schedule (seconds)
         """
+        super().__init__(interval)
         self.ac_monitor = ac_monitor
         self.heater_monitor = heater_monitor
         self.config = config
-        self.interval = interval
-        self.last_check = 0
         self.current_schedule = None
         self.last_applied_schedule = None
-        self.temp_hold_duration = config.get('temp_hold_duration', 3600)  # Use config value, default 1 hour
-
-    def should_run(self):
-        """Check if it's time to run this monitor."""
-        current_time = time.time()
-        if current_time - self.last_check >= self.interval:
-            self.last_check = current_time
-            return True
-        return False
-
-    def _parse_time(self, time_str):
-        """Convert time string 'HH:MM' to minutes since midnight."""
-        try:
-            parts = time_str.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            return hours * 60 + minutes
-        except:
-            return None
-
-    def _get_current_minutes(self):
-        """Get current time in minutes since midnight."""
-        t = time.localtime()
-        return t[3] * 60 + t[4]  # hours * 60 + minutes
+        self.temp_hold_duration = config.get_int('temp_hold_duration', 3600)  # Use config value, default 1 hour
+        self.index = ScheduleIndex(config.get('schedules'))
+        config.subscribe(self._on_config_change, ('schedules', 'temp_hold_duration'))
+        self.wake = None  # Set by main.py: runs the monitor now (after a reload)
+        self.ramp = None      # SetpointRamp in progress (RAMP_LINEAR)
+        self.early = None     # Upcoming schedule already applied (RAMP_ARRIVE_BY)
+        self.warmup = None    # (start epoch, start temp, heater target) of a warm-up being timed
+        self.warmup_rate = to_centi(config.get('warmup_rate', DEFAULT_WARMUP_RATE))  # centi-°F per hour
 
     def _find_active_schedule(self):
         """Find which schedule should be active right now."""
@@ -51,41 +332,39 @@ class ScheduleMonitor:
             # Schedule is disabled (HOLD mode)
             return None
         
-        schedules = self.config.get('schedules', [])
-        if not schedules:
-            return None
-        
-        current_minutes = self._get_current_minutes()
-        
-        # Sort schedules by time
-        sorted_schedules = []
-        for schedule in schedules:
-            schedule_minutes = self._parse_time(schedule['time'])
-            if schedule_minutes is not None:
-                sorted_schedules.append((schedule_minutes, schedule))
-        
-        sorted_schedules.sort()
-        
-        # Find the most recent schedule that has passed
-        active_schedule = None
-        for schedule_minutes, schedule in sorted_schedules:
-            if current_minutes >= schedule_minutes:
-                active_schedule = schedule
-            else:
-                break
-        
-        # If no schedule found (before first schedule), use last schedule from yesterday
-        if active_schedule is None and sorted_schedules:
-            active_schedule = sorted_schedules[-1][1]
-        
-        return active_schedule
+        return self.index.active(time.time())
+
+    def next_delay_ms(self):
+        """
+        Milliseconds until the next run (used by the runtime instead of the
+        interval): the next schedule transition, or the end of a temporary
+        hold, capped at MAX_SLEEP_S. Without either, MAX_SLEEP_S; a config
+        change wakes the monitor early through reload_config().
+        """
+        now = time.time()
+        sleep_s = MAX_SLEEP_S
+        if self.config.get('schedule_enabled', False):
+            minutes, _ = self.index.next_change(now)
+            if minutes is not None:
+                until = minutes * 60 - time.localtime(now)[5]
+                sleep_s = min(sleep_s, until + 1)  # +1 s: land just past the boundary
+                if self._ramp_mode() != RAMP_OFF and self.early is None:
+                    # Wake when the ramp / arrive-by window opens, then step through it
+                    sleep_s = min(sleep_s, max(RAMP_STEP_S, until - self._ramp_window()))
+            if self.warmup is not None:
+                sleep_s = min(sleep_s, RAMP_STEP_S)
+        elif not self.config.get('permanent_hold', False):
+            start = self.config.get('temp_hold_start_time')
+            if start is not None:
+                sleep_s = min(sleep_s, int(start + self.temp_hold_duration - now) + 1)
+        return max(1, sleep_s) * 1000
 
     def _apply_schedule(self, schedule):
         """Apply a schedule's settings to the monitors."""
         if not schedule:
             return
 
-        schedule_id = schedule.get('time', '') + schedule.get('name', '')
+        schedule_id = id(schedule)  # Entries can share time and name on different days; reload_config() resets this
         if schedule_id == self.last_applied_schedule:
             return  # Already applied
 
@@ -123,28 +402,9 @@ class ScheduleMonitor:
                     changed = True
                 self.heater_monitor.temp_swing = new_ht_swing
 
-            # Save updated config only if something changed
+            # Persisted by the config flush job (only keys that actually changed)
             if changed:
-                try:
-                    import json
-                    with open('config.json', 'w') as f:
-                        json.dump(self.config, f)
-                except Exception as e:
-                    print("⚠️ Could not save config: {}".format(e))
-                else:
-                    # import once and update module-level webhook config
-                    try:
-                        import scripts.discord_webhook as discord_webhook
-                        discord_webhook.set_config(self.config)
-                    except Exception:
-                        pass
-                    print("✅ Config updated with active schedule targets")
-            else:
-                # nothing to persist
-                try:
-                    import scripts.discord_webhook as discord_webhook
-                except Exception:
-                    discord_webhook = None
+                print("✅ Config updated with active schedule targets")
 
             # Log the change
             schedule_name = schedule.get('name', 'Unnamed')
@@ -157,14 +417,13 @@ class ScheduleMonitor:
 
             # Send Discord notification (use discord_webhook if available)
             try:
-                if 'discord_webhook' not in locals() or discord_webhook is None:
-                    import scripts.discord_webhook as discord_webhook
+                import scripts.discord_webhook as discord_webhook
                 message = "🕐 Schedule '{}' applied - AC: {}°F | Heater: {}°F".format(
                     schedule_name,
                     self.ac_monitor.target_temp,
                     self.heater_monitor.target_temp
                 )
-                discord_webhook.send_discord_message(message)
+                discord_webhook.queue_discord_message(message)
             except Exception:
                 pass
 
@@ -189,39 +448,140 @@ class ScheduleMonitor:
                     print("⏰ Temporary hold expired - resuming schedule")
                     self.config['schedule_enabled'] = True
                     self.config['temp_hold_start_time'] = None
-                    
-                    # Save updated config
+                    print("✅ Automatic mode resumed")
+
+                    # Notify user
                     try:
-                        import json
-                        with open('config.json', 'w') as f:
-                            json.dump(self.config, f)
-                    except Exception as e:
-                        print("⚠️ Could not save config: {}".format(e))
-                    else:
-                        # ensure in-memory webhook config updated
-                        try:
-                            import scripts.discord_webhook as discord_webhook
-                            discord_webhook.set_config(self.config)
-                        except Exception:
-                            pass
-
-                        print("✅ Config updated - automatic mode resumed")
-
-                        # Notify user
-                        try:
-                            import scripts.discord_webhook as discord_webhook
-                            discord_webhook.send_discord_message("⏰ Temporary hold expired - Schedule resumed automatically")
-                        except Exception:
-                            pass
+                        import scripts.discord_webhook as discord_webhook
+                        discord_webhook.queue_discord_message("⏰ Temporary hold expired - Schedule resumed automatically")
+                    except Exception:
+                        pass
         # ===== END: Check if temporary hold has expired =====
         
         # Find and apply active schedule
+        now = time.time()
         active_schedule = self._find_active_schedule()
+        if self.early is not None:
+            if active_schedule is None or active_schedule is self.early:
+                self.early = None  # Its transition has come (or schedules are off)
+            else:
+                active_schedule = self.early
         if active_schedule:
+            heat_before = self.heater_monitor.target_centi
             self._apply_schedule(active_schedule)
+            if self._ramp_mode() != RAMP_LINEAR and self.heater_monitor.target_centi - heat_before >= WARMUP_MIN_RISE:
+                self._start_warmup(now)
+        self._update_ramp(now, active_schedule)
+        self._check_warmup(now)
+
+    def _ramp_mode(self):
+        mode = self.config.get('schedule_ramp', RAMP_OFF)
+        return mode if mode in RAMP_MODES else RAMP_OFF
+
+    def _ramp_window(self):
+        """Ramp length, and the longest arrive-by lead, in seconds."""
+        return self.config.get_int('schedule_ramp_minutes', 60) * 60
+
+    def _targets(self, schedule):
+        """(AC, heater) targets in centi-°F a schedule sets (current ones where it sets none)."""
+        ac = to_centi(float(schedule['ac_target'])) if 'ac_target' in schedule else self.ac_monitor.target_centi
+        heat = to_centi(float(schedule['heater_target'])) if 'heater_target' in schedule else self.heater_monitor.target_centi
+        return ac, heat
+
+    def _update_ramp(self, now, active):
+        """Move the targets along the ramp (RAMP_LINEAR) or start the next schedule early (RAMP_ARRIVE_BY)."""
+        mode = self._ramp_mode()
+        if mode == RAMP_OFF or active is None:
+            self.ramp = None
+            return
+        if self.ramp is not None and now >= self.ramp.end:
+            self.ramp = None  # The transition itself sets the final values
+        if self.ramp is None and self.early is None:
+            minutes, upcoming = self.index.next_change(now)
+            if upcoming is None or upcoming is active:
+                return
+            end = now + minutes * 60 - time.localtime(now)[5]
+            if mode == RAMP_ARRIVE_BY:
+                if end - now <= self._warmup_lead(upcoming):
+                    print("⏩ Starting '{}' early to reach {}°F by its start".format(
+                        upcoming.get('name', 'Unnamed'), centi_str(self._targets(upcoming)[1])))
+                    self.early = upcoming
+                    heat_before = self.heater_monitor.target_centi
+                    self._apply_schedule(upcoming)
+                    if self.heater_monitor.target_centi - heat_before >= WARMUP_MIN_RISE:
+                        self._start_warmup(now)
+                return
+            window = self._ramp_window()
+            if end - now > window:
+                return
+            ac_from, heat_from = self._targets(active)
+            ac_to, heat_to = self._targets(upcoming)
+            if ac_from == ac_to and heat_from == heat_to:
+                return
+            self.ramp = SetpointRamp(upcoming, end - window, end, ac_from, ac_to, heat_from, heat_to)
+            print("📈 Ramping targets to '{}' over {} min".format(upcoming.get('name', 'Unnamed'), window // 60))
+        if self.ramp is not None:
+            ac, heat = self.ramp.at(now)
+            self.ac_monitor.target_centi = ac
+            self.heater_monitor.target_centi = heat
+
+    def _warmup_lead(self, schedule):
+        """Seconds the heater needs to reach `schedule`'s heater target at the learned rate (capped at the ramp window)."""
+        temp = self.heater_monitor.controller.last_temp
+        target = self._targets(schedule)[1]
+        if temp is None or target <= temp:
+            return 0
+        return min(self._ramp_window(), (target - temp) * 3600 // max(1, self.warmup_rate))
+
+    def _start_warmup(self, now):
+        """Time the warm-up to a raised heater target (learned for arrive-by)."""
+        temp = self.heater_monitor.controller.last_temp
+        target = self.heater_monitor.target_centi
+        self.warmup = (now, temp, target) if temp is not None and temp < target else None
+
+    def _check_warmup(self, now):
+        """Finish timing a warm-up once the target is reached and fold its rate into warmup_rate."""
+        if self.warmup is None:
+            return
+        start, start_temp, target = self.warmup
+        elapsed = now - start
+        temp = self.heater_monitor.controller.last_temp
+        if self.heater_monitor.target_centi != target or elapsed > WARMUP_MAX_S:
+            self.warmup = None  # Target moved (hold, new schedule) or heater can't keep up: not a clean sample
+            return
+        if temp is None or temp < target:
+            return
+        self.warmup = None
+        if elapsed < WARMUP_MIN_S:
+            return
+        rate = (temp - start_temp) * 3600 // elapsed
+        self.warmup_rate += (rate - self.warmup_rate) // 4  # EMA, 1/4 weight per warm-up
+        self.config['warmup_rate'] = self.warmup_rate / 100
+        print("📈 Warm-up: {}°F/h (learned {}°F/h)".format(centi_str(rate), centi_str(self.warmup_rate)))
+
+    def status(self):
+        """One line on a ramp or early start in progress (None when there is none)."""
+        if self.ramp is not None:
+            return "Ramping to {}".format(self.ramp.schedule.get('name', 'Unnamed'))
+        if self.early is not None:
+            return "Warming up early for {}".format(self.early.get('name', 'Unnamed'))
+        return None
+
+    def _on_config_change(self, config, key):
+        """ConfigStore subscription: recompile schedules / pick up the hold duration as soon as they change."""
+        if key == 'schedules':
+            self.index = ScheduleIndex(config.get('schedules'))
+            self.ramp = None
+            self.early = None
+        else:
+            self.temp_hold_duration = config.get_int('temp_hold_duration', 3600)
 
     def reload_config(self, new_config):
-        """Reload configuration (called when settings are updated via web)."""
+        """Re-apply the schedule after a config change (called when settings are updated via web)."""
         self.config = new_config
         self.last_applied_schedule = None  # Force re-application
+        self.ramp = None                   # Rebuilt from the new schedules on the next run
+        self.early = None
+        if self.wake:
+            self.wake()  # Sleep was computed from the old schedules / hold
         print("Schedule configuration reloaded")
\ No newline at end of file
@@ -0,0 +1,233 @@
+import time # type: ignore
+from scripts.temperature_sensor import BusGroup, save_rom_cache
+from scripts.filters import SensorFilter
+
+# Readings outside this range (centi-°F) are glitches (85°C power-on value, open bus) and never enter a filter
+VALID_MIN_CENTI = -5000
+VALID_MAX_CENTI = 15000
+
+class SensorHub:
+    """
+    Samples every 1-Wire bus once per period and shares the readings.
+
+    Each bus (one TemperatureSensor per GPIO) gets a single broadcast
+    convert_temp() per sweep, after which every probe's scratchpad is read,
+    so a sweep costs one conversion window however many probes hang off it.
+    All buses convert at once (BusGroup), so adding buses doesn't add waits.
+    Every probe's samples pass through a median + EMA SensorFilter; get()
+    returns the filtered value, get_raw() the last raw sample. Readings are
+    integer centi-°F throughout (get_centi() for control paths); get() and
+    get_raw() convert to °F floats for display only.
+    Failing probes are backed off per ROM (see ProbeHealth); rescan() searches
+    one bus per call so hot-plugged probes turn up without a long bus stall.
+    """
+
+    def __init__(self, sensors, period=10, max_age=30, probes=None, labels=None, filter_window=5, filter_alpha=25, rom_cache=None):
+        """
+        Initialize sensor hub.
+
+        Args:
+            sensors: Dict of {bus key: TemperatureSensor}
+            period: Seconds between samples (run() is driven by the runtime)
+            max_age: Seconds a reading stays valid; older readings count as missing
+            probes: Dict of {key: (bus key, rom bytes or None)}; None uses the bus's
+                    first probe. Defaults to one probe per bus under the bus key.
+            labels: Optional {key: display name} for the web page
+            filter_window: Median window in samples per probe
+            filter_alpha: EMA weight of each new median in percent
+            rom_cache: File to persist discovered ROMs to (None: no cache)
+        """
+        self.sensors = sensors
+        self.group = BusGroup(sensors)
+        self.period = period
+        self.max_age_ms = int(max_age * 1000)
+        if probes is None:
+            probes = {key: (key, None) for key in sensors}
+        # Per bus: [(key, rom), ...] so a sweep publishes straight from one collect
+        self.bus_probes = {}
+        for key, (bus, rom) in probes.items():
+            self.bus_probes.setdefault(bus, []).append((key, rom))
+        self.keys = list(probes)
+        self.labels = labels or {}
+        self.filters = {key: SensorFilter(filter_window, filter_alpha) for key in probes}
+        # Parallel dicts of small ints: updating an existing key allocates nothing
+        self.readings = {}  # {key: filtered centi-°F}
+        self.stamps = {}    # {key: ticks_ms of the reading}
+        self.raw = {}       # {key: last raw centi-°F}
+        self.rejected = 0   # Samples dropped as out of range
+        self.rom_cache = rom_cache
+        self._scan_order = list(sensors)
+        self._scan_next = 0
+        self.hits = 0       # get() calls answered from the cache
+        self.misses = 0     # get() calls with no reading or a stale one
+
+    def _publish(self, bus, temps):
+        """Store each labelled probe's reading from one bus sweep with a timestamp."""
+        if not temps:
+            return
+        now = time.ticks_ms()
+        for key, rom in self.bus_probes.get(bus, ()):
+            if rom is None:
+                roms = self.sensors[bus].roms  # Unaddressed: first probe found on the bus
+                rom = roms[0] if roms else None
+            temp = temps.get(rom)
+            if temp is None:
+                continue
+            if temp < VALID_MIN_CENTI or temp > VALID_MAX_CENTI:
+                self.rejected += 1
+                continue
+            self.raw[key] = temp
+            self.readings[key] = self.filters[key].push(temp)
+            self.stamps[key] = now
+
+    def refresh(self):
+        """Sample every bus now, blocking (boot only, before the runtime starts)."""
+        for bus, temps in self.group.read_all(unit='CF').items():
+            self._publish(bus, temps)
+
+    async def run(self):
+        """Sample every bus once (conversions overlap), yielding to other tasks during the wait."""
+        for bus, temps in (await self.group.read_all_async(unit='CF')).items():
+            self._publish(bus, temps)
+
+    def rescan(self):
+        """
+        Search one bus for hot-plugged or recovered probes: a bus with a failed
+        read goes first, otherwise round robin. ROM list changes are saved to
+        the cache. Returns the new ROMs.
+        """
+        if not self._scan_order:
+            return []
+        for bus in self._scan_order:
+            if self.sensors[bus].scan_wanted:
+                break
+        else:
+            bus = self._scan_order[self._scan_next % len(self._scan_order)]
+            self._scan_next += 1
+        sensor = self.sensors[bus]
+        before = list(sensor.roms)
+        added = sensor.rescan()
+        if sensor.roms != before:
+            self.save_rom_cache()
+        return added
+
+    def save_rom_cache(self):
+        """Write every bus's ROM list (with probe labels) to the ROM cache file."""
+        if not self.rom_cache:
+            return False
+        names = {}
+        for bus, probes in self.bus_probes.items():
+            sensor = self.sensors.get(bus)
+            for key, rom in probes:
+                if rom is None and sensor and sensor.roms:
+                    rom = sensor.roms[0]
+                if rom is not None:
+                    names[rom] = self.labels.get(key, key)
+        return save_rom_cache(self.rom_cache, self.sensors, names)
+
+    def health(self, key):
+        """ProbeHealth of probe `key` (None if its ROM hasn't been found)."""
+        sensor, rom = self._locate(key)
+        if sensor is None:
+            return None
+        if rom is None and sensor.roms:
+            rom = sensor.roms[0]
+        return sensor.health.get(rom)
+
+    def failing(self):
+        """Keys of probes whose last read failed."""
+        result = []
+        for key in self.keys:
+            health = self.health(key)
+            if health is None or health.failures:
+                result.append(key)
+        return result
+
+    def _locate(self, key):
+        """(TemperatureSensor, rom) for `key`; rom is None for an unaddressed probe."""
+        for bus, probes in self.bus_probes.items():
+            for k, rom in probes:
+                if k == key:
+                    return self.sensors.get(bus), rom
+        return None, None
+
+    def set_resolution(self, key, bits):
+        """Set the DS18B20 resolution (9-12 bit) of probe `key`. Returns True on success."""
+        sensor, rom = self._locate(key)
+        if sensor is None:
+            return False
+        if rom is None and sensor.roms:
+            rom = sensor.roms[0]
+        return sensor.set_resolution(bits, rom) if rom else False
+
+    def resolution(self, key):
+        """(bits, bus conversion ms) for probe `key`, or (None, None) if unknown."""
+        sensor, rom = self._locate(key)
+        if sensor is None:
+            return None, None
+        return sensor.resolution(rom), sensor.conversion_ms
+
+    def unassigned(self):
+        """ROMs found on the buses that no probe key claims: {bus key: [rom, ...]}."""
+        result = {}
+        for bus, sensor in self.sensors.items():
+            roms = [rom for _, rom in self.bus_probes.get(bus, ())]
+            claimed = [rom for rom in roms if rom is not None]
+            if None in roms:
+                claimed += sensor.roms[:1]  # An unaddressed probe takes the first ROM
+            extra = [rom for rom in sensor.roms if rom not in claimed]
+            if extra:
+                result[bus] = extra
+        return result
+
+    def get_centi(self, key, max_age=None):
+        """
+        Latest filtered reading for `key` in centi-°F without touching the bus.
+        Returns None if there is no reading or it is older than max_age seconds
+        (defaults to the hub's max age).
+        """
+        if self._fresh(key, max_age):
+            self.hits += 1
+            return self.readings[key]
+        self.misses += 1
+        return None
+
+    def get(self, key, max_age=None):
+        """Like get_centi(), in °F as a float (display only)."""
+        centi = self.get_centi(key, max_age)
+        return centi / 100 if centi is not None else None
+
+    def _fresh(self, key, max_age=None):
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            return False
+        limit = self.max_age_ms if max_age is None else max_age * 1000
+        return time.ticks_diff(time.ticks_ms(), stamp) <= limit
+
+    def get_raw_centi(self, key):
+        """Last unfiltered reading for `key` in centi-°F (None if never read or stale)."""
+        if not self._fresh(key):
+            return None
+        return self.raw.get(key)
+
+    def get_raw(self, key):
+        """Like get_raw_centi(), in °F as a float (display only)."""
+        centi = self.get_raw_centi(key)
+        return centi / 100 if centi is not None else None
+
+    def age_ms(self, key):
+        """Milliseconds since `key` was last sampled, or None if never."""
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), stamp)
+
+    def stats(self):
+        """Return cache hit/miss counters and probe error totals."""
+        crc = por = 0
+        for sensor in self.sensors.values():
+            for health in sensor.health.values():
+                crc += health.crc_errors
+                por += health.power_on_resets
+        return {'hits': self.hits, 'misses': self.misses, 'failing': len(self.failing()),
+                'crc_errors': crc, 'power_on_resets': por}
@@ -2,42 +2,324 @@ import machine # type: ignore
 import onewire # type: ignore
 import ds18x20 # type: ignore
 import time # type: ignore
+import json
+from scripts.fixedpoint import raw_to_centi_f
+
+# Worst-case DS18B20 conversion time (12-bit resolution)
+CONVERSION_MS = 750
+# Conversion time per resolution (bits -> ms); each bit less halves the wait
+RESOLUTION_MS = {9: 94, 10: 188, 11: 375, 12: 750}
+# Temperature step per resolution (bits -> °C)
+RESOLUTION_STEP_C = {9: 0.5, 10: 0.25, 11: 0.125, 12: 0.0625}
+# Scratchpad value a DS18B20 holds after power-up until its first conversion (85 °C)
+POWER_ON_RAW = 0x0550
+# A failing probe is retried after BACKOFF_BASE_MS, doubling per failure up to BACKOFF_MAX_MS
+BACKOFF_BASE_MS = 20000
+BACKOFF_MAX_MS = 320000
+
+def rom_hex(rom):
+    """ROM bytes as the hex string used in config.json (e.g. '28ff4a1b93160343')."""
+    return ''.join('{:02x}'.format(b) for b in rom)
+
+def parse_rom(text):
+    """Hex string from config.json back to ROM bytes (None if blank)."""
+    if not text:
+        return None
+    text = text.replace(':', '').replace(' ', '')
+    return bytes(int(text[i:i + 2], 16) for i in range(0, len(text), 2))
+
+def load_rom_cache(path):
+    """
+    ROMs found on a previous boot: {pin: [rom bytes, ...]} in discovery order.
+    Returns {} if the file is missing or unreadable (boot then scans every bus).
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return {int(pin): [parse_rom(entry[0]) for entry in entries] for pin, entries in data.items()}
+    except Exception:
+        return {}
+
+def save_rom_cache(path, sensors, labels):
+    """
+    Persist every bus's ROM list with its probe label (None if unlabelled).
+
+    Args:
+        sensors: Dict of {pin: TemperatureSensor}
+        labels: Dict of {rom bytes: label}
+    """
+    data = {}
+    for pin, sensor in sensors.items():
+        data[str(pin)] = [[rom_hex(rom), labels.get(rom)] for rom in sensor.roms]
+    try:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return True
+    except Exception as e:
+        print(f'Error saving ROM cache: {e}')
+        return False
+
+class ProbeHealth:
+    """Read history of one ROM; a probe that keeps failing is backed off instead of read every sweep."""
+
+    def __init__(self):
+        self.failures = 0          # Consecutive failed reads (0 = healthy)
+        self.crc_errors = 0        # Total CRC / bus errors
+        self.power_on_resets = 0   # Total 85 °C power-on values (probe lost power)
+        self.last_good = None      # ticks_ms of the last good read
+        self.failed_at = None      # ticks_ms of the last failure
+        self.backoff_ms = 0        # Reads are skipped this long after failed_at
+
+    def due(self, now):
+        """True if the probe should be read in this sweep."""
+        return not self.backoff_ms or time.ticks_diff(now, self.failed_at) >= self.backoff_ms
+
+    def good(self, now):
+        self.failures = 0
+        self.backoff_ms = 0
+        self.last_good = now
+
+    def fail(self, now, power_on=False):
+        if power_on:
+            self.power_on_resets += 1
+        else:
+            self.crc_errors += 1
+        self.failures += 1
+        self.failed_at = now
+        # One glitch on a long cable is common: retry next sweep, back off from the second failure
+        if self.failures > 1:
+            self.backoff_ms = min(BACKOFF_BASE_MS << min(self.failures - 2, 8), BACKOFF_MAX_MS)
+
+    def retry(self):
+        """Clear the backoff so the next sweep reads the probe (it answered a scan)."""
+        self.backoff_ms = 0
 
 class TemperatureSensor:
-    def __init__(self, pin=10, label=None):
-        """Initialize DS18X20 temperature sensor on the specified pin."""
+    def __init__(self, pin=10, label=None, roms=None):
+        """
+        Initialize DS18X20 temperature sensor on the specified pin.
+        roms: ROM list from the boot cache; skips the bus search (rescan() still finds new probes)
+        """
         self.ds_pin = machine.Pin(pin)
         self.ds_sensor = ds18x20.DS18X20(onewire.OneWire(self.ds_pin))
         self.roms = []
         self.label = label  # e.g., "Inside" or "Outside"
-        self.scan_sensors()
+        self.conversion_ms = CONVERSION_MS
+        self.conversion_started = None  # ticks_ms when convert_temp() was issued, None when idle
+        self.last_centi = {}            # Last collected readings {rom: centi-°F}
+        self.resolutions = {}           # {rom: bits} set via set_resolution(); others are 12-bit
+        self.health = {}                # {rom: ProbeHealth}
+        self.scan_wanted = False        # A read failed: rescan this bus first
+        self.from_cache = bool(roms)
+        if roms:
+            self.roms = list(roms)
+            for rom in self.roms:
+                self.health[rom] = ProbeHealth()
+            print(f'Using {len(self.roms)} cached DS18X20 ROM(s) on {self.label or "pin"}')
+        else:
+            self.scan_sensors()
     
     def scan_sensors(self):
         """Scan for connected DS18X20 sensors."""
         try:
             # Convert bytearray to bytes so they can be used as dict keys
             self.roms = [bytes(rom) for rom in self.ds_sensor.scan()]
+            for rom in self.roms:
+                self.health.setdefault(rom, ProbeHealth())
             print(f'Found {len(self.roms)} DS18X20 sensor(s) on {self.label or "pin"}')
             return self.roms
         except Exception as e:
             print(f'Error scanning sensors: {e}')
             return []
     
-    def read_temp_c(self, rom=None):
-        """Read temperature in Celsius. If rom=None, reads first sensor."""
+    def rescan(self):
+        """
+        Search the bus again without dropping anything: hot-plugged probes are
+        added, failing probes that answer get their backoff cleared and their
+        resolution rewritten (a power cycle resets it). Returns the new ROMs.
+        Skipped while a conversion is in flight.
+        """
+        if self.conversion_started is not None:
+            return []
+        self.scan_wanted = False
+        try:
+            found = [bytes(rom) for rom in self.ds_sensor.scan()]
+        except Exception:
+            return []  # Empty or shorted bus; try again next time
+        added = []
+        for rom in found:
+            health = self.health.get(rom)
+            if health is None:
+                self.health[rom] = ProbeHealth()
+                self.roms.append(rom)
+                added.append(rom)
+                print(f'🔌 New DS18X20 {rom_hex(rom)} on {self.label or "pin"}')
+            elif health.failures:
+                health.retry()
+                self._restore_resolution(rom)
+        if self.from_cache:
+            # First search since a cached boot: a stale cache falls back to search
+            # order, as a cold boot would (unaddressed probes bind to roms[0])
+            self.from_cache = False
+            if found and found != self.roms[:len(found)]:
+                self.roms = found + [rom for rom in self.roms if rom not in found]
+        if added:
+            self._update_conversion_ms()
+        return added
+    
+    # ===== START: Resolution =====
+    def set_resolution(self, bits, rom=None):
+        """
+        Write the resolution (9-12 bit) into the configuration register of `rom`
+        (every probe on the bus if None) and shorten the conversion wait to match.
+        The bus waits for its slowest probe. Returns True on success.
+        """
+        if bits not in RESOLUTION_MS:
+            print(f'Invalid resolution {bits} (use 9-12)')
+            return False
+        ok = True
+        for r in ([rom] if rom else self.roms):
+            try:
+                buf = self.ds_sensor.read_scratch(r)
+                # Keep the TH/TL alarm bytes, set R1:R0 in the config byte
+                self.ds_sensor.write_scratch(r, bytearray((buf[2], buf[3], ((bits - 9) << 5) | 0x1F)))
+                self.resolutions[r] = bits
+            except Exception as e:
+                print(f'Error setting resolution on {rom_hex(r)}: {e}')
+                ok = False
+        self._update_conversion_ms()
+        return ok
+
+    def _update_conversion_ms(self):
+        self.conversion_ms = max([RESOLUTION_MS[self.resolutions.get(r, 12)] for r in self.roms] or [CONVERSION_MS])
+
+    def _restore_resolution(self, rom):
+        """Rewrite a configured resolution after the probe lost power (it reverts to its EEPROM value)."""
+        bits = self.resolutions.get(rom)
+        if bits is not None:
+            self.set_resolution(bits, rom)
+
+    def resolution(self, rom=None):
+        """Resolution in bits of `rom` (the first probe if None)."""
+        if rom is None and self.roms:
+            rom = self.roms[0]
+        return self.resolutions.get(rom, 12)
+    # ===== END: Resolution =====
+
+    # ===== START: Two-phase read (start -> poll -> collect) =====
+    def due(self):
+        """True if any probe on the bus is due a read (all backing off, or none found: skip the conversion)."""
+        now = time.ticks_ms()
+        for rom in self.roms:
+            if self.health[rom].due(now):
+                return True
+        return False
+
+    def start_conversion(self):
+        """Start a conversion on every sensor on this pin and return immediately."""
         try:
             self.ds_sensor.convert_temp()
-            time.sleep_ms(750)
-            
-            if rom is None and self.roms:
-                rom = self.roms[0]
-            
-            if rom:
-                return self.ds_sensor.read_temp(rom)
-            return None
+            self.conversion_started = time.ticks_ms()
+            return True
         except Exception as e:
-            print(f'Error reading temperature: {e}')
+            print(f'Error starting conversion: {e}')
+            self.conversion_started = None
+            return False
+    
+    def ms_until_ready(self):
+        """Milliseconds left before the pending conversion can be collected (0 if ready)."""
+        if self.conversion_started is None:
+            return 0
+        elapsed = time.ticks_diff(time.ticks_ms(), self.conversion_started)
+        return self.conversion_ms - elapsed if elapsed < self.conversion_ms else 0
+    
+    def poll_ready(self):
+        """True once a started conversion has had time to finish."""
+        return self.conversion_started is not None and self.ms_until_ready() == 0
+    
+    def collect(self, unit='F', rom=None):
+        """
+        Read scratchpads for the finished conversion.
+        Returns dict of {rom: temp} (only `rom` if given), or {} if nothing was started.
+        Probes backing off after failures are skipped and missing from the result.
+        unit: 'F', 'C', or 'CF' for integer centi-°F (no floats on the way)
+        """
+        if self.conversion_started is None:
+            return {}
+        self.conversion_started = None
+        now = time.ticks_ms()
+        centis = {}
+        for r in ([rom] if rom else self.roms):
+            health = self.health.setdefault(r, ProbeHealth())
+            if not health.due(now):
+                continue
+            # One bad probe (CRC error, unplugged) must not hide the rest of the bus
+            try:
+                raw = self._read_raw(r)
+            except Exception as e:
+                health.fail(now)
+                if health.failures == 1:
+                    print(f'Error reading {rom_hex(r)} on {self.label or "pin"}: {e}')
+                    self.scan_wanted = True  # Cached ROM may be stale: search this bus next
+                continue
+            if raw == POWER_ON_RAW:
+                # Lost power since the conversion started: the reading is not a temperature
+                health.fail(now, power_on=True)
+                print(f'⚠️ {rom_hex(r)} on {self.label or "pin"} reset (85°C power-on value)')
+                self._restore_resolution(r)
+                continue
+            if health.failures:
+                print(f'✅ {rom_hex(r)} on {self.label or "pin"} reading again after {health.failures} failure(s)')
+            health.good(now)
+            centis[r] = raw_to_centi_f(raw)
+        self.last_centi = centis
+        return self._in_unit(centis, unit)
+
+    def _read_raw(self, rom):
+        """Scratchpad temperature of `rom` in 1/16 °C (the driver checks the CRC)."""
+        buf = self.ds_sensor.read_scratch(rom)
+        raw = buf[0] | (buf[1] << 8)
+        if raw & 0x8000:
+            raw -= 0x10000
+        if rom[0] == 0x10:
+            raw <<= 3  # DS18S20 counts in 0.5 °C
+        return raw
+    
+    def _in_unit(self, centis, unit):
+        """Convert a {rom: centi-°F} dict to the requested unit."""
+        unit = unit.upper()
+        if unit == 'CF':
+            return dict(centis)
+        if unit == 'F':
+            return {r: c / 100 for r, c in centis.items()}
+        return {r: (c - 3200) / 180 for r, c in centis.items()}
+    
+    async def read_all_temps_async(self, unit='F'):
+        """Like read_all_temps(), but yields to other tasks during the conversion wait."""
+        from scripts.runtime import sleep_ms
+        # Join a conversion another task already started instead of restarting it
+        if self.conversion_started is None and not (self.due() and self.start_conversion()):
+            return {}
+        await sleep_ms(self.ms_until_ready())
+        if self.poll_ready():
+            return self.collect(unit)
+        return self._in_unit(self.last_centi, unit)  # Collected by a task sharing this conversion
+    # ===== END: Two-phase read =====
+    
+    def _wait_ready(self):
+        """Block until the pending conversion is done (REPL / boot helpers only)."""
+        remaining = self.ms_until_ready()
+        if remaining:
+            time.sleep_ms(remaining)
+    
+    def read_temp_c(self, rom=None):
+        """Read temperature in Celsius. If rom=None, reads first sensor. Blocks for the conversion."""
+        if rom is None and self.roms:
+            rom = self.roms[0]
+        if not rom or not self.start_conversion():
             return None
+        self._wait_ready()
+        return self.collect(unit='C', rom=rom).get(rom)
     
     def read_temp_f(self, rom=None):
         """Read temperature in Fahrenheit."""
@@ -47,19 +329,67 @@ class TemperatureSensor:
         return None
     
     def read_all_temps(self, unit='F'):
-        """Read all connected sensors. Returns dict of {rom: temp}."""
-        results = {}
-        try:
-            self.ds_sensor.convert_temp()
-            time.sleep_ms(750)
-            
-            for rom in self.roms:
-                temp_c = self.ds_sensor.read_temp(rom)
-                if unit.upper() == 'F':
-                    results[rom] = temp_c * (9/5) + 32
-                else:
-                    results[rom] = temp_c
-        except Exception as e:
-            print(f'Error reading temperatures: {e}')
-        
-        return results
+        """Read all connected sensors (blocks for the conversion). Returns dict of {rom: temp}."""
+        if not self.start_conversion():
+            return {}
+        self._wait_ready()
+        return self.collect(unit)
+
+class BusGroup:
+    """
+    Reads several buses with overlapping conversions: convert_temp() goes out on
+    every bus back-to-back, then one shared wait covers them all, so a sweep
+    costs the slowest bus's conversion window instead of the sum of them.
+    """
+
+    def __init__(self, sensors):
+        """
+        Args:
+            sensors: Dict of {bus key: TemperatureSensor}
+        """
+        self.sensors = sensors
+        self.last_sweep_ms = 0  # Duration of the most recent async sweep
+
+    def _start(self):
+        """Start a conversion on every idle bus. Returns the keys with one in flight."""
+        pending = []
+        for key, sensor in self.sensors.items():
+            # Join a conversion another task already started instead of restarting it;
+            # a bus whose probes are all backing off adds no wait
+            if sensor.conversion_started is not None or (sensor.due() and sensor.start_conversion()):
+                pending.append(key)
+        return pending
+
+    def ms_until_ready(self):
+        """Milliseconds until the slowest in-flight bus can be collected."""
+        return max([sensor.ms_until_ready() for sensor in self.sensors.values()] or [0])
+
+    def _collect(self, pending, unit):
+        result = {}
+        for key in pending:
+            sensor = self.sensors[key]
+            if sensor.poll_ready():
+                result[key] = sensor.collect(unit)
+            else:
+                result[key] = sensor._in_unit(sensor.last_centi, unit)  # Collected by a task sharing this conversion
+        return result
+
+    async def read_all_async(self, unit='F'):
+        """Sweep every bus, yielding during the shared wait. Returns {bus key: {rom: temp}}."""
+        from scripts.runtime import sleep_ms
+        started = time.ticks_ms()
+        pending = self._start()
+        wait = self.ms_until_ready()
+        if wait:
+            await sleep_ms(wait)
+        result = self._collect(pending, unit)
+        self.last_sweep_ms = time.ticks_diff(time.ticks_ms(), started)
+        return result
+
+    def read_all(self, unit='F'):
+        """Blocking sweep (REPL / boot only). Returns {bus key: {rom: temp}}."""
+        pending = self._start()
+        wait = self.ms_until_ready()
+        if wait:
+            time.sleep_ms(wait)
+        return self._collect(pending, unit)
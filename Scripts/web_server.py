@@ -1,210 +1,281 @@
-import socket
 import time # type: ignore
 import json
 import scripts.discord_webhook as discord_webhook
+import scripts.gc_policy as gc_policy
+import scripts.metrics as metrics
+from scripts.runtime import asyncio, ticks_us, ticks_diff
+from scripts.fixedpoint import centi_str
+from scripts.scheduler import ScheduleIndex, DAY_NAMES, RAMP_MODES, DEFAULT_WARMUP_RATE, parse_days, parse_date, describe
+
+# Rough peak heap for building + encoding one HTML page
+PAGE_RENDER_BYTES = 32 * 1024
+# Schedule editor rows per page: the page (and the form it posts back) stays
+# the same size however many schedules there are
+SCHEDULE_PAGE_ROWS = 10
 
 class TempWebServer:
     """Simple web server for viewing temperatures and adjusting settings."""
     def __init__(self, port=80):
         self.port = port
-        self.socket = None
-        self.sensors = {}
+        self.server = None
         self.last_page_render = 0  # Track last successful HTML generation
+        self._context = None       # (sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config)
+        self.config = None         # Live ConfigStore (pages read it; nothing re-reads config.json)
+        self._index = (None, None) # (config version, ScheduleIndex) when there is no schedule monitor
+        self._metrics = metrics.task("WebRequest")
 
-    def start(self):
-        """Start the web server (non-blocking)."""
+    async def serve(self, sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config):
+        """Start listening; each client is then served as its own coroutine (run under the runtime)."""
+        self._context = (sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config)
+        self.config = config
         try:
-            self.socket = socket.socket()
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.socket.bind(('0.0.0.0', self.port))
-            self.socket.listen(1)
-            self.socket.setblocking(False)
+            self.server = await asyncio.start_server(self._handle_client, '0.0.0.0', self.port)
             print("Web server started on port {}".format(self.port))
         except Exception as e:
             print("Failed to start web server: {}".format(e))
 
-    def check_requests(self, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
-        """Check for incoming requests (call in main loop)."""
-        if not self.socket:
-            return
-        try:
-            conn, addr = self.socket.accept()
-            conn.settimeout(3.0)
-            
-            # Read request headers first (in chunks to avoid truncation)
-            request_bytes = b''
-            while b'\r\n\r\n' not in request_bytes:
-                chunk = conn.recv(512)
-                if not chunk:
-                    break
-                request_bytes += chunk
-                if len(request_bytes) > 4096:  # Safety limit
+    async def _read_request(self, reader):
+        """Read headers and (for POST) the full body."""
+        # Read request headers first (in chunks to avoid truncation)
+        request_bytes = b''
+        while b'\r\n\r\n' not in request_bytes:
+            chunk = await reader.read(512)
+            if not chunk:
+                break
+            request_bytes += chunk
+            if len(request_bytes) > 4096:  # Safety limit
+                break
+        
+        # Parse Content-Length from headers
+        request = request_bytes.decode('utf-8')
+        content_length = 0
+        if 'Content-Length:' in request:
+            for line in request.split('\r\n'):
+                if line.lower().startswith('content-length:'):
+                    content_length = int(line.split(':')[1].strip())
                     break
-            
-            # Parse Content-Length from headers
-            request = request_bytes.decode('utf-8')
-            content_length = 0
-            if 'Content-Length:' in request:
-                for line in request.split('\r\n'):
-                    if line.lower().startswith('content-length:'):
-                        content_length = int(line.split(':')[1].strip())
+        
+        # If POST request with body, read remaining data
+        if 'POST' in request and content_length > 0:
+            # Check how much body we already have
+            header_end = request.find('\r\n\r\n') + 4
+            body_so_far = request[header_end:]
+            bytes_read = len(body_so_far.encode('utf-8'))
+            bytes_needed = content_length - bytes_read
+            
+            # Read remaining body in loop (read() may not return all at once!)
+            if bytes_needed > 0:
+                remaining_parts = []
+                total_read = 0
+                
+                # Keep reading until we have all bytes
+                while total_read < bytes_needed:
+                    chunk = await reader.read(min(512, bytes_needed - total_read))
+                    if not chunk:
+                        print("WARNING: Connection closed before all data received!")
                         break
-            
-            # If POST request with body, read remaining data
-            if 'POST' in request and content_length > 0:
-                # Check how much body we already have
-                header_end = request.find('\r\n\r\n') + 4
-                body_so_far = request[header_end:]
-                bytes_read = len(body_so_far.encode('utf-8'))
-                bytes_needed = content_length - bytes_read
+                    remaining_parts.append(chunk)
+                    total_read += len(chunk)
                 
-                # Read remaining body in loop (recv() may not return all at once!)
-                if bytes_needed > 0:
-                    remaining_parts = []
-                    total_read = 0
-                    
-                    # Keep reading until we have all bytes
-                    while total_read < bytes_needed:
-                        chunk = conn.recv(min(512, bytes_needed - total_read))
-                        if not chunk:
-                            print("WARNING: Connection closed before all data received!")
-                            break
-                        remaining_parts.append(chunk)
-                        total_read += len(chunk)
-                    
-                    remaining = b''.join(remaining_parts)
-                    request = request[:header_end] + body_so_far + remaining.decode('utf-8')
+                remaining = b''.join(remaining_parts)
+                request = request[:header_end] + body_so_far + remaining.decode('utf-8')
+        return request
+
+    async def _send(self, writer, data):
+        """Write bytes in chunks (MicroPython has small socket buffer)."""
+        chunk_size = 1024  # Send 1KB at a time
+        for i in range(0, len(data), chunk_size):
+            writer.write(data[i:i+chunk_size])
+            await writer.drain()
+
+    async def _send_body(self, writer, body, content_type='text/html; charset=utf-8', extra_headers=''):
+        """Send a 200 response with headers followed by the body bytes."""
+        headers = 'HTTP/1.1 200 OK\r\nContent-Type: {}\r\nContent-Length: {}\r\n{}Connection: close\r\n\r\n'.format(
+            content_type, len(body), extra_headers
+        )
+        await self._send(writer, headers.encode('utf-8'))
+        await self._send(writer, body)
+
+    async def _handle_client(self, reader, writer):
+        """Serve one HTTP client; awaits on socket I/O so relay control keeps running."""
+        sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config = self._context
+        start = ticks_us()
+        try:
+            request = await asyncio.wait_for(self._read_request(reader), 3)
+            response = None
 
             if 'POST /update' in request:
-                response = self._handle_update(request, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
+                response = self._handle_update(request, sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config)
                 # If error page redirects, handle it
                 if isinstance(response, str) and response.startswith('HTTP/1.1'):
                     print("DEBUG: Sending redirect from /update ({} bytes)".format(len(response)))
-                    conn.sendall(response.encode('utf-8'))
-                    conn.close()
+                    await self._send(writer, response.encode('utf-8'))
                     print("DEBUG: Redirect sent, connection closed")
                     return
 
             elif 'GET /schedule' in request:
-                response = self._get_schedule_editor_page(sensors, ac_monitor, heater_monitor)
-                response_bytes = response.encode('utf-8')
-                
-                # Send headers
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: text/html; charset=utf-8\r\n')
-                conn.sendall('Content-Length: {}\r\n'.format(len(response_bytes)).encode('utf-8'))
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                
-                # Send body in chunks (MicroPython has small socket buffer)
-                chunk_size = 1024  # Send 1KB at a time
-                for i in range(0, len(response_bytes), chunk_size):
-                    chunk = response_bytes[i:i+chunk_size]
-                    conn.sendall(chunk)
-                
-                conn.close()
+                page = self._query_int(request, 'page')
+                response_bytes = self._get_schedule_editor_page(sensor_hub, ac_monitor, heater_monitor, page).encode('utf-8')
+                await self._send_body(writer, response_bytes)
                 print("DEBUG: Schedule editor page sent successfully ({} bytes total)".format(len(response_bytes)))
                 return
 
             elif 'GET /settings' in request:
-                response = self._get_settings_page(sensors, ac_monitor, heater_monitor)
-                response_bytes = response.encode('utf-8')
-                
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: text/html; charset=utf-8\r\n')
-                conn.sendall('Content-Length: {}\r\n'.format(len(response_bytes)).encode('utf-8'))
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                
-                chunk_size = 1024
-                for i in range(0, len(response_bytes), chunk_size):
-                    chunk = response_bytes[i:i+chunk_size]
-                    conn.sendall(chunk)
-                
-                conn.close()
+                response_bytes = self._get_settings_page(sensor_hub, ac_monitor, heater_monitor).encode('utf-8')
+                await self._send_body(writer, response_bytes)
                 print("DEBUG: Settings page sent successfully ({} bytes total)".format(len(response_bytes)))
                 return
             
             elif 'POST /settings' in request:
-                response = self._handle_settings_update(request, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
+                response = self._handle_settings_update(request, sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config)
                 if isinstance(response, str) and response.startswith('HTTP/1.1'):
-                    conn.sendall(response.encode('utf-8'))
-                    conn.close()
+                    await self._send(writer, response.encode('utf-8'))
                     print("DEBUG: Settings update redirect sent")
                     return
 
             elif 'POST /schedule' in request:
-                response = self._handle_schedule_update(request, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
+                response = self._handle_schedule_update(request, sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config)
                 # Redirects are already complete HTTP responses, send directly
                 if isinstance(response, str) and response.startswith('HTTP/1.1'):
                     print("DEBUG: Sending redirect ({} bytes)".format(len(response)))
-                    conn.sendall(response.encode('utf-8'))
-                    conn.close()
+                    await self._send(writer, response.encode('utf-8'))
                     print("DEBUG: Redirect sent, connection closed")
                     return
 
             elif 'GET /sched.js' in request:
                 js = self._build_sched_js()  # bytes
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: application/javascript; charset=utf-8\r\n')
-                conn.sendall('Content-Length: {}\r\n'.format(len(js)).encode('utf-8'))
-                conn.sendall(b'Cache-Control: max-age=300\r\n')
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                conn.sendall(js)
-                conn.close()
+                await self._send_body(writer, js, 'application/javascript; charset=utf-8', 'Cache-Control: max-age=300\r\n')
                 return
 
             elif 'GET /ping' in request:
                 # Quick health check endpoint (no processing)
-                body = b'OK'
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: text/plain\r\n')
-                conn.sendall(b'Content-Length: 2\r\n')
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                conn.sendall(body)
-                conn.close()
+                await self._send_body(writer, b'OK', 'text/plain')
+                return
+
+            elif 'GET /api/temps' in request:
+                # Machine-readable readings (integer centi-°F, no float formatting)
+                body = self._temps_json(sensor_hub, ac_monitor, heater_monitor).encode('utf-8')
+                await self._send_body(writer, body, 'application/json', 'Cache-Control: no-store\r\n')
+                return
+
+            elif 'GET /metrics' in request:
+                # Task latency histograms and counters (plain text)
+                await self._send_body(writer, metrics.render().encode('utf-8'), 'text/plain; version=0.0.4')
                 return
 
             else:
-                response = self._get_status_page(sensors, ac_monitor, heater_monitor, schedule_monitor)
+                response = self._get_status_page(sensor_hub, ac_monitor, heater_monitor, schedule_monitor)
 
             if response is None:
-                response = self._get_status_page(sensors, ac_monitor, heater_monitor, schedule_monitor)
+                response = self._get_status_page(sensor_hub, ac_monitor, heater_monitor, schedule_monitor)
             
             # ===== START: Send response with proper HTTP headers =====
-            print("DEBUG: Sending response ({} bytes)".format(len(response.encode('utf-8'))))
+            response_bytes = response.encode('utf-8')
+            print("DEBUG: Sending response ({} bytes)".format(len(response_bytes)))
             try:
                 # Check if response already has HTTP headers (like redirects)
                 if response.startswith('HTTP/1.1'):
                     # Response already has headers (redirect or other), send as-is
-                    conn.sendall(response.encode('utf-8'))
+                    await self._send(writer, response_bytes)
                 else:
                     # HTML response needs headers added first
-                    conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                    conn.sendall(b'Content-Type: text/html; charset=utf-8\r\n')
-                    conn.sendall('Content-Length: {}\r\n'.format(len(response.encode('utf-8'))).encode('utf-8'))
-                    conn.sendall(b'Connection: close\r\n')
-                    conn.sendall(b'\r\n')  # Blank line separates headers from body
-                    conn.sendall(response.encode('utf-8'))
+                    await self._send_body(writer, response_bytes)
                 
                 print("DEBUG: Response sent successfully")
             except Exception as e:
                 print("ERROR: Failed to send response: {}".format(e))
-            finally:
-                conn.close()
-                import gc  # type: ignore
-                gc.collect()
-                print("DEBUG: Client connection closed")
             # ===== END: Send response =====
 
+        except asyncio.TimeoutError:
+            self._metrics.error()
+            print("Web client timed out")
         except OSError:
-            pass
+            pass  # Client went away
         except Exception as e:
+            self._metrics.error()
             print("Web server error: {}".format(e))
             import sys
             sys.print_exception(e)
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+            self._metrics.observe(ticks_diff(ticks_us(), start))
+
+    def _query_int(self, request, name, default=0):
+        """Integer query parameter from the request line ('GET /path?name=3 HTTP/1.1'), or default."""
+        path = request.split(' ', 2)[1] if request.count(' ') >= 2 else ''
+        if '?' not in path:
+            return default
+        for pair in path.split('?', 1)[1].split('&'):
+            if pair.startswith(name + '='):
+                try:
+                    return int(pair[len(name) + 1:])
+                except ValueError:
+                    return default
+        return default
+
+    def _probe_card(self, sensor_hub):
+        """Card listing every probe beyond inside/outside (empty if there are none)."""
+        if not sensor_hub:
+            return ''
+        rows = []
+        for key in sensor_hub.keys:
+            if key in ('inside', 'outside'):
+                continue
+            rows.append('<div class="status-item"><div class="label">{}</div><div class="targets">{}°F <small>(raw {}°F)</small></div></div>'.format(
+                sensor_hub.labels.get(key, key), self._temp_str(sensor_hub, key), self._raw_str(sensor_hub, key)
+            ))
+        if not rows:
+            return ''
+        return '<div class="card full-width"><div class="label">🌡️ Other Probes</div><div class="status">{}</div></div>'.format(''.join(rows))
+
+    def _temp_str(self, sensor_hub, key):
+        """Format the hub's cached (filtered) reading for `key` ("N/A" if missing or stale)."""
+        return centi_str(sensor_hub.get_centi(key) if sensor_hub else None)
+
+    def _raw_str(self, sensor_hub, key):
+        """Format the last unfiltered reading for `key` ("N/A" if missing or stale)."""
+        return centi_str(sensor_hub.get_raw_centi(key) if sensor_hub else None)
+
+    def _temps_json(self, sensor_hub, ac_monitor, heater_monitor):
+        """Current readings and setpoints as JSON; every temperature is an integer in centi-°F."""
+        probes = {}
+        if sensor_hub:
+            for key in sensor_hub.keys:
+                probes[key] = {
+                    'label': sensor_hub.labels.get(key, key),
+                    'centi_f': sensor_hub.get_centi(key),
+                    'raw_centi_f': sensor_hub.get_raw_centi(key),
+                    'age_ms': sensor_hub.age_ms(key),
+                }
+                health = sensor_hub.health(key)
+                if health:
+                    probes[key]['health'] = {
+                        'failures': health.failures,
+                        'crc_errors': health.crc_errors,
+                        'power_on_resets': health.power_on_resets,
+                        'backoff_ms': health.backoff_ms,
+                    }
+        data = {'unit': 'centi_f', 'probes': probes}
+        for name, setpoint in (('ac', ac_monitor), ('heater', heater_monitor)):
+            if setpoint:
+                data[name] = {
+                    'on': setpoint.relay.get_state(),
+                    'target_centi_f': setpoint.target_centi,
+                    'swing_centi_f': setpoint.swing_centi,
+                }
+        if heater_monitor and heater_monitor.controller.pid is not None:
+            data['heater']['pid_duty'] = heater_monitor.controller.pid.duty  # Hundredths of a percent
+        if self.config is not None:
+            data['config_version'] = self.config.version  # Changes whenever any setting does
+        if ac_monitor:
+            data['mode'] = ac_monitor.controller.state
+            data['lockout_reason'] = ac_monitor.controller.lockout_reason
+            data['trend_centi_f_per_min'] = ac_monitor.controller.trend_rate
+        return json.dumps(data)
 
     def _build_sched_js(self):
         # Keep this as bytes; no .format() so no brace escaping and less RAM churn
@@ -216,60 +287,15 @@ class TempWebServer:
                 b"if(w==='heater'){if(!isNaN(hv)&&!isNaN(av)&&hv>av){a.value=hv;} if(l)l.value='heater';}"
                 b"else{if(!isNaN(hv)&&!isNaN(av)&&av<hv){h.value=av;} if(l)l.value='ac';}};"
                 b"document.addEventListener('DOMContentLoaded',function(){var f=document.querySelector('form[action=\"/schedule\"]');"
-                b"if(!f)return;f.addEventListener('submit',function(){for(var i=0;i<4;i++){"
+                b"if(!f)return;f.addEventListener('submit',function(){var n=document.querySelectorAll('.sched').length;for(var i=0;i<n;i++){"
                 b"var h=document.querySelector('input[name=\"schedule_'+i+'_heater\"]');"
                 b"var a=document.querySelector('input[name=\"schedule_'+i+'_ac\"]');"
                 b"var l=document.getElementById('schedule_'+i+'_last_changed');"
                 b"if(!h||!a)continue;var hv=parseFloat(h.value),av=parseFloat(a.value);"
                 b"if(isNaN(hv)||isNaN(av))continue;if(hv>av){if(l&&l.value==='ac'){h.value=av;}else{a.value=hv;}}}});});")
 
-    def _save_config_to_file(self, config):
-        """Save configuration to config.json file (atomic write)."""
-        try:
-            import os
-            
-            print("DEBUG: Saving config with {} schedules".format(len(config.get('schedules', []))))
-            
-            # Write to temp file first
-            with open('config.tmp', 'w') as f:
-                json.dump(config, f)
-            
-            # Remove old config if exists
-            try:
-                os.remove('config.json')
-            except:
-                pass
-            
-            # Rename temp to config (atomic on most filesystems)
-            os.rename('config.tmp', 'config.json')
-            
-            # Update discord module in-memory config so webhook URLs are current
-            try:
-                discord_webhook.set_config(config)
-            except Exception:
-                pass
-    
-            print("Settings saved to config.json")
-            return True
-        except Exception as e:
-            print("❌ Error saving config: {}".format(e))
-            import sys
-            sys.print_exception(e)
-            return False
-
-    def _load_config(self):
-        """Load configuration from file."""
-        try:
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print("Error loading config:", e)
-            raise  # Or handle as appropriate
-
-    def _handle_schedule_update(self, request, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+    def _handle_schedule_update(self, request, sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config):
         """Handle schedule form submission."""
-        import gc  # type: ignore
-        gc.collect()
         try:
             body = request.split('\r\n\r\n')[1] if '\r\n\r\n' in request else ''
             params = {}
@@ -283,27 +309,25 @@ class TempWebServer:
             mode_action = params.get('mode_action', '')
             
             if mode_action == 'resume':
-                gc.collect()
                 # Resume automatic scheduling
                 config['schedule_enabled'] = True
                 config['permanent_hold'] = False
                 
-                if self._save_config_to_file(config):
-                    print("▶️ Schedule resumed - Automatic mode")
-            
-                    if schedule_monitor:
-                        schedule_monitor.reload_config(config)
-                        # ===== IMMEDIATELY APPLY ACTIVE SCHEDULE =====
-                        active_schedule = schedule_monitor._find_active_schedule()
-                        if active_schedule:
-                            schedule_monitor._apply_schedule(active_schedule)
-                            print("✅ Active schedule applied immediately after resume: {}".format(
-                                active_schedule.get('name', 'Unnamed')
-                            ))
+                print("▶️ Schedule resumed - Automatic mode")
+            
+                if schedule_monitor:
+                    schedule_monitor.reload_config(config)
+                    # ===== IMMEDIATELY APPLY ACTIVE SCHEDULE =====
+                    active_schedule = schedule_monitor._find_active_schedule()
+                    if active_schedule:
+                        schedule_monitor._apply_schedule(active_schedule)
+                        print("✅ Active schedule applied immediately after resume: {}".format(
+                            active_schedule.get('name', 'Unnamed')
+                        ))
                 
                 # Send Discord notification
                 try:
-                    discord_webhook.send_discord_message("▶️ Schedule resumed - Automatic temperature control active")
+                    discord_webhook.queue_discord_message("▶️ Schedule resumed - Automatic temperature control active")
                 except:
                     pass
                 
@@ -317,19 +341,17 @@ class TempWebServer:
                 return redirect_response
             
             elif mode_action == 'temporary_hold':
-                gc.collect()
                 # Enter temporary hold (pause schedules temporarily)
                 config['schedule_enabled'] = False
                 config['permanent_hold'] = False
                 
-                if self._save_config_to_file(config):
-                    print("⏸️ Temporary hold activated")
+                print("⏸️ Temporary hold activated")
                     
-                    if schedule_monitor:
-                        schedule_monitor.reload_config(config)
+                if schedule_monitor:
+                    schedule_monitor.reload_config(config)
                 
                 try:
-                    discord_webhook.send_discord_message("⏸️ Temporary hold - Schedules paused, manual control active")
+                    discord_webhook.queue_discord_message("⏸️ Temporary hold - Schedules paused, manual control active")
                 except:
                     pass
                 
@@ -342,19 +364,17 @@ class TempWebServer:
                 return redirect_response
             
             elif mode_action == 'permanent_hold':
-                gc.collect()
                 # Enter permanent hold (disable schedules permanently)
                 config['schedule_enabled'] = False
                 config['permanent_hold'] = True
                 
-                if self._save_config_to_file(config):
-                    print("🛑 Permanent hold activated")
+                print("🛑 Permanent hold activated")
                     
-                    if schedule_monitor:
-                        schedule_monitor.reload_config(config)
+                if schedule_monitor:
+                    schedule_monitor.reload_config(config)
                 
                 try:
-                    discord_webhook.send_discord_message("🛑 Permanent hold - Schedules disabled, manual control only")
+                    discord_webhook.queue_discord_message("🛑 Permanent hold - Schedules disabled, manual control only")
                 except:
                     pass
                 
@@ -368,21 +388,29 @@ class TempWebServer:
                 return redirect_response
             
             elif mode_action == 'save_schedules':
-                gc.collect()
                 # Just fall through to schedule parsing below
                 pass
             # ===== END: Handle mode actions =====
 
             # Load previous schedules to compute deltas
-            prev = self._load_config()
-            prev_schedules = prev.get('schedules', [])
+            prev_schedules = config.get('schedules', [])
 
             # ===== START: Handle schedule configuration save =====
-            # Parse schedules (4 slots)
+            # Parse schedules (the rows of one editor page: they replace
+            # prev_schedules[offset:offset + replace])
             schedules = []
             has_any_schedule_data = False
-            
-            for i in range(4):
+            try:
+                schedule_count = int(params.get('schedule_count', 0))
+                offset = min(max(int(params.get('schedule_offset', 0)), 0), len(prev_schedules))
+                replace = max(int(params.get('schedule_replace', len(prev_schedules))), 0)
+            except ValueError:
+                schedule_count = 0
+                offset = 0
+                replace = 0
+            
+            for i in range(schedule_count):
+                n = offset + i + 1  # Number shown in the editor
                 time_key = 'schedule_{}_time'.format(i)
                 name_key = 'schedule_{}_name'.format(i)
                 ac_key = 'schedule_{}_ac'.format(i)
@@ -395,19 +423,19 @@ class TempWebServer:
                 if time_key in params and params[time_key]:
                     # ===== VALIDATE: If time is set, AC and Heater MUST be set =====
                     if ac_key not in params or not params[ac_key]:
-                        print("❌ Validation failed: Schedule {} has time but missing AC target".format(i+1))
+                        print("❌ Validation failed: Schedule {} has time but missing AC target".format(n))
                         return self._get_error_page(
                             "Incomplete Schedule",
-                            "Schedule {}: AC target is required when time is set".format(i+1),
-                            sensors, ac_monitor, heater_monitor
+                            "Schedule {}: AC target is required when time is set".format(n),
+                            sensor_hub, ac_monitor, heater_monitor
                         )
                     
                     if heater_key not in params or not params[heater_key]:
-                        print("❌ Validation failed: Schedule {} has time but missing Heater target".format(i+1))
+                        print("❌ Validation failed: Schedule {} has time but missing Heater target".format(n))
                         return self._get_error_page(
                             "Incomplete Schedule",
-                            "Schedule {}: Heater target is required when time is set".format(i+1),
-                            sensors, ac_monitor, heater_monitor
+                            "Schedule {}: Heater target is required when time is set".format(n),
+                            sensor_hub, ac_monitor, heater_monitor
                         )
                     # ===== END VALIDATION =====
                     
@@ -419,8 +447,8 @@ class TempWebServer:
                         print("Invalid time format: {}".format(schedule_time))
                         return self._get_error_page(
                             "Invalid Time",
-                            "Schedule {}: Time format must be HH:MM".format(i+1),
-                            sensors, ac_monitor, heater_monitor
+                            "Schedule {}: Time format must be HH:MM".format(n),
+                            sensor_hub, ac_monitor, heater_monitor
                         )
                     
                     try:
@@ -431,12 +459,12 @@ class TempWebServer:
                         print("Invalid time value: {}".format(schedule_time))
                         return self._get_error_page(
                             "Invalid Time",
-                            "Schedule {}: Invalid time value {}".format(i+1, schedule_time),
-                            sensors, ac_monitor, heater_monitor
+                            "Schedule {}: Invalid time value {}".format(n, schedule_time),
+                            sensor_hub, ac_monitor, heater_monitor
                         )
                     
                     # URL decode the name
-                    schedule_name = params.get(name_key, 'Schedule {}'.format(i+1)).replace('+', ' ')
+                    schedule_name = params.get(name_key, 'Schedule {}'.format(n)).replace('+', ' ')
                     
                     # Parse temperatures (they're guaranteed to exist due to validation above)
                     try:
@@ -445,19 +473,19 @@ class TempWebServer:
                     except (ValueError, TypeError):
                         return self._get_error_page(
                             "Invalid Temperature",
-                            "Schedule {}: Temperature values must be numbers".format(i+1),
-                            sensors, ac_monitor, heater_monitor
+                            "Schedule {}: Temperature values must be numbers".format(n),
+                            sensor_hub, ac_monitor, heater_monitor
                         )
                     # Sync using direction of change (no dependency on last_changed)
                     prev_h = None
                     prev_a = None
-                    if i < len(prev_schedules):
+                    if i < replace and offset + i < len(prev_schedules):
                         try:
-                            prev_h = float(prev_schedules[i].get('heater_target', heater_target))
+                            prev_h = float(prev_schedules[offset + i].get('heater_target', heater_target))
                         except:
                             prev_h = None
                         try:
-                            prev_a = float(prev_schedules[i].get('ac_target', ac_target))
+                            prev_a = float(prev_schedules[offset + i].get('ac_target', ac_target))
                         except:
                             prev_a = None
                     delta_h = (heater_target - prev_h) if prev_h is not None else None
@@ -483,16 +511,33 @@ class TempWebServer:
                         'ac_target': ac_target,
                         'heater_target': heater_target
                     }
+                    
+                    # ===== Optional weekdays and date range =====
+                    days = [day for day in DAY_NAMES if params.get('schedule_{}_day_{}'.format(i, day))]
+                    if not days:
+                        return self._get_error_page(
+                            "Invalid Schedule",
+                            "Schedule {}: Pick at least one day".format(n),
+                            sensor_hub, ac_monitor, heater_monitor
+                        )
+                    if len(days) < 7:
+                        schedule['days'] = days
+                    date_from = params.get('schedule_{}_from'.format(i), '').strip()
+                    date_until = params.get('schedule_{}_until'.format(i), '').strip()
+                    if date_from or date_until:
+                        start = parse_date(date_from)
+                        end = parse_date(date_until or date_from)
+                        if start is None or end is None or start[0] != end[0] or (start[0] and end[1] < start[1]):
+                            return self._get_error_page(
+                                "Invalid Date Range",
+                                "Schedule {}: Use MM-DD (every year) or YYYY-MM-DD (once) for both dates, from before until".format(n),
+                                sensor_hub, ac_monitor, heater_monitor
+                            )
+                        schedule['from'] = date_from
+                        if date_until and date_until != date_from:
+                            schedule['until'] = date_until
                     schedules.append(schedule)
             
-            # Only update schedules if user submitted schedule form data
-            if has_any_schedule_data:
-                config['schedules'] = schedules
-                print("Updating schedules: {} schedules configured".format(len(schedules)))
-            else:
-                # No schedule data in form - preserve existing schedules
-                print("No schedule data in request - preserving existing schedules")
-            
             # ===== START: Validate all schedules =====
             for i, schedule in enumerate(schedules):
                 heater_temp = schedule.get('heater_target', 80.0)
@@ -500,57 +545,50 @@ class TempWebServer:
                 
                 if heater_temp > ac_temp:
                     print("❌ Schedule validation failed: Schedule {} has heater ({}) > AC ({})".format(
-                        i+1, heater_temp, ac_temp
+                        offset+i+1, heater_temp, ac_temp
                     ))
                     return self._get_error_page(
                         "Invalid Schedule",
                         "Schedule {} ({}): Heater target ({:.1f}°F) cannot be greater than AC target ({:.1f}°F)".format(
-                            i+1, schedule.get('name', 'Unnamed'), heater_temp, ac_temp
+                            offset+i+1, schedule.get('name', 'Unnamed'), heater_temp, ac_temp
                         ),
-                        sensors, ac_monitor, heater_monitor
+                        sensor_hub, ac_monitor, heater_monitor
                     )
             # ===== END: Validate all schedules =====
             
-            # Save to file
-            if self._save_config_to_file(config):
-                print("Schedule configuration saved")
-                
-                # ===== ADD THIS: Reload config into memory immediately =====
-                try:
-                    with open('config.json', 'r') as f:
-                        updated_config = json.load(f)
-                        # Update the passed-in config dict (updates reference, not copy)
-                        config.clear()
-                        config.update(updated_config)
-                    print("✅ Config reloaded into memory")
-                except Exception as e:
-                    print("⚠️ Warning: Could not reload config: {}".format(e))
-                # ===== END: Reload config =====
+            # Only update schedules if user submitted schedule form data (validated, so the live config never holds a bad set)
+            if has_any_schedule_data:
+                schedules = prev_schedules[:offset] + schedules + prev_schedules[offset + replace:]
+                config['schedules'] = schedules  # Subscribers (ScheduleMonitor) recompile now
+                print("Updating schedules: {} schedules configured".format(len(schedules)))
+            else:
+                # No schedule data in form - preserve existing schedules
+                print("No schedule data in request - preserving existing schedules")
+            
+            print("Schedule configuration updated")
                 
-                if schedule_monitor:
-                    schedule_monitor.reload_config(config)
+            if schedule_monitor:
+                schedule_monitor.reload_config(config)
                     
-                # Update AC and heater monitors with new targets from config
-                if ac_monitor:
-                    ac_monitor.target_temp = config['ac_target']
-                    ac_monitor.temp_swing = config['ac_swing']
-                if heater_monitor:
-                    heater_monitor.target_temp = config['heater_target']
-                    heater_monitor.temp_swing = config['heater_swing']
-            del params, prev_schedules, prev
-            gc.collect()
+            # Update AC and heater monitors with new targets from config
+            if ac_monitor:
+                ac_monitor.target_temp = config['ac_target']
+                ac_monitor.temp_swing = config['ac_swing']
+            if heater_monitor:
+                heater_monitor.target_temp = config['heater_target']
+                heater_monitor.temp_swing = config['heater_swing']
+            del params, prev_schedules
             # Send Discord notification
             try:
                 mode = "automatic" if config.get('schedule_enabled') else "hold"
                 message = "📅 Schedules updated ({} mode) - {} schedules configured".format(
                     mode, len(schedules)
                 )
-                discord_webhook.send_discord_message(message)
+                discord_webhook.queue_discord_message(message)
             except:
                 pass
             # ===== END: Handle schedule configuration save =====
             del schedules
-            gc.collect()
             # Redirect back to homepage with cache-busting headers
             redirect_response = 'HTTP/1.1 303 See Other\r\n'
             redirect_response += 'Location: /\r\n'
@@ -561,7 +599,6 @@ class TempWebServer:
             redirect_response += 'Expires: 0\r\n'
             redirect_response += '\r\n'
             print("DEBUG: Returning redirect to dashboard (with cache-busting)")
-            gc.collect()
             return redirect_response
             
         except Exception as e:
@@ -576,7 +613,7 @@ class TempWebServer:
             redirect_response += '\r\n'
             return redirect_response
 
-    def _handle_update(self, request, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+    def _handle_update(self, request, sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config):
         """Handle form submission and update settings."""
         try:
             body = request.split('\r\n\r\n')[1] if '\r\n\r\n' in request else ''
@@ -654,23 +691,6 @@ class TempWebServer:
             if schedule_monitor:
                 schedule_monitor.reload_config(config)
             # ===== END: Enter hold mode =====
-
-            
-            # ===== START: Save settings to file =====
-            if self._save_config_to_file(config):
-                print("Settings persisted to disk")
-                
-                # ===== RELOAD config into memory immediately =====
-                try:
-                    with open('config.json', 'r') as f:
-                        updated_config = json.load(f)
-                        config.clear()
-                        config.update(updated_config)
-                    print("✅ Config reloaded into memory")
-                except Exception as e:
-                    print("⚠️ Warning: Could not reload config: {}".format(e))
-                # ===== END: Reload config =====
-            # ===== END: Save settings to file =====
             
             # ===== START: Send Discord notification =====
             try:
@@ -684,7 +704,7 @@ class TempWebServer:
                     params.get('heater_target', 'N/A'),
                     duration
                 )
-                discord_webhook.send_discord_message(message)
+                discord_webhook.queue_discord_message(message)
             except Exception as discord_error:
                 print("Discord notification failed: {}".format(discord_error))
             # ===== END: Send Discord notification =====
@@ -694,39 +714,31 @@ class TempWebServer:
             import sys
             sys.print_exception(e)
         
-        return self._get_status_page(sensors, ac_monitor, heater_monitor, schedule_monitor, show_success=True)
+        return self._get_status_page(sensor_hub, ac_monitor, heater_monitor, schedule_monitor, show_success=True)
 
-    def _get_status_page(self, sensors, ac_monitor, heater_monitor, schedule_monitor=None, show_success=False):
+    def _get_status_page(self, sensor_hub, ac_monitor, heater_monitor, schedule_monitor=None, show_success=False):
         """Generate HTML status page."""
         print("DEBUG: Generating status page...")
         
-        # ===== FORCE GARBAGE COLLECTION BEFORE BIG ALLOCATION =====
-        import gc # type: ignore
-        gc.collect()
+        # ===== COLLECT BEFORE BIG ALLOCATION (skipped if nothing to reclaim) =====
+        gc_policy.prepare(PAGE_RENDER_BYTES)
         try:
+            import gc # type: ignore
             mf = gc.mem_free()  # type: ignore
-            print("DEBUG: Memory freed, {} bytes available".format(mf))
+            print("DEBUG: {} bytes available".format(mf))
         except Exception:
-            print("DEBUG: Memory collected")
+            pass
         # ===== END GARBAGE COLLECTION =====
         
         try:
-            # Get current temperatures (use cached values to avoid blocking)
-            inside_temp = getattr(sensors.get('inside'), 'last_temp', None)
-            outside_temp = getattr(sensors.get('outside'), 'last_temp', None)
-            
-            # Fallback to sensor read if no cached value (first load only)
-            if inside_temp is None:
-                inside_temps = sensors['inside'].read_all_temps(unit='F')
-                inside_temp = list(inside_temps.values())[0] if inside_temps else "N/A"
-            
-            if outside_temp is None:
-                outside_temps = sensors['outside'].read_all_temps(unit='F')
-                outside_temp = list(outside_temps.values())[0] if outside_temps else "N/A"
+            # Get current temperatures (hub cache, never touches the bus)
+            inside_temp_str = self._temp_str(sensor_hub, 'inside')
+            outside_temp_str = self._temp_str(sensor_hub, 'outside')
+            probe_card = self._probe_card(sensor_hub)
             
             # Get AC/Heater status
-            ac_status = "ON" if ac_monitor and ac_monitor.ac.get_state() else "OFF"
-            heater_status = "ON" if heater_monitor and heater_monitor.heater.get_state() else "OFF"
+            ac_status = "ON" if ac_monitor and ac_monitor.relay.get_state() else "OFF"
+            heater_status = "ON" if heater_monitor and heater_monitor.relay.get_state() else "OFF"
             
             # Get current time
             current_time = time.localtime()
@@ -736,7 +748,7 @@ class TempWebServer:
             )
             
             # Load config
-            config = self._load_config()
+            config = self.config
             
             # ===== START: Determine schedule status display =====
             has_schedules = len([s for s in config.get('schedules', []) if s.get('time')]) > 0
@@ -763,7 +775,7 @@ class TempWebServer:
             schedule_cards = ""
             
             # Build mode buttons for dashboard
-            mode_buttons = self._build_mode_buttons(config)
+            mode_buttons = self._build_mode_buttons(config, schedule_monitor)
             if config.get('schedules'):
                 for schedule in config.get('schedules', []):
                     # ===== START: Decode URL-encoded values =====
@@ -780,10 +792,12 @@ class TempWebServer:
                         <div style="color: #7f8c8d; font-size: 14px;">
                             Heat: {heater_temp}°F | AC: {ac_temp}°F
                         </div>
+                        <div style="color: #95a5a6; font-size: 12px;">{when}</div>
                     </div>
                     """.format(
                         time=time_value,      # Use decoded value
                         name=name_value,      # Use decoded value
+                        when=describe(schedule) or "Every day",
                         ac_temp=schedule.get('ac_target', 'N/A'),
                         heater_temp=schedule.get('heater_target', 'N/A')
                     )
@@ -801,10 +815,6 @@ class TempWebServer:
             </div>
             """ if show_success else ""
             
-            # Format temperature values
-            inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-            outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
-            
           # ===== START: Add HOLD mode banner with countdown timer =====
             hold_banner = ""
             
@@ -862,6 +872,7 @@ class TempWebServer:
                 </div>
                 """.format(remaining=temp_hold_remaining)
             # ===== END: Add HOLD mode banner with countdown timer =====
+            gc_stats = gc_policy.stats()
             # Final HTML assembly
             html = """
 <!DOCTYPE html>
@@ -1078,14 +1089,17 @@ class TempWebServer:
             <div class="temp-icon">🏠</div>
             <div class="label">Indoor Climate</div>
             <div class="temp-display inside">{inside_temp}<span class="degree">°F</span></div>
+            <div class="targets">Raw {inside_raw}°F · Filtered {inside_temp}°F</div>
         </div>
         
         <div class="card temp-card">
             <div class="temp-icon">🌤️</div>
             <div class="label">Outdoor Climate</div>
             <div class="temp-display outside">{outside_temp}<span class="degree">°F</span></div>
+            <div class="targets">Raw {outside_raw}°F · Filtered {outside_temp}°F</div>
         </div>
     </div>
+    {probe_card}
     
     <div class="card full-width">
         <div class="status">
@@ -1095,6 +1109,7 @@ class TempWebServer:
                 <div class="label">Heating System</div>
                 <div class="status-indicator {heater_class}">{heater_status}</div>
                 <div class="targets">Target: {heater_target}°F ± {heater_swing}°F</div>
+                <div class="targets"><small>{heater_stats}</small></div>
             </div>
             <!-- ===== AC SECOND (RIGHT) ===== -->
             <div class="status-item">
@@ -1102,6 +1117,7 @@ class TempWebServer:
                 <div class="label">Air Conditioning</div>
                 <div class="status-indicator {ac_class}">{ac_status}</div>
                 <div class="targets">Target: {ac_target}°F ± {ac_swing}°F</div>
+                <div class="targets"><small>{ac_stats}</small></div>
             </div>
         </div>
         
@@ -1161,7 +1177,9 @@ class TempWebServer:
     
     <div class="footer">
         ⏰ Last updated: {time}<br>
-        🔄 Auto-refresh every 30 seconds
+        🔄 Auto-refresh every 30 seconds<br>
+        🧹 GC: {gc_count} collections, {gc_total_ms} ms total, worst {gc_worst_ms} ms
+        + {gc_auto} automatic (pause not measured)
     </div>
 <script>
 document.addEventListener('DOMContentLoaded', function() {{
@@ -1192,6 +1210,9 @@ document.addEventListener('DOMContentLoaded', function() {{
                 success_message=success_html,
                 inside_temp=inside_temp_str,
                 outside_temp=outside_temp_str,
+                probe_card=probe_card,
+                inside_raw=self._raw_str(sensor_hub, 'inside'),
+                outside_raw=self._raw_str(sensor_hub, 'outside'),
                 ac_status=ac_status,
                 ac_class="on" if ac_status == "ON" else "off",
                 heater_status=heater_status,
@@ -1200,12 +1221,18 @@ document.addEventListener('DOMContentLoaded', function() {{
                 ac_swing=ac_monitor.temp_swing if ac_monitor else "N/A",
                 heater_target=heater_monitor.target_temp if heater_monitor else "N/A",
                 heater_swing=heater_monitor.temp_swing if heater_monitor else "N/A",
+                ac_stats=self._relay_stats_str(ac_monitor),
+                heater_stats=self._relay_stats_str(heater_monitor),
                 time=time_str,
                 schedule_status=schedule_status,
                 schedule_color=schedule_color,
                 schedule_icon=schedule_icon,
                 schedule_cards=schedule_cards,
-                mode_buttons=mode_buttons
+                mode_buttons=mode_buttons,
+                gc_count=gc_stats['count'],
+                gc_total_ms=gc_stats['total_us'] // 1000,
+                gc_worst_ms=gc_stats['worst_us'] // 1000,
+                gc_auto=gc_stats['auto']
             )
             self.last_page_render = time.time()  # Track successful render
             return html
@@ -1216,15 +1243,11 @@ document.addEventListener('DOMContentLoaded', function() {{
             sys.print_exception(e)
             return "<html><body><h1>Error loading page</h1><pre>{}</pre></body></html>".format(str(e))
 
-    def _get_error_page(self, error_title, error_message, sensors, ac_monitor, heater_monitor):
+    def _get_error_page(self, error_title, error_message, sensor_hub, ac_monitor, heater_monitor):
         """Generate error page with message."""
         # Get current temps (cached, fast - no blocking sensor reads)
-        inside_temp = getattr(sensors.get('inside'), 'last_temp', None) or "N/A"
-        outside_temp = getattr(sensors.get('outside'), 'last_temp', None) or "N/A"
-        
-        # Format temperature values
-        inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-        outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
+        inside_temp_str = self._temp_str(sensor_hub, 'inside')
+        outside_temp_str = self._temp_str(sensor_hub, 'outside')
         
         # Get current statuses
         ac_status = "ON" if ac_monitor and ac_monitor.ac.get_state() else "OFF"
@@ -1342,61 +1365,47 @@ document.addEventListener('DOMContentLoaded', function() {{
         
         return html
 
-    def _get_schedule_editor_page(self, sensors, ac_monitor, heater_monitor):
-        """Generate schedule editor page (no auto-refresh, schedules only)."""
-        # Get current temps (read if not cached)
-        import gc  # type: ignore
-        gc.collect()
-        inside_temp = getattr(sensors.get('inside'), 'last_temp', None)
-        if inside_temp is None:
-            inside_temps = sensors['inside'].read_all_temps(unit='F')
-            inside_temp = list(inside_temps.values())[0] if inside_temps else "N/A"
-        
-        outside_temp = getattr(sensors.get('outside'), 'last_temp', None)
-        if outside_temp is None:
-            outside_temps = sensors['outside'].read_all_temps(unit='F')
-            outside_temp = list(outside_temps.values())[0] if outside_temps else "N/A"
-        
-        # Format temperature values
-        inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-        outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
+    def _get_schedule_editor_page(self, sensor_hub, ac_monitor, heater_monitor, page=0):
+        """Generate one page of the schedule editor (SCHEDULE_PAGE_ROWS schedules; no auto-refresh)."""
+        # Get current temps (hub cache, never touches the bus)
+        gc_policy.prepare(PAGE_RENDER_BYTES)
+        inside_temp_str = self._temp_str(sensor_hub, 'inside')
+        outside_temp_str = self._temp_str(sensor_hub, 'outside')
         
         # Load config
-        config = self._load_config()
-        schedules = config.get('schedules', [])
+        config = self.config
+        all_schedules = config.get('schedules', [])
+        pages = len(all_schedules) // SCHEDULE_PAGE_ROWS + 1   # The last page always has room for the blank row
+        page = min(max(page, 0), pages - 1)
+        offset = page * SCHEDULE_PAGE_ROWS
+        schedules = all_schedules[offset:offset + SCHEDULE_PAGE_ROWS]
+        replace = len(schedules)
         
-        # Pad with empty schedules up to 4
-        while len(schedules) < 4:
+        # This page's schedules, plus one blank row to add another on the last page
+        if page == pages - 1:
             schedules.append({
                 'time': '',
                 'name': '',
                 'ac_target': config.get('ac_target', 75.0),      # default if not set
                 'heater_target': config.get('heater_target', 72.0)  # default if not set
             })
+        print("DEBUG: Schedule editor will render {} schedules (page {}/{})".format(len(schedules), page + 1, pages))
 
-        # ===== DEBUG: Verify we have 4 schedules =====
-        print("DEBUG: Schedule editor will render {} schedules:".format(len(schedules[:4])))
-        for i, s in enumerate(schedules[:4]):
-            print("  Schedule {}: time='{}', name='{}', heater={}, ac={}".format(
-                i, s.get('time', '(empty)'), s.get('name', '(empty)'),
-                s.get('heater_target', 'N/A'), s.get('ac_target', 'N/A')
-            ))
-        # ===== END DEBUG =====
-
-        # Build schedule inputs
-        schedule_inputs = ""
-        for i, schedule in enumerate(schedules[:4]):
+        # Build schedule inputs (the form posts back this page only: rows offset .. offset + replace)
+        parts = ['<input type="hidden" name="schedule_count" value="' + str(len(schedules)) + '">\n',
+                 '<input type="hidden" name="schedule_offset" value="' + str(offset) + '">\n',
+                 '<input type="hidden" name="schedule_replace" value="' + str(replace) + '">\n']
+        for i, schedule in enumerate(schedules):
+            schedule_inputs = ''
             time_value = schedule.get('time', '')
             name_value = schedule.get('name', '')
             heater_value = schedule.get('heater_target', config.get('heater_target'))
             ac_value = schedule.get('ac_target', config.get('ac_target'))
-            
-            print("DEBUG:   Values: time='{}', name='{}', heater={}, ac={}".format(
-                time_value, name_value, heater_value, ac_value))
+            mask = parse_days(schedule.get('days'))
             
             # Build HTML - MINIMAL VERSION with hidden markers
             schedule_inputs += '<div class="sched">\n'
-            schedule_inputs += '<h3>Schedule ' + str(i+1) + '</h3>\n'
+            schedule_inputs += '<h3>Schedule ' + str(offset+i+1) + ('' if time_value else ' (new)') + '</h3>\n'
             
             # Hidden input to mark this schedule exists (always sent)
             schedule_inputs += '<input type="hidden" name="schedule_' + str(i) + '_exists" value="1">\n'
@@ -1406,14 +1415,35 @@ document.addEventListener('DOMContentLoaded', function() {{
             schedule_inputs += '<label>Time</label>\n'
             schedule_inputs += '<input type="time" name="schedule_' + str(i) + '_time" value="' + str(time_value) + '">\n'
             schedule_inputs += '<label>Name</label>\n'
-            schedule_inputs += '<input type="text" name="schedule_' + str(i) + '_name" value="' + str(name_value) + '" placeholder="Schedule ' + str(i+1) + '">\n'
+            schedule_inputs += '<input type="text" name="schedule_' + str(i) + '_name" value="' + str(name_value) + '" placeholder="Schedule ' + str(offset+i+1) + '">\n'
             schedule_inputs += '<label>Heater (°F)</label>\n'
             # Add required attribute to force validation
             schedule_inputs += "<input type=\"number\" name=\"schedule_" + str(i) + "_heater\" value=\"" + str(heater_value) + "\" step=\"0.5\" min=\"60\" max=\"85\" required oninput=\"schedSync(" + str(i) + ", 'heater')\" onchange=\"schedSync(" + str(i) + ", 'heater')\">\n"
             schedule_inputs += '<label>AC (°F)</label>\n'
             # Add required attribute to force validation
             schedule_inputs += "<input type=\"number\" name=\"schedule_" + str(i) + "_ac\" value=\"" + str(ac_value) + "\" step=\"0.5\" min=\"60\" max=\"90\" required oninput=\"schedSync(" + str(i) + ", 'ac')\" onchange=\"schedSync(" + str(i) + ", 'ac')\">\n"
+            schedule_inputs += '<label>Days</label>\n<div class="days">'
+            for n, day in enumerate(DAY_NAMES):
+                schedule_inputs += '<label><input type="checkbox" name="schedule_' + str(i) + '_day_' + day + '" value="1"' + (' checked' if mask & (1 << n) else '') + '>' + day.capitalize() + '</label>'
             schedule_inputs += '</div>\n'
+            schedule_inputs += '<label>Only from / until (optional: MM-DD every year, or YYYY-MM-DD once)</label>\n'
+            schedule_inputs += '<input type="text" name="schedule_' + str(i) + '_from" value="' + schedule.get('from', '') + '" placeholder="from, e.g. 06-01 or 2026-12-20">\n'
+            schedule_inputs += '<input type="text" name="schedule_' + str(i) + '_until" value="' + schedule.get('until', '') + '" placeholder="until (blank = same day)">\n'
+            schedule_inputs += '</div>\n'
+            parts.append(schedule_inputs)
+        schedule_inputs = ''.join(parts)
+        del parts
+
+        # Page links (unsaved edits on this page are lost when leaving it)
+        pager = ''
+        if pages > 1:
+            pager = '<div class="pager">'
+            if page > 0:
+                pager += '<a href="/schedule?page={}">◀ Previous</a>'.format(page - 1)
+            pager += '<span>Page {} of {} ({} schedules)</span>'.format(page + 1, pages, len(all_schedules))
+            if page < pages - 1:
+                pager += '<a href="/schedule?page={}">Next ▶</a>'.format(page + 1)
+            pager += '</div>'
         
         html = """
     <!DOCTYPE html>
@@ -1447,6 +1477,15 @@ document.addEventListener('DOMContentLoaded', function() {{
                 border-radius: 4px;
                 margin-bottom: 10px;
             }}
+            .sched .days label {{
+                display: inline-block;
+                margin: 0 10px 10px 0;
+                font-weight: normal;
+            }}
+            .sched .days input {{
+                width: auto;
+                margin: 0 4px 0 0;
+            }}
             body {{
                 font-family: Arial, sans-serif;
                 max-width: 1000px;
@@ -1488,6 +1527,12 @@ document.addEventListener('DOMContentLoaded', function() {{
                 display: inline-block;
             }}
             .btn:hover {{ transform: translateY(-2px); }}
+            .pager {{
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                margin-bottom: 15px;
+            }}
         </style>
         
     </head>
@@ -1503,10 +1548,14 @@ document.addEventListener('DOMContentLoaded', function() {{
             <form method="POST" action="/schedule">
                 <h3 style="color: #34495e; margin-bottom: 15px;">⏰ Configure Schedule Times & Temperatures</h3>
                 <p style="color: #7f8c8d; margin-bottom: 20px;">
-                    Set up to 4 time-based schedules. Leave time blank to disable a schedule.
+                    Fill in the blank schedule at the end to add one; clear a time to delete it. Days and dates are optional:
+                    on a date inside a from/until range only the schedules for that range apply (one-off dates before yearly ones).
+                    Saving saves this page; save before moving to another one.
                 </p>
                 
+                {pager}
                 {schedule_inputs}
+                {pager}
                 
                 <div style="margin-top: 20px;">
                     <button type="submit" name="mode_action" value="save_schedules" class="btn" style="width: 100%;">
@@ -1532,17 +1581,24 @@ document.addEventListener('DOMContentLoaded', function() {{
         """.format(
             inside_temp=inside_temp_str,
             outside_temp=outside_temp_str,
-            schedule_inputs=schedule_inputs
+            schedule_inputs=schedule_inputs,
+            pager=pager
         )
         
         return html
 
-    def _build_mode_buttons(self, config):
+    def _build_mode_buttons(self, config, schedule_monitor=None):
         """Build mode control buttons for dashboard only."""
-        schedules = config.get('schedules', [])
-        has_schedules = len([s for s in schedules if s.get('time')]) > 0
+        # The monitor's compiled index is current (it subscribes to 'schedules')
+        if schedule_monitor:
+            index = schedule_monitor.index
+        else:
+            version, index = self._index
+            if version != config.version:
+                index = ScheduleIndex(config.get('schedules'))
+                self._index = (config.version, index)
         
-        if not has_schedules:
+        if not len(index):
             return """
             <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; text-align: center; color: #7f8c8d; margin: 20px 0;">
                 ℹ️ No schedules configured - <a href="/schedule" style="color: #667eea; font-weight: bold;">Configure schedules</a>
@@ -1551,34 +1607,19 @@ document.addEventListener('DOMContentLoaded', function() {{
         
         # Build mode buttons based on current state
         if config.get('schedule_enabled'):
-            # ===== NEW: Find active schedule =====
-            active_schedule_name = "None"
-            current_time = time.localtime()
-            current_minutes = current_time[3] * 60 + current_time[4]
-            
-            # Sort schedules by time and find the active one
-            sorted_schedules = []
-            for schedule in schedules:
-                if schedule.get('time'):
-                    try:
-                        time_parts = schedule['time'].split(':')
-                        schedule_minutes = int(time_parts[0]) * 60 + int(time_parts[1])
-                        sorted_schedules.append((schedule_minutes, schedule))
-                    except:
-                        pass
-            
-            sorted_schedules.sort()
-            
-            # Find most recent schedule that has passed
-            for schedule_minutes, schedule in sorted_schedules:
-                if current_minutes >= schedule_minutes:
-                    active_schedule_name = schedule.get('name', 'Unnamed')
-                else:
-                    break
-            
-            # If no schedule found (before first one), use last from yesterday
-            if active_schedule_name == "None" and sorted_schedules:
-                active_schedule_name = sorted_schedules[-1][1].get('name', 'Unnamed')
+            # ===== Find active schedule (binary search in the compiled index) =====
+            now = time.time()
+            active_schedule = index.active(now)
+            active_schedule_name = active_schedule.get('name', 'Unnamed') if active_schedule else "None"
+            minutes, next_schedule = index.next_change(now)
+            if next_schedule is None:
+                next_change = "none this week"
+            else:
+                at = time.localtime(now + minutes * 60)
+                next_change = "{} at {}{:02d}:{:02d}".format(
+                    next_schedule.get('name', 'Unnamed'),
+                    "" if at[2] == time.localtime(now)[2] else DAY_NAMES[at[6]].capitalize() + " ",
+                    at[3], at[4])
             # ===== END: Find active schedule =====
             
             return """
@@ -1586,10 +1627,11 @@ document.addEventListener('DOMContentLoaded', function() {{
                 <div style="background: linear-gradient(135deg, #2ecc71, #27ae60); color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
                     <div style="font-weight: bold; font-size: 18px; margin-bottom: 5px;">✅ Automatic Mode</div>
                     <div style="font-size: 14px; opacity: 0.9; margin-bottom: 10px;">Currently running: <strong>{active_schedule}</strong></div>
-                    <div style="font-size: 13px; opacity: 0.8;">Temperatures adjust based on schedule</div>
+                    <div style="font-size: 13px; opacity: 0.8;">{ramp_status} - next: {next_change}</div>
                 </div>
             </form>
-            """.format(active_schedule=active_schedule_name)
+            """.format(active_schedule=active_schedule_name, next_change=next_change,
+                       ramp_status=(schedule_monitor.status() if schedule_monitor else None) or "Temperatures adjust based on schedule")
         elif config.get('permanent_hold', False):
             return """
             <form method="POST" action="/schedule" style="margin: 20px 0;">
@@ -1615,24 +1657,13 @@ document.addEventListener('DOMContentLoaded', function() {{
             </form>
             """
     
-    def _get_settings_page(self, sensors, ac_monitor, heater_monitor):
+    def _get_settings_page(self, sensor_hub, ac_monitor, heater_monitor):
         """Generate advanced settings page."""
-        config = self._load_config()
-        import gc  # type: ignore
-        gc.collect()
-        # Get temperatures (read if not cached)
-        inside_temp = getattr(sensors.get('inside'), 'last_temp', None)
-        if inside_temp is None:
-            inside_temps = sensors['inside'].read_all_temps(unit='F')
-            inside_temp = list(inside_temps.values())[0] if inside_temps else "N/A"
-        
-        outside_temp = getattr(sensors.get('outside'), 'last_temp', None)
-        if outside_temp is None:
-            outside_temps = sensors['outside'].read_all_temps(unit='F')
-            outside_temp = list(outside_temps.values())[0] if outside_temps else "N/A"
-        
-        inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-        outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
+        config = self.config
+        gc_policy.prepare(PAGE_RENDER_BYTES)
+        # Get temperatures (hub cache, never touches the bus)
+        inside_temp_str = self._temp_str(sensor_hub, 'inside')
+        outside_temp_str = self._temp_str(sensor_hub, 'outside')
         
         html = """
 <!DOCTYPE html>
@@ -1686,7 +1717,7 @@ document.addEventListener('DOMContentLoaded', function() {{
             font-weight: bold;
             color: #555;
         }}
-        input[type="number"] {{
+        input[type="number"], select {{
             width: 100%;
             padding: 10px;
             border: 2px solid #ddd;
@@ -1747,6 +1778,27 @@ document.addEventListener('DOMContentLoaded', function() {{
                 </small>
             </div>
             
+            <div class="setting-group">
+                <h3>🎛️ Heater PID</h3>
+                <label>Heater Control Mode</label>
+                <select name="heater_pid">
+                    <option value="0"{pid_off}>Swing band (on/off at target ± swing)</option>
+                    <option value="1"{pid_on}>PID (time-proportioned)</option>
+                </select>
+                <label>Proportional Gain (% per °F)</label>
+                <input type="number" name="heater_kp" value="{heater_kp}" step="0.1" min="0" max="1000" required>
+                <label>Integral Gain (% per °F per minute)</label>
+                <input type="number" name="heater_ki" value="{heater_ki}" step="0.01" min="0" max="100" required>
+                <label>Derivative Gain (% per °F/minute)</label>
+                <input type="number" name="heater_kd" value="{heater_kd}" step="0.1" min="0" max="1000" required>
+                <label>Cycle Window (seconds)</label>
+                <input type="number" name="heater_pid_window" value="{heater_pid_window}" step="30" min="60" max="3600" required>
+                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
+                    PID runs the heater for a share of each window (current duty: {heater_duty}).
+                    The heater's minimum run/off times still apply.
+                </small>
+            </div>
+            
             <div class="setting-group">
                 <h3>❄️ Air Conditioning</h3>
                 <label>AC Swing (±°F)</label>
@@ -1756,6 +1808,21 @@ document.addEventListener('DOMContentLoaded', function() {{
                 </small>
             </div>
             
+            <div class="setting-group">
+                <h3>📈 Schedule Transitions</h3>
+                <label>Target Changes</label>
+                <select name="schedule_ramp">
+                    <option value="0"{ramp_off}>Step (jump at the schedule time)</option>
+                    <option value="1"{ramp_linear}>Ramp (slide to the next schedule's targets)</option>
+                    <option value="2"{ramp_arrive}>Arrive by (start warming up early)</option>
+                </select>
+                <label>Ramp Window / Longest Early Start (minutes)</label>
+                <input type="number" name="schedule_ramp_minutes" value="{ramp_minutes}" step="5" min="5" max="360" required>
+                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
+                    Arrive by uses the learned warm-up rate ({warmup_rate}°F/h) to reach the next heater target on time.
+                </small>
+            </div>
+            
             <div class="setting-group">
                 <h3>⏱️ Hold Duration</h3>
                 <label>Temporary Hold Duration (minutes)</label>
@@ -1774,6 +1841,15 @@ document.addEventListener('DOMContentLoaded', function() {{
                 </small>
             </div>
             
+            <div class="setting-group">
+                <h3>🌡️ Probe Resolution</h3>
+                {resolution_rows}
+                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
+                    Each bit less halves the conversion wait but doubles the temperature step.
+                    A bus waits for its slowest probe, so keep control probes at 12-bit and drop alert-only probes to 9-10 bit.
+                </small>
+            </div>
+            
             <button type="submit" class="btn">💾 Save Settings</button>
         </form>
         
@@ -1787,15 +1863,63 @@ document.addEventListener('DOMContentLoaded', function() {{
             heater_swing=config.get('heater_swing', 2.0),
             ac_swing=config.get('ac_swing', 1.0),
             temp_hold_mins=int(config.get('temp_hold_duration', 3600) / 60),
-            timezone_offset=config.get('timezone_offset', -6)
+            timezone_offset=config.get('timezone_offset', -6),
+            resolution_rows=self._resolution_rows(sensor_hub),
+            pid_off='' if config.get('heater_pid') else ' selected',
+            pid_on=' selected' if config.get('heater_pid') else '',
+            heater_kp=config.get('heater_kp', 30.0),
+            heater_ki=config.get('heater_ki', 1.0),
+            heater_kd=config.get('heater_kd', 0.0),
+            heater_pid_window=config.get('heater_pid_window', 600),
+            heater_duty=self._duty_str(heater_monitor),
+            ramp_off=' selected' if config.get('schedule_ramp', 'off') not in RAMP_MODES[1:] else '',
+            ramp_linear=' selected' if config.get('schedule_ramp') == RAMP_MODES[1] else '',
+            ramp_arrive=' selected' if config.get('schedule_ramp') == RAMP_MODES[2] else '',
+            ramp_minutes=config.get('schedule_ramp_minutes', 60),
+            warmup_rate=config.get('warmup_rate', DEFAULT_WARMUP_RATE)
         )
         
         return html
 
-    def _handle_settings_update(self, request, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+    def _relay_stats_str(self, setpoint):
+        """One-line run-time / cycle summary for the relay behind `setpoint`."""
+        stats = getattr(setpoint.relay, 'stats', None) if setpoint else None
+        if stats is None:
+            return ""
+        return "Run {} h · {} cycles · {}/h last hour · blocked {} on / {} off".format(
+            centi_str(stats.total_on_ms() // 36000), stats.cycles, stats.cycles_last_hour(),
+            stats.blocked_on, stats.blocked_off
+        )
+
+    def _duty_str(self, heater_monitor):
+        """Current PID heater duty as "NN.N%" ("off" when heating uses the swing band)."""
+        pid = heater_monitor.controller.pid if heater_monitor else None
+        if pid is None:
+            return "off"
+        return "{}%".format(centi_str(pid.duty))
+
+    def _resolution_rows(self, sensor_hub):
+        """One resolution <select> per probe, each option showing step size vs. conversion time."""
+        from scripts.temperature_sensor import RESOLUTION_MS, RESOLUTION_STEP_C
+        if not sensor_hub:
+            return ''
+        rows = []
+        for key in sensor_hub.keys:
+            bits, bus_ms = sensor_hub.resolution(key)
+            if bits is None:
+                continue
+            options = ''.join(
+                '<option value="{0}"{1}>{0}-bit: {2:.3f}°F steps, {3} ms</option>'.format(
+                    b, ' selected' if b == bits else '', RESOLUTION_STEP_C[b] * 9 / 5, RESOLUTION_MS[b]
+                ) for b in (9, 10, 11, 12)
+            )
+            rows.append('<label>{} <small>(bus waits {} ms)</small></label><select name="res_{}">{}</select>'.format(
+                sensor_hub.labels.get(key, key), bus_ms, key, options
+            ))
+        return ''.join(rows)
+
+    def _handle_settings_update(self, request, sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config):
         """Handle advanced settings update."""
-        import gc  # type: ignore
-        gc.collect()
         try:
             body = request.split('\r\n\r\n')[1] if '\r\n\r\n' in request else ''
             params = {}
@@ -1818,12 +1942,35 @@ document.addEventListener('DOMContentLoaded', function() {{
                     heater_monitor.temp_swing = params['heater_swing']
                 print("Heater swing updated to {}°F".format(params['heater_swing']))
             
+            # Update heater PID mode and gains
+            if 'heater_pid' in params:
+                config['heater_pid'] = params['heater_pid'] >= 1
+                for name in ('heater_kp', 'heater_ki', 'heater_kd', 'heater_pid_window'):
+                    if name in params:
+                        config[name] = params[name]
+                if heater_monitor:
+                    heater_monitor.controller.configure_pid(
+                        config['heater_pid'],
+                        kp=config.get('heater_kp', 30.0),
+                        ki=config.get('heater_ki', 1.0),
+                        kd=config.get('heater_kd', 0.0),
+                        window=config.get('heater_pid_window', 600)
+                    )
+                print("Heater mode: {}".format("PID" if config['heater_pid'] else "swing band"))
+            
+            # Update schedule transition mode (ramp windows are read from config on each run)
+            if 'schedule_ramp' in params:
+                config['schedule_ramp'] = RAMP_MODES[min(int(params['schedule_ramp']), len(RAMP_MODES) - 1)]
+                if 'schedule_ramp_minutes' in params:
+                    config['schedule_ramp_minutes'] = int(params['schedule_ramp_minutes'])
+                if schedule_monitor and schedule_monitor.wake:
+                    schedule_monitor.wake()  # Its sleep was computed for the old window
+                print("Schedule transitions: {}".format(config['schedule_ramp']))
+            
             # Update hold duration (convert minutes to seconds)
             if 'temp_hold_duration' in params:
                 duration_seconds = int(params['temp_hold_duration'] * 60)
-                config['temp_hold_duration'] = duration_seconds
-                if schedule_monitor:
-                    schedule_monitor.temp_hold_duration = duration_seconds
+                config['temp_hold_duration'] = duration_seconds  # ScheduleMonitor subscribes to this key
                 print("Temp hold duration updated to {} minutes".format(int(params['temp_hold_duration'])))
             
             # Update timezone offset
@@ -1831,23 +1978,28 @@ document.addEventListener('DOMContentLoaded', function() {{
                 config['timezone_offset'] = int(params['timezone_offset'])
                 print("Timezone offset updated to UTC{:+d}".format(int(params['timezone_offset'])))
             
-            # Save to file
-            if self._save_config_to_file(config):
-                print("Advanced settings saved")
+            # Update probe resolutions (applied to the sensor now, persisted under config['probes'])
+            for name in params:
+                if not name.startswith('res_') or not sensor_hub:
+                    continue
+                key = name[4:]
+                bits = int(params[name])
+                if sensor_hub.resolution(key)[0] == bits:
+                    continue
+                if sensor_hub.set_resolution(key, bits):
+                    probes = config.get('probes') or {}
+                    entry = probes.get(key) or {}
+                    entry['resolution'] = bits
+                    probes[key] = entry
+                    config['probes'] = probes
+                    print("{} resolution updated to {}-bit".format(key, bits))
+            
+            print("Advanced settings updated")
                 
-                # Reload config
-                try:
-                    with open('config.json', 'r') as f:
-                        updated_config = json.load(f)
-                        config.clear()
-                        config.update(updated_config)
-                    print("✅ Config reloaded")
-                except Exception as e:
-                    print("⚠️ Could not reload: {}".format(e))
             
             # Discord notification
             try:
-                discord_webhook.send_discord_message("⚙️ Advanced settings updated")
+                discord_webhook.queue_discord_message("⚙️ Advanced settings updated")
             except:
                 pass
             
@@ -1862,5 +2014,4 @@ document.addEventListener('DOMContentLoaded', function() {{
         redirect_response += 'Content-Length: 0\r\n'
         redirect_response += 'Connection: close\r\n'
         redirect_response += '\r\n'
-        gc.collect()
         return redirect_response
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+AC overshoot and cycling: plain threshold vs. rate-of-change anticipation.
+
+Host only (uses the sim/ backend):   python benchmarks/ac_overshoot.py
+
+Runs main.py in the host simulator through a warm spell with a lagging AC
+(the coil keeps cooling for a few minutes after the relay opens), once per
+ac_lead_time setting. Overshoot is how far the inside temperature falls
+below the AC off threshold (target - swing) after each AC cycle. Each case
+runs in its own process because the simulator patches modules globally.
+"""
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HOURS = 48
+LEAD_TIMES = (0, 60, 120, 240)
+PLANT = {'outside_mean_c': 23.0, 'outside_swing_c': 5.0, 'lag_s': 300, 'trace': True}
+# Overshoot is measured this long after the AC stops (later dips are the night, not the AC)
+SETTLE_MS = 3 * PLANT['lag_s'] * 1000
+
+def c_to_f(c):
+    return c * 9 / 5 + 32
+
+def run_case(lead):
+    """Run one simulation (in this process) and return its figures."""
+    import sim.run as sim_run
+    config = sim_run.sim_config()
+    config['ac_lead_time'] = lead
+    path = os.path.join(sim_run.tempfile.mkdtemp(prefix='ac-overshoot-'), 'seed.json')
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    r = sim_run.run(hours=HOURS, config=path, plant=PLANT)
+    climate = r['main']['climate']
+    threshold_f = climate.cooling.target_temp - climate.cooling.temp_swing
+    transitions = r['main']['ac_controller'].relay.transitions
+    samples = r['greenhouse'].samples
+    # Overshoot per cycle: lowest inside temp after AC off, until the next AC on or SETTLE_MS
+    overshoots = []
+    offs = [t for t, v in transitions if not v]
+    ons = [t for t, v in transitions if v]
+    for off in offs:
+        nxt = min([t for t in ons if t > off] + [off + SETTLE_MS])
+        low = min([c for t, c in samples if off <= t < nxt] or [None])
+        if low is not None:
+            overshoots.append(max(0.0, threshold_f - c_to_f(low)))
+    starts = len(ons)
+    on_h = r['main']['ac_controller'].relay.on_ms() / 3600000
+    return {
+        'lead': lead,
+        'cycles_per_h': starts / HOURS,
+        'on_h': on_h,
+        'mean_overshoot': sum(overshoots) / len(overshoots) if overshoots else 0.0,
+        'max_overshoot': max(overshoots) if overshoots else 0.0,
+    }
+
+def main():
+    print("=" * 72)
+    print("AC overshoot vs. anticipation lead ({} h sim, {} s AC lag)".format(HOURS, PLANT['lag_s']))
+    print("=" * 72)
+    print("{:>10} {:>14} {:>12} {:>18} {:>16}".format("lead (s)", "cycles / h", "AC on (h)", "mean overshoot", "max overshoot"))
+    for lead in LEAD_TIMES:
+        out = subprocess.run([sys.executable, __file__, '--case', str(lead)], capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print("{:>10} {:>14.2f} {:>12.2f} {:>15.2f}°F {:>13.2f}°F".format(
+            r['lead'], r['cycles_per_h'], r['on_h'], r['mean_overshoot'], r['max_overshoot']))
+    print("=" * 72)
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--case':
+        print(json.dumps(run_case(int(sys.argv[2]))))
+    else:
+        main()
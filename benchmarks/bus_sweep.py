@@ -0,0 +1,79 @@
+"""
+Sensor sweep time vs. number of 1-Wire buses: sequential vs. BusGroup.
+
+Host only (uses the sim/ backend):   python benchmarks/bus_sweep.py
+
+Each bus carries PROBES_PER_BUS simulated DS18B20s. "sequential" is the old
+SensorHub.run(): convert + wait + read one bus, then the next. "parallel" is
+BusGroup: convert every bus back-to-back, wait once, read them all. Times are
+virtual milliseconds, i.e. what the Pico would spend waiting on conversions.
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sim
+sim.install()
+
+from sim.clock import CLOCK
+from sim.ds18x20 import SimProbe, attach, make_rom
+from sim.loop import VirtualLoopPolicy
+import sim.onewire as onewire
+from scripts.temperature_sensor import TemperatureSensor, BusGroup
+
+MAX_BUSES = 8
+PROBES_PER_BUS = 3
+SWEEPS = 10
+FIRST_PIN = 2
+
+asyncio.set_event_loop_policy(VirtualLoopPolicy(CLOCK))
+
+def make_buses(count, bits=12):
+    """`count` buses with PROBES_PER_BUS probes each, all at `bits` resolution."""
+    sensors = {}
+    for b in range(count):
+        pin = FIRST_PIN + b
+        for p in range(PROBES_PER_BUS):
+            attach(pin, SimProbe(make_rom(pin * 100 + p), 20.0 + p))
+        sensor = TemperatureSensor(pin=pin, label="GPIO{}".format(pin))
+        sensor.set_resolution(bits)
+        sensors[pin] = sensor
+    return sensors
+
+async def sequential(sensors):
+    for sensor in sensors.values():
+        await sensor.read_all_temps_async(unit='F')
+
+async def parallel(group):
+    await group.read_all_async(unit='F')
+
+def sweep_ms(make_coro):
+    """Average virtual ms per sweep."""
+    async def sweeps():
+        for _ in range(SWEEPS):
+            await make_coro()
+    start = CLOCK.now_ms
+    asyncio.run(sweeps())
+    return (CLOCK.now_ms - start) / SWEEPS
+
+def main():
+    print("=" * 60)
+    print("Sensor sweep time vs. bus count ({} probes/bus, virtual ms)".format(PROBES_PER_BUS))
+    print("=" * 60)
+    print("{:>5} {:>8} {:>14} {:>12} {:>9}".format("bits", "buses", "sequential", "parallel", "speedup"))
+    for bits in (12, 9):
+        for count in range(1, MAX_BUSES + 1):
+            onewire.BUSES.clear()
+            with contextlib.redirect_stdout(io.StringIO()):  # Silence scan messages
+                sensors = make_buses(count, bits)
+            group = BusGroup(sensors)
+            seq = sweep_ms(lambda: sequential(sensors))
+            par = sweep_ms(lambda: parallel(group))
+            print("{:>5} {:>8} {:>11.0f} ms {:>9.0f} ms {:>8.1f}x".format(bits, count, seq, par, seq / par))
+    print("=" * 60)
+
+main()
@@ -0,0 +1,128 @@
+"""
+RAM benchmark: per-tick TemperatureMonitor construct/destroy vs one long-lived instance.
+
+Run on the Pico (scripts/ uploaded):   mpremote run benchmarks/monitor_churn.py
+Run on a host from the repo root:      python benchmarks/monitor_churn.py
+
+Reports, for each pattern, heap bytes allocated per tick, time spent inside
+gc.collect(), and the largest contiguous free block afterwards as a
+fragmentation measure. Heap and fragmentation figures are only meaningful on
+MicroPython; CPython frees most garbage by reference counting.
+"""
+import gc # type: ignore
+import sys
+import time # type: ignore
+
+ITERATIONS = 200
+
+# ===== START: Host support =====
+if sys.implementation.name != 'micropython':
+    import types
+    if 'scripts' not in sys.modules:
+        # The checkout folder is "Scripts"; on the Pico it is "scripts"
+        pkg = types.ModuleType('scripts')
+        pkg.__path__ = [__file__.rsplit('/', 2)[0] + '/Scripts']
+        sys.modules['scripts'] = pkg
+# ===== END: Host support =====
+
+from scripts.monitors import TemperatureMonitor
+from scripts.runtime import ticks_ms, ticks_diff
+
+def ticks_us():
+    return time.ticks_us() if hasattr(time, 'ticks_us') else int(time.perf_counter() * 1000000)
+
+class StubHub:
+    """Stands in for SensorHub: always returns an in-range reading (centi-°F)."""
+    def get_centi(self, key, max_age=None):
+        return 7250
+
+def quiet_monitor(hub):
+    monitor = TemperatureMonitor(
+        sensor_hub=hub, sensor_key='inside', label='Inside',
+        check_interval=10, report_interval=30,
+        alert_high=80.0, alert_low=70.0, log_file="/bench_logs.csv"
+    )
+    monitor._log_temperature = lambda temp: None  # Don't wear flash while benchmarking
+    return monitor
+
+def heap_used():
+    if hasattr(gc, 'mem_alloc'):
+        return gc.mem_alloc()
+    import tracemalloc
+    return tracemalloc.get_traced_memory()[0]
+
+def largest_free_block():
+    """Largest bytearray the heap can hand out right now (binary search)."""
+    if not hasattr(gc, 'mem_free'):
+        return None
+    lo, hi = 0, gc.mem_free()
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        try:
+            block = bytearray(mid)
+            del block
+            lo = mid
+        except MemoryError:
+            hi = mid - 1
+    return lo
+
+def timed_collect(stats):
+    start = ticks_us()
+    gc.collect()
+    stats['gc_us'] += ticks_us() - start
+    stats['gc_count'] += 1
+
+def churn_pattern(hub, stats, collect=True):
+    """Old main.py loop: build, run, delete and force a collection every tick."""
+    for _ in range(ITERATIONS):
+        monitor = quiet_monitor(hub)
+        monitor.run()
+        del monitor
+        if collect:
+            timed_collect(stats)
+
+def persistent_pattern(hub, stats, collect=True):
+    """New main.py: one monitor for the whole run; garbage is left to the runtime's GC task."""
+    monitor = quiet_monitor(hub)
+    for _ in range(ITERATIONS):
+        monitor.run()
+    if collect:
+        timed_collect(stats)
+
+def measure(pattern):
+    hub = StubHub()
+    stats = {'gc_us': 0, 'gc_count': 0}
+    # Pass 1: heap bytes allocated (collector off so nothing is reclaimed mid-run)
+    gc.collect()
+    gc.disable()
+    before = heap_used()
+    pattern(hub, stats, collect=False)
+    allocated = heap_used() - before
+    gc.enable()
+    # Pass 2: time spent collecting, then fragmentation left behind
+    gc.collect()
+    started = ticks_ms()
+    pattern(hub, stats)
+    elapsed = ticks_diff(ticks_ms(), started)
+    return allocated, stats, elapsed, largest_free_block()
+
+def main():
+    if not hasattr(gc, 'mem_alloc'):
+        import tracemalloc
+        tracemalloc.start()
+    print("="*60)
+    print("TemperatureMonitor RAM benchmark ({} ticks)".format(ITERATIONS))
+    print("="*60)
+    for name, pattern in (('churn', churn_pattern), ('persistent', persistent_pattern)):
+        allocated, stats, elapsed, largest = measure(pattern)
+        print("{:<11} alloc/tick: {:>6} B | gc calls: {:>4} | gc time: {:>8} us | wall: {:>6} ms | largest free block: {}".format(
+            name,
+            allocated // ITERATIONS,
+            stats['gc_count'],
+            stats['gc_us'],
+            elapsed,
+            "{} B".format(largest) if largest is not None else "n/a (host)"
+        ))
+    print("="*60)
+
+main()
@@ -0,0 +1,84 @@
+"""
+Morning warm-up: setpoint step vs. ramp vs. arrive-by.
+
+Host only (uses the sim/ backend):   python benchmarks/schedule_ramp.py
+
+Runs main.py in the host simulator through cold nights with a Night schedule
+(heater 60°F) followed by a Morning schedule (heater 72°F), once per
+schedule_ramp mode. For each morning after the first (the first one teaches
+arrive-by its warm-up rate) it reports the inside temperature at the
+Morning start, how late the room got to the Morning target, and how far it
+overshot the heater off threshold (target + swing) afterwards. Each case
+runs in its own process because the simulator patches modules globally.
+"""
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HOURS = 96
+MODES = ('off', 'ramp', 'arrive_by')
+RAMP_MINUTES = 180
+MORNING_H = 6
+PLANT = {'inside_c': 16.0, 'outside_mean_c': 4.0, 'outside_swing_c': 4.0, 'heat_c_per_h': 12.0,
+         'solar_c_per_h': 1.0, 'lag_s': 300, 'trace': True}
+SCHEDULES = [
+    {'time': '06:00', 'name': 'Morning', 'ac_target': 85.0, 'heater_target': 72.0},
+    {'time': '22:00', 'name': 'Night', 'ac_target': 85.0, 'heater_target': 60.0},
+]
+
+def c_to_f(c):
+    return c * 9 / 5 + 32
+
+def run_case(mode):
+    """Run one simulation (in this process) and return its figures."""
+    import sim.run as sim_run
+    from sim.clock import CLOCK
+    config = sim_run.sim_config()
+    config['schedules'] = SCHEDULES
+    config['schedule_ramp'] = mode
+    config['schedule_ramp_minutes'] = RAMP_MINUTES
+    path = os.path.join(sim_run.tempfile.mkdtemp(prefix='schedule-ramp-'), 'seed.json')
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    r = sim_run.run(hours=HOURS, config=path, plant=PLANT)
+    target = SCHEDULES[0]['heater_target']
+    off_threshold = target + config['heater_swing']
+    samples = [((CLOCK.epoch + ms / 1000) % 86400 / 3600, ms // 86400000, c_to_f(c)) for ms, c in r['greenhouse'].samples]
+    at_start, late_min, overshoot = [], [], []
+    for day in range(2, HOURS // 24):
+        morning = [(h, f) for h, d, f in samples if d == day and MORNING_H <= h < MORNING_H + 4]
+        if not morning:
+            continue
+        at_start.append(morning[0][1])
+        reached = [h for h, f in morning if f >= target]
+        late_min.append((reached[0] - MORNING_H) * 60 if reached else 240)
+        overshoot.append(max(0.0, max(f for _, f in morning) - off_threshold))
+    return {
+        'mode': mode,
+        'at_start': sum(at_start) / len(at_start),
+        'late_min': sum(late_min) / len(late_min),
+        'overshoot': max(overshoot),
+        'heater_h': r['main']['heater_controller'].relay.on_ms() / 3600000,
+        'warmup_rate': r['main']['schedule_monitor'].warmup_rate / 100,
+    }
+
+def main():
+    print("=" * 80)
+    print("Morning warm-up 60 -> 72°F ({} h sim, {} min ramp window, {} s heater lag)".format(HOURS, RAMP_MINUTES, PLANT['lag_s']))
+    print("=" * 80)
+    print("{:>10} {:>14} {:>14} {:>14} {:>12} {:>12}".format("mode", "temp @ 06:00", "late (min)", "overshoot", "heater (h)", "rate (°F/h)"))
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, '--case', mode], capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print("{:>10} {:>12.1f}°F {:>14.0f} {:>12.2f}°F {:>12.2f} {:>12.1f}".format(
+            r['mode'], r['at_start'], r['late_min'], r['overshoot'], r['heater_h'], r['warmup_rate']))
+    print("=" * 80)
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--case':
+        print(json.dumps(run_case(sys.argv[2])))
+    else:
+        main()
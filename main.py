@@ -1,14 +1,21 @@
 from machine import Pin, RTC # type: ignore
 import time # type: ignore
 import network # type: ignore
-import json
 import gc  # type: ignore # ADD THIS - for garbage collection
 import sys
 
+BOOT_START = time.ticks_ms()  # Boot timing is reported with the startup memory check
+boot_timings = []             # [(step, ms), ...]
+
 # Initialize pins (LED light onboard)
 led = Pin("LED", Pin.OUT)
 led.low()
 
+# Status LED patterns run from a hardware timer; code only switches pattern
+from scripts.led_patterns import LedPatterns, TICK_MS
+status_led = LedPatterns(led)
+led_timer_ok = status_led.start()
+
 # Hard reset WiFi interface before connecting
 print("Initializing WiFi...")
 try:
@@ -21,6 +28,9 @@ except Exception as e:
 
 # Import after WiFi reset
 from scripts.networking import connect_wifi
+from scripts.config_store import ConfigStore
+import scripts.gc_policy as gc_policy
+gc_policy.setup()  # Routine collection via gc.threshold() instead of fixed-interval collects
 
 # ===== NEW: NTP Sync Function (imports locally) =====
 def sync_ntp_time(timezone_offset):
@@ -65,113 +75,109 @@ def sync_ntp_time(timezone_offset):
         print("NTP sync failed: {}".format(e))
         return False
     finally:
-        # Force garbage collection to free socket/struct modules
-        gc.collect()
+        # Collect to free socket/struct modules
+        gc_policy.collect()
 # ===== END: NTP Sync Function =====
 
 # ===== START: Configuration Loading =====
 # Load saved settings from config.json file on Pico
 def load_config():
-    """Load configuration from config.json file."""
-    try:
-        with open('config.json', 'r') as f:
-            config = json.load(f)
-            print("Loaded saved settings from config.json")
-            return config
-    except:
-        # If file doesn't exist or is corrupted, create default config
-        print("No saved config found, creating default config.json...")
-        
-        default_config = {
-            'static_ip': '192.168.86.43',
-            'subnet': '255.255.255.0',
-            'gateway': '192.168.86.1',
-            'dns': '192.168.86.1',
-            'timezone_offset': -6,     # Timezone offset from UTC (CST=-6, EST=-5, MST=-7, PST=-8, add 1 for DST)
-            'ac_target': 75.0,         # Default AC target temp
-            'ac_swing': 1.0,           # Default AC tolerance (+/- degrees)
-            'heater_target': 72.0,     # Default heater target temp
-            'heater_swing': 2.0,       # Default heater tolerance (+/- degrees)
-            'temp_hold_duration': 3600, # Default hold duration in seconds (1 hour)
-            'temp_hold_start_time': None, # No hold active at startup
-            'schedules': [             # Default 4 schedules
-                {
-                    'time': '06:00',
-                    'name': 'Morning',
-                    'ac_target': 75.0,
-                    'heater_target': 72.0
-                },
-                {
-                    'time': '12:00',
-                    'name': 'Midday',
-                    'ac_target': 75.0,
-                    'heater_target': 72.0
-                },
-                {
-                    'time': '18:00',
-                    'name': 'Evening',
-                    'ac_target': 75.0,
-                    'heater_target': 72.0
-                },
-                {
-                    'time': '22:00',
-                    'name': 'Night',
-                    'ac_target': 75.0,
-                    'heater_target': 72.0
-                }
-            ],
-            'schedule_enabled': True, # Schedules disabled by default (user can enable via web)
-            'permanent_hold': False    # Permanent hold disabled by default
-        }
-        
-        # ===== START: Save default config to file =====
-        try:
-            with open('config.json', 'w') as f:
-                json.dump(default_config, f)
-            print("✅ Default config.json created successfully with 4 sample schedules")
-        except Exception as e:
-            print("⚠️ Warning: Could not create config.json: {}".format(e))
-            print("   (Program will continue with defaults in memory)")
-        # ===== END: Save default config to file =====
-        
-        return default_config
-
-# global variables for Discord webhook status
-discord_sent = False
-discord_send_attempts = 0
-pending_discord_message = None
+    """
+    Load configuration from config.json. This is the only time the config is
+    read from flash: the returned ConfigStore is shared from here on.
+    """
+    config = ConfigStore()
+    if config.load():
+        print("Loaded saved settings from config.json")
+        return config
+    # If file doesn't exist or is corrupted, create default config
+    print("No saved config found, creating default config.json...")
+    
+    default_config = {
+        'static_ip': '192.168.86.43',
+        'subnet': '255.255.255.0',
+        'gateway': '192.168.86.1',
+        'dns': '192.168.86.1',
+        'timezone_offset': -6,     # Timezone offset from UTC (CST=-6, EST=-5, MST=-7, PST=-8, add 1 for DST)
+        'ac_target': 75.0,         # Default AC target temp
+        'ac_swing': 1.0,           # Default AC tolerance (+/- degrees)
+        'ac_lead_time': 120,       # Stop the AC early if the trend reaches the off point within this many seconds
+        'heater_target': 72.0,     # Default heater target temp
+        'heater_swing': 2.0,       # Default heater tolerance (+/- degrees)
+        'heater_pid': False,       # PID heating (time-proportioned) instead of the swing band
+        'heater_kp': 30.0,         # PID gains: % duty per °F, per °F·min, per °F/min
+        'heater_ki': 1.0,
+        'heater_kd': 0.0,
+        'heater_pid_window': 600,  # PID on/off window in seconds
+        'temp_hold_duration': 3600, # Default hold duration in seconds (1 hour)
+        'schedule_ramp': 'off',    # Schedule transitions: 'off' (step), 'ramp' or 'arrive_by'
+        'schedule_ramp_minutes': 60, # Ramp window / longest arrive-by early start
+        'warmup_rate': 6.0,        # °F per hour, learned from warm-ups (arrive_by)
+        'temp_hold_start_time': None, # No hold active at startup
+        'schedules': [             # Default 4 schedules
+            {
+                'time': '06:00',
+                'name': 'Morning',
+                'ac_target': 75.0,
+                'heater_target': 72.0
+            },
+            {
+                'time': '12:00',
+                'name': 'Midday',
+                'ac_target': 75.0,
+                'heater_target': 72.0
+            },
+            {
+                'time': '18:00',
+                'name': 'Evening',
+                'ac_target': 75.0,
+                'heater_target': 72.0
+            },
+            {
+                'time': '22:00',
+                'name': 'Night',
+                'ac_target': 75.0,
+                'heater_target': 72.0
+            }
+        ],
+        'schedule_enabled': True, # Schedules disabled by default (user can enable via web)
+        'permanent_hold': False    # Permanent hold disabled by default
+    }
+    
+    # ===== START: Save default config to file =====
+    config = ConfigStore(default_config)
+    config.mark_dirty()
+    if config.flush(force=True):
+        print("✅ Default config.json created successfully with 4 sample schedules")
+    else:
+        print("⚠️ Warning: Could not create config.json")
+        print("   (Program will continue with defaults in memory)")
+    # ===== END: Save default config to file =====
+    
+    return config
 
 # Load configuration from file
 config = load_config()
 import scripts.discord_webhook as discord_webhook
 # Initialize discord webhook module with loaded config (must be done BEFORE any send_discord_message calls)
 discord_webhook.set_config(config)
+config.subscribe(lambda store, key: discord_webhook.set_config(store), ('discord_webhook_url', 'discord_alert_webhook_url'))
 
 # Get timezone offset from config (with fallback to -6 if not present)
 TIMEZONE_OFFSET = config.get('timezone_offset', -6)
 
 # ===== START: Reset hold modes on startup =====
-# Always reset to automatic mode on boot (don't persist hold states)
-if 'schedule_enabled' in config:
-    config['schedule_enabled'] = True  # Always enable schedules on boot
-if 'permanent_hold' in config:
-    config['permanent_hold'] = False   # Always clear permanent hold on boot
-if 'temp_hold_start_time' in config:
-    config['temp_hold_start_time'] = None  # Clear temp hold start time
-
-# Save the reset config immediately
-try:
-    with open('config.json', 'w') as f:
-        json.dump(config, f)
-    print("✅ Hold modes reset - Automatic mode active")
-except Exception as e:
-    print("⚠️ Warning: Could not save config reset: {}".format(e))
+# Always reset to automatic mode on boot (hold states are RAM only, never written to flash)
+config['schedule_enabled'] = True      # Always enable schedules on boot
+config['permanent_hold'] = False       # Always clear permanent hold on boot
+config['temp_hold_start_time'] = None  # Clear temp hold start time
+print("✅ Hold modes reset - Automatic mode active")
 # ===== END: Reset hold modes on startup =====
 # ===== END: Configuration Loading =====
 
 # ===== START: WiFi Connection =====
 # Connect to WiFi using credentials from config.json
-wifi = connect_wifi(led, config=config)
+wifi = connect_wifi(status_led, config=config)
 
 # Set static IP and print WiFi details
 if wifi and wifi.isconnected():
@@ -198,7 +204,7 @@ if wifi and wifi.isconnected():
     print("="*50 + "\n")
     
     # Try sending Discord webhook NOW, before creating other objects
-    gc.collect()
+    gc_policy.collect()
     ram_free = gc.mem_free()
     print(f"DEBUG: Free RAM before Discord send: {ram_free // 1024} KB")
     mem_ok = ram_free > 95000
@@ -206,28 +212,18 @@ if wifi and wifi.isconnected():
         ok = discord_webhook.send_discord_message("Pico W online at http://{}".format(ifconfig[0]), debug=False)
         if ok:
             print("Discord startup notification sent")
-            discord_sent = True
         else:
-            print("Discord startup notification failed")
-            pending_discord_message = "Pico W online at http://{}".format(ifconfig[0])
-            discord_send_attempts = 1
+            print("Discord startup notification failed, will retry in background")
+            discord_webhook.queue_discord_message("Pico W online at http://{}".format(ifconfig[0]))
     else:
-        print("Not enough memory for Discord startup notification")
-        pending_discord_message = "Pico W online at http://{}".format(ifconfig[0])
-        discord_send_attempts = 1
+        print("Not enough memory for Discord startup notification, will retry in background")
+        discord_webhook.queue_discord_message("Pico W online at http://{}".format(ifconfig[0]))
     
-    # ===== Moved to later so discord could fire off startup message hopefully =====
-    from scripts.monitors import TemperatureMonitor, WiFiMonitor, ACMonitor, HeaterMonitor, run_monitors
-    from scripts.temperature_sensor import TemperatureSensor
-    from scripts.air_conditioning import ACController
-    from scripts.heating import HeaterController
+    # ===== Imported after the Discord send, which needs the free RAM =====
     from scripts.web_server import TempWebServer
-    from scripts.scheduler import ScheduleMonitor
-    from scripts.memory_check import check_memory_once
     
-    # Start web server early so page can load even if time sync is slow
-    web_server = TempWebServer(port=80)
-    web_server.start()
+    # Web server starts listening once the task runtime is running
+    web_server = TempWebServer(port=config.get("web_port", 80))
 
     # ===== INITIAL NTP SYNC (using function) =====
     ntp_synced = False
@@ -246,8 +242,21 @@ else:
     print("\n" + "="*50)
     print("WiFi Connection Failed!")
     print("="*50 + "\n")
+    web_server = None
 # ===== END: WiFi Connection =====
 
+# Imported after the startup Discord send (it needs the free RAM), but outside
+# the WiFi branch: an offline boot still controls the relays and WiFiMonitor
+# keeps trying to connect in the background
+from scripts.monitors import TemperatureMonitor, WiFiMonitor, run_monitors
+from scripts.climate import ClimateController
+from scripts.temperature_sensor import TemperatureSensor, parse_rom, rom_hex, load_rom_cache
+from scripts.sensor_hub import SensorHub
+from scripts.air_conditioning import ACController
+from scripts.heating import HeaterController
+from scripts.scheduler import ScheduleMonitor
+from scripts.memory_check import check_memory_once
+
 
 
 # ===== START: Sensor Configuration =====
@@ -257,28 +266,85 @@ SENSOR_CONFIG = {
         'pin': 10,              # GPIO pin for DS18B20 sensor
         'label': 'Inside',      # Display name
         'alert_high': 80.0,     # Send alert if temp > 80°F
-        'alert_low': 70.0       # Send alert if temp < 70°F
+        'alert_low': 70.0,      # Send alert if temp < 70°F
+        'alert_channel': True,  # Alerts go to the separate Discord alert channel
+        'resolution': 12        # 12-bit (0.0625°C, 750 ms): control probe keeps full precision
     },
     'outside': {
         'pin': 11,              # GPIO pin for DS18B20 sensor
         'label': 'Outside',     # Display name
         'alert_high': 85.0,     # Send alert if temp > 85°F
-        'alert_low': 68.0       # Send alert if temp < 68°F
+        'alert_low': 68.0,      # Send alert if temp < 68°F
+        'alert_channel': False,
+        'resolution': 10        # 10-bit (0.25°C, 188 ms) is plenty for alerts
     }
 }
 
+# Extra probes (or ROMs for the ones above) from config.json, e.g.
+#   "probes": {"bench": {"pin": 10, "rom": "28ff4a1b93160343", "label": "Bench", "alert_high": 90.0, "resolution": 9}}
+# Probes without a 'rom' read the first sensor found on their pin.
+for key, entry in (config.get('probes') or {}).items():
+    merged = dict(SENSOR_CONFIG.get(key, {}))
+    merged.update(entry)
+    merged.setdefault('label', key)
+    SENSOR_CONFIG[key] = merged
+
+# ROMs found on the previous boot; a bus search only runs for pins with no cached ROMs
+ROM_CACHE = "/rom_cache.json"
+
 # Initialize sensors based on configuration
-def get_configured_sensors():
-    """Return dictionary of configured sensor instances."""
-    sensors = {}
-    for key, config in SENSOR_CONFIG.items():
-        sensors[key] = TemperatureSensor(pin=config['pin'], label=config['label'])
-    return sensors
-
-# Create sensor instances
-sensors = get_configured_sensors()
+def get_configured_sensors(rom_cache):
+    """Return ({pin: TemperatureSensor}, {key: (pin, rom)}): one bus object per GPIO, however many probes share it."""
+    buses = {}
+    probes = {}
+    for key, sensor_config in SENSOR_CONFIG.items():
+        pin = sensor_config['pin']
+        if pin not in buses:
+            buses[pin] = TemperatureSensor(pin=pin, label="GPIO{}".format(pin), roms=rom_cache.get(pin))
+        probes[key] = (pin, parse_rom(sensor_config.get('rom')))
+    return buses, probes
+
+# Create one bus per GPIO
+sensor_boot_start = time.ticks_ms()
+sensors, probes = get_configured_sensors(load_rom_cache(ROM_CACHE))
+rom_cache_hit = all(sensor.from_cache for sensor in sensors.values())
+boot_timings.append(("Sensor discovery ({})".format("ROM cache" if rom_cache_hit else "bus search"),
+                     time.ticks_diff(time.ticks_ms(), sensor_boot_start)))
+
+# One broadcast conversion per bus per period; monitors and the web page read the cache
+sensor_hub = SensorHub(sensors, period=10, max_age=30, probes=probes,
+                       labels={key: cfg['label'] for key, cfg in SENSOR_CONFIG.items()},
+                       rom_cache=ROM_CACHE)
+if not rom_cache_hit:
+    sensor_hub.save_rom_cache()  # Next boot skips the search
+for key, sensor_config in SENSOR_CONFIG.items():
+    sensor_hub.set_resolution(key, sensor_config.get('resolution', 12))  # Bus waits for its slowest probe
+sensor_hub.refresh()  # First sample before anything needs a reading
+boot_timings.append(("Sensor setup + first sample", time.ticks_diff(time.ticks_ms(), sensor_boot_start)))
+for pin, roms in sensor_hub.unassigned().items():
+    for rom in roms:
+        print("ℹ️ Unlabelled probe on GPIO{}: {} (add it to 'probes' in config.json)".format(pin, rom_hex(rom)))
+
+# Long-lived temperature monitors (keep alert and report state across ticks)
+temp_monitors = {}
+for key, sensor_config in SENSOR_CONFIG.items():
+    temp_monitors[key] = TemperatureMonitor(
+        sensor_hub=sensor_hub,
+        sensor_key=key,
+        label=sensor_config['label'],
+        check_interval=10,
+        report_interval=30,
+        alert_high=sensor_config.get('alert_high'),
+        alert_low=sensor_config.get('alert_low'),
+        log_file="/temp_logs.csv",
+        send_alerts_to_separate_channel=sensor_config.get('alert_channel', False)
+    )
 # ===== END: Sensor Configuration =====
 
+# ===== START: WiFi Monitor Setup =====
+wifi_monitor = WiFiMonitor(wifi, status_led, interval=5, reconnect_cooldown=60, config=config)
+# ===== END: WiFi Monitor Setup =====
+
 # ===== START: AC Controller Setup =====
 # Set up air conditioning relay controller
 ac_controller = ACController(
@@ -286,15 +352,6 @@ ac_controller = ACController(
     min_run_time=30,        # Minimum seconds AC must run before turning off
     min_off_time=5          # Minimum seconds AC must be off before turning on again
 )
-
-# Create AC monitor (automatically controls AC based on temperature)
-ac_monitor = ACMonitor(
-    ac_controller=ac_controller,
-    temp_sensor=sensors['inside'],      # Use inside sensor for AC control
-    target_temp=config['ac_target'],    # Target temp from config.json
-    temp_swing=config['ac_swing'],      # Tolerance (+/- degrees)
-    interval=30                         # Check temperature every 30 seconds
-)
 # ===== END: AC Controller Setup =====
 
 # ===== START: Heater Controller Setup =====
@@ -304,16 +361,43 @@ heater_controller = HeaterController(
     min_run_time=30,        # Minimum seconds heater must run before turning off
     min_off_time=5          # Minimum seconds heater must be off before turning on again
 )
+# ===== END: Heater Controller Setup =====
+
+# ===== START: Relay Statistics =====
+# Run-time / cycle counters live in RAM; a slow job flushes them (see Task Runtime)
+import scripts.relay_stats as relay_stats
+RELAY_STATS_FILE = "/relay_stats.json"
+RELAY_STATS_FLUSH_S = 900   # At most one flash write per 15 minutes
+relays = {'ac': ac_controller, 'heater': heater_controller}
+relay_stats.load(RELAY_STATS_FILE, relays)
+# ===== END: Relay Statistics =====
 
-# Create heater monitor (automatically controls heater based on temperature)
-heater_monitor = HeaterMonitor(
+# ===== START: Climate Controller Setup =====
+# One decision pass per tick drives both relays (never both on at once)
+climate = ClimateController(
+    ac_controller=ac_controller,
     heater_controller=heater_controller,
-    temp_sensor=sensors['inside'],          # Use inside sensor for heater control
-    target_temp=config['heater_target'],    # Target temp from config.json
-    temp_swing=config['heater_swing'],      # Tolerance (+/- degrees)
-    interval=30                             # Check temperature every 30 seconds
+    sensor_hub=sensor_hub,
+    sensor_key='inside',                                    # Use inside sensor for climate control
+    ac_target=config.get_float('ac_target', 75.0),          # Targets from config.json
+    ac_swing=config.get_float('ac_swing', 2.0),             # Tolerance (+/- degrees)
+    heater_target=config.get_float('heater_target', 70.0),
+    heater_swing=config.get_float('heater_swing', 2.0),
+    changeover=config.get_int('changeover_delay', 300),     # Seconds between cooling and heating
+    interval=30,                                            # Decide every 30 seconds
+    ac_lead=config.get_int('ac_lead_time', 120)             # Switch the AC off early if the trend crosses the threshold within this many seconds
 )
-# ===== END: Heater Controller Setup =====
+climate.configure_pid(
+    config.get_bool('heater_pid'),                  # Time-proportioning PID instead of the swing band
+    kp=config.get_float('heater_kp', 30.0),         # % duty per °F below target
+    ki=config.get_float('heater_ki', 1.0),          # % duty per °F below target per minute
+    kd=config.get_float('heater_kd', 0.0),          # % duty per °F/minute of falling temperature
+    window=config.get_int('heater_pid_window', 600) # Seconds per on/off cycle
+)
+# Cooling / heating setpoints (what the scheduler and web pages adjust)
+ac_monitor = climate.cooling
+heater_monitor = climate.heating
+# ===== END: Climate Controller Setup =====
 
 # ===== START: Schedule Monitor Setup =====
 # Create schedule monitor (automatically changes temp targets based on time of day)
@@ -321,7 +405,7 @@ schedule_monitor = ScheduleMonitor(
     ac_monitor=ac_monitor,          # Pass AC monitor to control
     heater_monitor=heater_monitor,  # Pass heater monitor to control
     config=config,                  # Pass config with schedules
-    interval=60                     # Check schedule every 60 seconds
+    interval=60                     # First check; after that it sleeps until the next transition
 )
 
 # ===== APPLY ACTIVE SCHEDULE IMMEDIATELY ON STARTUP =====
@@ -358,7 +442,8 @@ print("="*50 + "\n")
 
 # ===== START: Startup Memory Check =====
 # Check memory usage after all imports and initialization
-check_memory_once()
+boot_timings.append(("Boot total", time.ticks_diff(time.ticks_ms(), BOOT_START)))
+check_memory_once(boot_timings)
 # ===== END: Startup Memory Check =====
 
 print("Starting monitoring loop...")
@@ -369,101 +454,57 @@ retry_ntp_attempts = 0
 max_ntp_attempts = 5  # Try up to 5 times after initial failure
 last_ntp_sync = time.time()  # Track when we last synced
 
+# ===== START: Task Runtime =====
+# Every job sits in one deadline-ordered timer queue; the runtime sleeps
+# exactly until the next one is due, and a slow web client or Discord post
+# no longer delays relay control.
+from scripts.runtime import Runtime
+
+runtime = Runtime(lightsleep=config.get("lightsleep", False) and web_server is None)   # Opt-in, only with nothing to listen for
+runtime.every("SensorHub", sensor_hub.period, sensor_hub.run)   # One conversion per sensor per period
+runtime.every("SensorScan", 30, sensor_hub.rescan)              # One bus per call: hot-plugged / recovered probes
+runtime.add(wifi_monitor)                                       # Every 5 seconds
+schedule_job = runtime.add(schedule_monitor)                    # Sleeps until the next schedule transition / hold expiry
+schedule_monitor.wake = lambda: runtime.wake(schedule_job)      # Config changes from the web re-check at once
+runtime.add(climate, "Climate")                                 # Every 30 seconds, both relays
+for temp_monitor in temp_monitors.values():
+    runtime.add(temp_monitor, "TemperatureMonitor({})".format(temp_monitor.label))   # Every 10 seconds
+runtime.every("Discord", 5, discord_webhook.send_pending)       # Drain queued notifications (async post, own task)
+runtime.every("RelayStats", RELAY_STATS_FLUSH_S, lambda: relay_stats.flush(RELAY_STATS_FILE, relays))   # Coalesced flash writes
+runtime.every("ConfigFlush", 5, config.flush)                   # Writes config.json once changes settle
+runtime.every("GC", 5, gc_policy.maybe_collect)                # Collects only when heap pressure says so
+if not led_timer_ok:
+    runtime.every("LED", TICK_MS / 1000, status_led.tick)       # Fallback when no machine.Timer
+
+# Extra values reported on /metrics next to the per-task histograms
+import scripts.metrics as metrics
+metrics.gauge("mem_free", gc.mem_free)
+metrics.gauge("gc_collections", lambda: gc_policy.stats()['count'])
+metrics.gauge("gc_pause_us_total", lambda: gc_policy.stats()['total_us'])
+metrics.gauge("gc_pause_us_max", lambda: gc_policy.stats()['worst_us'])
+metrics.gauge("gc_auto_collections", lambda: gc_policy.stats()['auto'])  # gc.threshold() runs; pause not measured, not in the two above
+metrics.gauge("sensor_hub_hits", lambda: sensor_hub.hits)
+metrics.gauge("sensor_hub_misses", lambda: sensor_hub.misses)
+metrics.gauge("sensor_sweep_ms", lambda: sensor_hub.group.last_sweep_ms)
+metrics.gauge("sensor_rejected", lambda: sensor_hub.rejected)
+metrics.gauge("sensor_probes_failing", lambda: sensor_hub.stats()['failing'])
+metrics.gauge("sensor_crc_errors", lambda: sensor_hub.stats()['crc_errors'])
+metrics.gauge("sensor_power_on_resets", lambda: sensor_hub.stats()['power_on_resets'])
+metrics.gauge("config_flash_writes", lambda: config.writes)
+metrics.gauge("config_dirty", lambda: 0 if config.dirty_since is None else 1)
+for name, relay in relays.items():
+    metrics.gauge("relay_{}_on_seconds".format(name), lambda relay=relay: relay.stats.total_on_ms() // 1000)
+    metrics.gauge("relay_{}_cycles".format(name), lambda relay=relay: relay.stats.cycles)
+    metrics.gauge("relay_{}_cycles_last_hour".format(name), lambda relay=relay: relay.stats.cycles_last_hour())
+    metrics.gauge("relay_{}_blocked_on".format(name), lambda relay=relay: relay.stats.blocked_on)
+    metrics.gauge("relay_{}_blocked_off".format(name), lambda relay=relay: relay.stats.blocked_off)
+
+if web_server:
+    runtime.spawn(web_server.serve(sensor_hub, ac_monitor, heater_monitor, schedule_monitor, config))
+# ===== END: Task Runtime =====
+
 try:
-    while True:
-        
-        # ===== START: Main Loop =====
-        # Main monitoring loop (runs forever until Ctrl+C)
-        last_monitor_run = {
-            "wifi": 0,
-            "schedule": 0,
-            "ac": 0,
-            "heater": 0,
-            "inside_temp": 0,
-            "outside_temp": 0,
-        }
-        
-        while True:
-            now = time.time()
-        
-            # WiFi monitor every 5 seconds (can be stateless)
-            if now - last_monitor_run["wifi"] >= 5:
-                from scripts.monitors import WiFiMonitor
-                wifi_monitor = WiFiMonitor(wifi, led, interval=5, reconnect_cooldown=60, config=config)
-                try:
-                    wifi_monitor.run()
-                except Exception as e:
-                    print("WiFiMonitor error:", e)
-                del wifi_monitor
-                gc.collect()
-                last_monitor_run["wifi"] = now
-        
-            # Schedule monitor every 60 seconds (persistent)
-            if now - last_monitor_run["schedule"] >= 60:
-                try:
-                    schedule_monitor.run()
-                except Exception as e:
-                    print("ScheduleMonitor error:", e)
-                last_monitor_run["schedule"] = now
-        
-            # AC monitor every 30 seconds (persistent)
-            if now - last_monitor_run["ac"] >= 30:
-                try:
-                    ac_monitor.run()
-                except Exception as e:
-                    print("ACMonitor error:", e)
-                last_monitor_run["ac"] = now
-        
-            # Heater monitor every 30 seconds (persistent)
-            if now - last_monitor_run["heater"] >= 30:
-                try:
-                    heater_monitor.run()
-                except Exception as e:
-                    print("HeaterMonitor error:", e)
-                last_monitor_run["heater"] = now
-        
-            # Inside temperature monitor every 10 seconds (can be stateless)
-            if now - last_monitor_run["inside_temp"] >= 10:
-                from scripts.monitors import TemperatureMonitor
-                inside_monitor = TemperatureMonitor(
-                    sensor=sensors['inside'],
-                    label=SENSOR_CONFIG['inside']['label'],
-                    check_interval=10,
-                    report_interval=30,
-                    alert_high=SENSOR_CONFIG['inside']['alert_high'],
-                    alert_low=SENSOR_CONFIG['inside']['alert_low'],
-                    log_file="/temp_logs.csv",
-                    send_alerts_to_separate_channel=True
-                )
-                inside_monitor.run()
-                del inside_monitor
-                gc.collect()
-                last_monitor_run["inside_temp"] = now
-        
-            # Outside temperature monitor every 10 seconds (can be stateless)
-            if now - last_monitor_run["outside_temp"] >= 10:
-                from scripts.monitors import TemperatureMonitor
-                outside_monitor = TemperatureMonitor(
-                    sensor=sensors['outside'],
-                    label=SENSOR_CONFIG['outside']['label'],
-                    check_interval=10,
-                    report_interval=30,
-                    alert_high=SENSOR_CONFIG['outside']['alert_high'],
-                    alert_low=SENSOR_CONFIG['outside']['alert_low'],
-                    log_file="/temp_logs.csv",
-                    send_alerts_to_separate_channel=False
-                )
-                outside_monitor.run()
-                del outside_monitor
-                gc.collect()
-                last_monitor_run["outside_temp"] = now
-        
-            # Web requests (keep web server loaded if needed)
-            web_server.check_requests(sensors, ac_monitor, heater_monitor, schedule_monitor, config)
-        
-            gc.collect()
-            time.sleep(0.1)
-        # ===== END: Main Loop =====
+    runtime.run()
 except KeyboardInterrupt:
     print("\n" + "="*50)
     print("Shutting down gracefully...")
@@ -478,9 +519,17 @@ except KeyboardInterrupt:
         heater_controller.turn_off()
     except Exception as e:
         print("Heater shutdown error:", e)
+    try:
+        relay_stats.flush(RELAY_STATS_FILE, relays)  # Keep the run time up to shutdown
+    except Exception as e:
+        print("Relay stats save error:", e)
+    try:
+        config.flush(force=True)  # Don't lose changes still inside the debounce window
+    except Exception as e:
+        print("Config save error:", e)
     try:
         print("Turning off LED...")
-        led.low()
+        status_led.stop()
     except Exception as e:
         print("LED shutdown error:", e)
     print("Shutdown complete!")
@@ -0,0 +1,96 @@
+"""
+Host simulation backend: run main.py and Scripts/ under CPython.
+
+install() puts CPython stand-ins for machine, onewire, ds18x20 and network
+into sys.modules, swaps the MicroPython time API for a virtual clock, maps
+the flash filesystem into a work directory and aliases the `scripts`
+package to the checkout's Scripts/ folder. See sim/run.py for a runner.
+"""
+import builtins
+import gc
+import os
+import socket
+import sys
+import traceback
+import types
+
+from sim.clock import CLOCK, patch_time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What the fake gc module reports (a Pico W has ~190 KB of heap for Python)
+HEAP_BYTES = 192 * 1024
+HEAP_USED = 64 * 1024
+
+_installed = False
+_flash_root = None
+_real_open = builtins.open
+
+def flash_path(path):
+    """Map a root-level device path ('/temp_logs.csv') into the work directory."""
+    if _flash_root and isinstance(path, str) and path.startswith('/') and path.count('/') == 1:
+        return os.path.join(_flash_root, path[1:])
+    return path
+
+def _flash_open(file, *args, **kwargs):
+    return _real_open(flash_path(file), *args, **kwargs)
+
+def _wrap_path_fn(fn):
+    def wrapped(path, *args, **kwargs):
+        return fn(flash_path(path), *args, **kwargs)
+    return wrapped
+
+def _print_exception(exc, file=None):
+    traceback.print_exception(type(exc), exc, exc.__traceback__, file=file or sys.stdout)
+
+def _offline_getaddrinfo(real):
+    local = (None, '', 'localhost', '0.0.0.0', '127.0.0.1', '::', '::1')
+    def getaddrinfo(host, *args, **kwargs):
+        if host not in local:
+            raise socket.gaierror(-3, "sim: no internet ({})".format(host))
+        return real(host, *args, **kwargs)
+    return getaddrinfo
+
+def install(workdir=None, clock=CLOCK):
+    """
+    Install the simulated hardware layer (idempotent).
+
+    Args:
+        workdir: Directory standing in for the Pico's flash (chdir'd into); None leaves cwd alone
+        clock: VirtualClock driving time.*, machine.Timer and the event loop
+    """
+    global _installed, _flash_root
+    if workdir is not None:
+        os.makedirs(workdir, exist_ok=True)
+        os.chdir(workdir)
+        _flash_root = os.path.abspath(workdir)
+    if _installed:
+        return clock
+    _installed = True
+
+    patch_time(clock)
+
+    import sim.machine, sim.onewire, sim.ds18x20, sim.network
+    sys.modules['machine'] = sim.machine
+    sys.modules['onewire'] = sim.onewire
+    sys.modules['ds18x20'] = sim.ds18x20
+    sys.modules['network'] = sim.network
+
+    # The checkout folder is "Scripts"; on the Pico it is "scripts"
+    if 'scripts' not in sys.modules:
+        pkg = types.ModuleType('scripts')
+        pkg.__path__ = [os.path.join(REPO_ROOT, 'Scripts')]
+        sys.modules['scripts'] = pkg
+
+    # MicroPython-only APIs the firmware calls
+    gc.mem_free = lambda: HEAP_BYTES - HEAP_USED
+    gc.mem_alloc = lambda: HEAP_USED
+    sys.print_exception = _print_exception
+
+    # Flash filesystem and network isolation
+    builtins.open = _flash_open
+    os.remove = _wrap_path_fn(os.remove)
+    os.rename = _wrap_path_fn(os.rename)
+    os.stat = _wrap_path_fn(os.stat)
+    socket.getaddrinfo = _offline_getaddrinfo(socket.getaddrinfo)
+    return clock
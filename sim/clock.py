@@ -0,0 +1,100 @@
+"""
+Virtual clock for host simulation.
+
+Replaces the MicroPython time API (ticks_*, sleep*, time, localtime) with a
+clock that only moves when something sleeps, so hours of controller time pass
+in moments. ticks_* wrap at 2**30 exactly like the Pico.
+"""
+import time
+
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALF = TICKS_PERIOD // 2
+
+# 2025-06-01 00:00:00 (local time, as the RTC holds it after NTP sync)
+DEFAULT_EPOCH = 1748736000
+
+class VirtualClock:
+    """Monotonic virtual milliseconds plus an RTC epoch and periodic timers."""
+
+    def __init__(self, epoch=DEFAULT_EPOCH, ticks_start=0):
+        """
+        Args:
+            epoch: time.time() value at virtual ms 0
+            ticks_start: ticks_ms() value at virtual ms 0 (set near 2**30 to exercise wrap)
+        """
+        self.now_ms = 0.0
+        self.epoch = epoch
+        self.ticks_start = ticks_start
+        self.timers = []       # machine.Timer instances with a next deadline
+        self.timer_calls = 0
+
+    # ===== START: Clock movement =====
+    def advance(self, ms):
+        """Move time forward by `ms`, firing any periodic timers that fall due."""
+        if ms <= 0:
+            return
+        target = self.now_ms + ms
+        while self.timers:
+            timer = min(self.timers, key=lambda t: t.deadline)
+            if timer.deadline > target:
+                break
+            self.now_ms = timer.deadline
+            timer._fire()
+            self.timer_calls += 1
+        self.now_ms = target
+    # ===== END: Clock movement =====
+
+    def seconds(self):
+        """Virtual seconds since the simulation started."""
+        return self.now_ms / 1000
+
+    def set_time(self, epoch_now):
+        """Set the RTC so that time.time() returns `epoch_now` right now."""
+        self.epoch = epoch_now - int(self.now_ms // 1000)
+
+    # ===== START: MicroPython time API =====
+    def ticks_ms(self):
+        return (self.ticks_start + int(self.now_ms)) & TICKS_MAX
+
+    def ticks_us(self):
+        return (self.ticks_start * 1000 + int(self.now_ms * 1000)) & TICKS_MAX
+
+    def ticks_add(self, ticks, delta):
+        return (ticks + delta) & TICKS_MAX
+
+    def ticks_diff(self, new, old):
+        return ((new - old + TICKS_HALF) & TICKS_MAX) - TICKS_HALF
+
+    def sleep(self, seconds):
+        self.advance(seconds * 1000)
+
+    def sleep_ms(self, ms):
+        self.advance(ms)
+
+    def sleep_us(self, us):
+        self.advance(us / 1000)
+
+    def time(self):
+        return self.epoch + int(self.now_ms // 1000)
+
+    def localtime(self, secs=None):
+        # The RTC holds local time, so localtime() is gmtime() of the RTC epoch
+        return time.gmtime(self.time() if secs is None else secs)
+    # ===== END: MicroPython time API =====
+
+CLOCK = VirtualClock()
+
+def patch_time(clock=CLOCK):
+    """Install the virtual clock into CPython's time module (MicroPython names only)."""
+    time.ticks_ms = clock.ticks_ms
+    time.ticks_us = clock.ticks_us
+    time.ticks_cpu = clock.ticks_us
+    time.ticks_add = clock.ticks_add
+    time.ticks_diff = clock.ticks_diff
+    time.sleep = clock.sleep
+    time.sleep_ms = clock.sleep_ms
+    time.sleep_us = clock.sleep_us
+    time.time = clock.time
+    time.localtime = clock.localtime
+    return clock
@@ -0,0 +1,113 @@
+"""
+Stand-in for MicroPython's `ds18x20` driver with scripted DS18B20 probes.
+
+A SimProbe's temperature comes from a number, a function of virtual seconds,
+or anything with a temp_c() method (see sim.greenhouse). Conversions take the
+real 94-750 ms for the probe's resolution; reading the scratchpad early
+returns the previous result, as the hardware does.
+"""
+from sim.clock import CLOCK
+from sim.onewire import BUSES, crc8
+
+# Configuration register values for 9..12 bit resolution
+RESOLUTION_CONFIG = {9: 0x1F, 10: 0x3F, 11: 0x5F, 12: 0x7F}
+
+def make_rom(serial):
+    """Build a valid DS18B20 ROM (family 0x28, 48-bit serial, CRC)."""
+    body = bytes([0x28]) + serial.to_bytes(6, 'little')
+    return body + bytes([crc8(body)])
+
+def attach(pin_id, probe):
+    """Wire `probe` to the bus on GPIO `pin_id`. Returns the probe."""
+    BUSES.setdefault(pin_id, []).append(probe)
+    return probe
+
+class SimProbe:
+    """One simulated DS18B20."""
+
+    def __init__(self, rom, source=20.0, present=True):
+        """
+        Args:
+            rom: 8-byte ROM (see make_rom)
+            source: °C as a number, a function of virtual seconds, or an object with temp_c()
+            present: False makes the probe vanish from scans and fail reads
+        """
+        self.rom = bytes(rom)
+        self.source = source
+        self.present = present
+        self.config = RESOLUTION_CONFIG[12]
+        self.th = 0x4B
+        self.tl = 0x46
+        self.latched_raw = 0x0550      # Power-on value: 85 °C
+        self.pending = None            # (ready at virtual ms, raw value)
+        self.conversions = 0
+
+    def resolution(self):
+        return 9 + ((self.config >> 5) & 3)
+
+    def conversion_ms(self):
+        return 750 / (1 << (12 - self.resolution()))
+
+    def temp_c(self):
+        source = self.source
+        if hasattr(source, 'temp_c'):
+            return source.temp_c()
+        if callable(source):
+            return source(CLOCK.seconds())
+        return source
+
+    def convert(self):
+        bits = self.resolution()
+        raw = int(round(self.temp_c() * 16)) & ~((1 << (12 - bits)) - 1)
+        self.pending = (CLOCK.now_ms + self.conversion_ms(), raw)
+        self.conversions += 1
+
+    def scratchpad(self):
+        if self.pending and CLOCK.now_ms >= self.pending[0]:
+            self.latched_raw = self.pending[1]
+            self.pending = None
+        raw = self.latched_raw & 0xFFFF
+        body = bytes([raw & 0xFF, raw >> 8, self.th, self.tl, self.config, 0xFF, 0x0C, 0x10])
+        return bytearray(body + bytes([crc8(body)]))
+
+class DS18X20:
+    def __init__(self, onewire):
+        self.ow = onewire
+        self.buf = bytearray(9)
+
+    def _probe(self, rom):
+        rom = bytes(rom)
+        for probe in BUSES.get(self.ow.pin.id, []):
+            if probe.rom == rom and probe.present:
+                return probe
+        return None
+
+    def scan(self):
+        return [rom for rom in self.ow.scan() if rom[0] in (0x10, 0x22, 0x28)]
+
+    def convert_temp(self):
+        """Skip ROM + Convert T: every probe on the bus starts at once."""
+        self.ow.reset(True)
+        for probe in self.ow.probes:
+            if probe.present:
+                probe.convert()
+
+    def read_scratch(self, rom):
+        self.ow.reset(True)
+        probe = self._probe(rom)
+        if probe is None:
+            raise Exception('CRC error')  # Missing device reads back all ones
+        return probe.scratchpad()
+
+    def write_scratch(self, rom, buf):
+        self.ow.reset(True)
+        probe = self._probe(rom)
+        if probe is not None:
+            probe.th, probe.tl, probe.config = buf[0], buf[1], buf[2]
+
+    def read_temp(self, rom):
+        buf = self.read_scratch(rom)
+        t = buf[1] << 8 | buf[0]
+        if t & 0x8000:  # sign bit set
+            t = -((t ^ 0xFFFF) + 1)
+        return t / 16
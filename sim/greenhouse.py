@@ -0,0 +1,86 @@
+"""
+Lumped thermal model of the greenhouse for closed-loop simulation.
+
+Inside air relaxes toward the outside temperature, gains heat from the sun
+and the heater relay, and loses it to the AC relay. Outside follows a daily
+sine. Good enough to make relays cycle realistically; not a physics model.
+"""
+import math
+
+from sim.clock import CLOCK
+import sim.machine as machine
+
+STEP_S = 10  # Integration step (virtual seconds)
+
+class Greenhouse:
+    def __init__(self, inside_c=22.0, outside_mean_c=18.0, outside_swing_c=8.0,
+                 tau_h=2.0, ac_c_per_h=4.0, heat_c_per_h=6.0, solar_c_per_h=3.0,
+                 ac_pin=15, heater_pin=16, lag_s=0, trace=False):
+        """
+        Args:
+            inside_c: Starting inside temperature
+            outside_mean_c / outside_swing_c: Daily outside mean and amplitude (peak at 15:00)
+            tau_h: Hours for the inside to close 63% of the gap to outside
+            ac_c_per_h / heat_c_per_h: Relay cooling / heating rate at full power
+            solar_c_per_h: Solar gain at noon
+            ac_pin / heater_pin: GPIOs whose sim Pins drive the relays
+            lag_s: Time constant of relay effect (coil / duct lag); 0 = instant
+            trace: Record (virtual ms, inside °C) every step in self.samples
+        """
+        self.inside = inside_c
+        self.outside_mean_c = outside_mean_c
+        self.outside_swing_c = outside_swing_c
+        self.tau_s = tau_h * 3600
+        self.ac_rate = ac_c_per_h / 3600
+        self.heat_rate = heat_c_per_h / 3600
+        self.solar_rate = solar_c_per_h / 3600
+        self.ac_pin = ac_pin
+        self.heater_pin = heater_pin
+        self.updated_ms = CLOCK.now_ms
+        self.low = self.high = inside_c
+        self.lag_s = lag_s
+        self.ac_power = 0.0       # Effective AC / heater output (0..1), lags the relay
+        self.heat_power = 0.0
+        self.samples = [] if trace else None
+
+    def _hour(self):
+        return (CLOCK.time() % 86400) / 3600
+
+    def outside_c(self, t=None):
+        return self.outside_mean_c + self.outside_swing_c * math.sin(2 * math.pi * (self._hour() - 9) / 24)
+
+    def _relay(self, pin_id):
+        pin = machine.PINS.get(pin_id)
+        return pin.value() if pin else 0
+
+    def _step(self, dt):
+        hour = self._hour()
+        solar = math.sin(math.pi * (hour - 6) / 12) if 6 <= hour < 18 else 0
+        rate = (self.outside_c() - self.inside) / self.tau_s
+        rate += solar * self.solar_rate
+        if self.lag_s:
+            k = min(1.0, dt / self.lag_s)
+            self.ac_power += (self._relay(self.ac_pin) - self.ac_power) * k
+            self.heat_power += (self._relay(self.heater_pin) - self.heat_power) * k
+        else:
+            self.ac_power = self._relay(self.ac_pin)
+            self.heat_power = self._relay(self.heater_pin)
+        rate += self.heat_power * self.heat_rate
+        rate -= self.ac_power * self.ac_rate
+        self.inside += rate * dt
+
+    def inside_c(self, t=None):
+        """Integrate up to now and return the inside temperature (°C)."""
+        elapsed = (CLOCK.now_ms - self.updated_ms) / 1000
+        while elapsed > 0:
+            dt = STEP_S if elapsed > STEP_S else elapsed
+            self._step(dt)
+            elapsed -= dt
+            if self.samples is not None:
+                self.samples.append((CLOCK.now_ms - elapsed * 1000, self.inside))
+        self.updated_ms = CLOCK.now_ms
+        if self.inside < self.low:
+            self.low = self.inside
+        if self.inside > self.high:
+            self.high = self.inside
+        return self.inside
@@ -0,0 +1,60 @@
+"""
+asyncio event loop on the virtual clock.
+
+loop.time() reads the virtual clock, and when the loop would block in
+select() for N seconds it polls real sockets once and then advances the
+clock by N instead of waiting. Real sockets (the web server) still work.
+"""
+import asyncio
+import selectors
+
+from sim.clock import CLOCK
+
+class SimulationComplete(KeyboardInterrupt):
+    """Raised out of the event loop at the end of the run; main.py's Ctrl+C path shuts down."""
+
+class _VirtualSelector(selectors.DefaultSelector):
+    def __init__(self, clock, end_ms):
+        super().__init__()
+        self.clock = clock
+        self.end_ms = end_ms
+        self.finished = False
+        self.polls = 0
+
+    def select(self, timeout=None):
+        self.polls += 1
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if not self.finished and self.end_ms is not None and self.clock.now_ms >= self.end_ms:
+            self.finished = True
+            raise SimulationComplete()
+        if timeout is None:
+            timeout = 1.0  # Nothing scheduled: let time pass rather than hang
+        if self.end_ms is not None and not self.finished:
+            timeout = min(timeout, max(0, (self.end_ms - self.clock.now_ms) / 1000))
+        self.clock.advance(timeout * 1000)
+        return events
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock=CLOCK, end_ms=None):
+        self.clock = clock
+        self.sim_selector = _VirtualSelector(clock, end_ms)  # Kept after close() for stats
+        super().__init__(self.sim_selector)
+
+    def time(self):
+        return self.clock.now_ms / 1000
+
+class VirtualLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """Makes asyncio.run() (and so Runtime.run()) use a VirtualEventLoop."""
+
+    def __init__(self, clock=CLOCK, end_ms=None):
+        super().__init__()
+        self.clock = clock
+        self.end_ms = end_ms
+        self.loops = []
+
+    def new_event_loop(self):
+        loop = VirtualEventLoop(self.clock, self.end_ms)
+        self.loops.append(loop)
+        return loop
@@ -0,0 +1,122 @@
+"""Stand-in for MicroPython's `machine` module (Pin, RTC, Timer, lightsleep)."""
+from sim.clock import CLOCK
+
+# Every Pin ever created, by id (relay and LED pins record their transitions)
+PINS = {}
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __new__(cls, id, mode=-1, pull=-1, value=None):
+        # Like the firmware, Pin(n) twice refers to the same physical pin
+        pin = PINS.get(id)
+        if pin is None:
+            pin = super().__new__(cls)
+            pin.id = id
+            pin._value = 0
+            pin.transitions = []   # [(virtual ms, value)] for every change
+            PINS[id] = pin
+        return pin
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if value is not None:
+            self.value(value)
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        v = 1 if v else 0
+        if v != self._value:
+            self._value = v
+            self.transitions.append((CLOCK.now_ms, v))
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+    def toggle(self):
+        self.value(not self._value)
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on_ms(self, until_ms=None):
+        """Total virtual ms this pin has been high (up to `until_ms`, default now)."""
+        until_ms = CLOCK.now_ms if until_ms is None else until_ms
+        total, since = 0, None
+        for t, v in self.transitions:
+            if v and since is None:
+                since = t
+            elif not v and since is not None:
+                total += t - since
+                since = None
+        if since is not None:
+            total += until_ms - since
+        return total
+
+class RTC:
+    def datetime(self, dt=None):
+        """Get or set (year, month, day, weekday, hours, minutes, seconds, subseconds)."""
+        if dt is None:
+            t = CLOCK.localtime()
+            return (t[0], t[1], t[2], t[6] + 1, t[3], t[4], t[5], 0)
+        import calendar
+        CLOCK.set_time(calendar.timegm((dt[0], dt[1], dt[2], dt[4], dt[5], dt[6], 0, 0, 0)))
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, mode=PERIODIC, period=-1, freq=-1, callback=None):
+        self._callback = None
+        if callback is not None:
+            self.init(mode=mode, period=period, freq=freq, callback=callback)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, callback=None):
+        self.deinit()
+        if freq > 0:
+            period = 1000 / freq
+        self.mode = mode
+        self.period = period
+        self._callback = callback
+        self.deadline = CLOCK.now_ms + period
+        CLOCK.timers.append(self)
+
+    def deinit(self):
+        if self in CLOCK.timers:
+            CLOCK.timers.remove(self)
+
+    def _fire(self):
+        if self.mode == Timer.PERIODIC:
+            self.deadline += self.period
+        else:
+            self.deinit()
+        self._callback(self)
+
+def lightsleep(ms=None):
+    CLOCK.advance(ms or 0)
+
+deepsleep = lightsleep
+
+def idle():
+    pass
+
+def freq(hz=None):
+    return 125000000
+
+def unique_id():
+    return b'\xe6\x61\x41\x04\x03\x15\x2a\x2c'
+
+def reset():
+    raise SystemExit("machine.reset()")
@@ -0,0 +1,89 @@
+"""Stand-in for MicroPython's `network` module (station interface only)."""
+from sim.clock import CLOCK
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_GOT_IP = 3
+STAT_NO_AP_FOUND = -2
+
+# Virtual ms a join takes
+CONNECT_DELAY_MS = 2000
+# Access point outages as (start_s, end_s) in virtual seconds
+OUTAGES = []
+
+def schedule_outage(start_s, duration_s):
+    """Take the access point away for `duration_s` seconds starting at `start_s`."""
+    OUTAGES.append((start_s, start_s + duration_s))
+
+def _ap_down():
+    now = CLOCK.seconds()
+    for start, end in OUTAGES:
+        if start <= now < end:
+            return True
+    return False
+
+class _Interface:
+    """Radio state shared by every WLAN(STA_IF) object, as on the Pico."""
+    def __init__(self):
+        self.active = False
+        self.ssid = None
+        self.joined_at = None       # Virtual ms the join completes, None if not joining
+        self.ifconfig = ('0.0.0.0', '0.0.0.0', '0.0.0.0', '0.0.0.0')
+        self.connects = 0
+
+_IFACES = {}
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        self._if = _IFACES.setdefault(interface, _Interface())
+
+    def active(self, state=None):
+        if state is None:
+            return self._if.active
+        self._if.active = bool(state)
+        if not state:
+            self._if.joined_at = None
+
+    def deinit(self):
+        self.active(False)
+
+    def connect(self, ssid=None, key=None):
+        if not self._if.active:
+            raise OSError("WLAN not active")
+        self._if.ssid = ssid
+        self._if.joined_at = CLOCK.now_ms + CONNECT_DELAY_MS
+        self._if.connects += 1
+
+    def disconnect(self):
+        self._if.joined_at = None
+
+    def isconnected(self):
+        iface = self._if
+        if iface.joined_at is None or not iface.active:
+            return False
+        if _ap_down():
+            iface.joined_at = None  # Link dropped; a new connect() is needed
+            return False
+        return CLOCK.now_ms >= iface.joined_at
+
+    def status(self, param=None):
+        if param == 'rssi':
+            return -55
+        if self.isconnected():
+            return STAT_GOT_IP
+        if self._if.joined_at is not None:
+            return STAT_CONNECTING
+        return STAT_NO_AP_FOUND if _ap_down() else STAT_IDLE
+
+    def ifconfig(self, config=None):
+        if config is None:
+            return self._if.ifconfig
+        self._if.ifconfig = tuple(config)
+
+    def config(self, *args, **kwargs):
+        if args == ('mac',):
+            return b'\x28\xcd\xc1\x00\x00\x01'
+        return None
@@ -0,0 +1,46 @@
+"""Stand-in for MicroPython's `onewire` module, backed by simulated buses."""
+from sim.clock import CLOCK
+
+# Probes wired to each GPIO: {pin id: [SimProbe, ...]}
+BUSES = {}
+
+# Virtual time one search pass takes (reset + 64 bits x 3 slots, bit-banged)
+SEARCH_MS_PER_DEVICE = 15
+
+class OneWireError(Exception):
+    pass
+
+def crc8(data):
+    """Dallas/Maxim CRC-8 (same result as the firmware's OneWire.crc8)."""
+    crc = 0
+    for byte in data:
+        for _ in range(8):
+            mix = (crc ^ byte) & 1
+            crc >>= 1
+            if mix:
+                crc ^= 0x8C
+            byte >>= 1
+    return crc
+
+class OneWire:
+    def __init__(self, pin):
+        self.pin = pin
+        self.resets = 0
+
+    @property
+    def probes(self):
+        return BUSES.get(self.pin.id, [])
+
+    def reset(self, required=False):
+        self.resets += 1
+        present = any(p.present for p in self.probes)
+        if required and not present:
+            raise OneWireError()
+        return present
+
+    def scan(self):
+        found = [bytearray(p.rom) for p in self.probes if p.present]
+        CLOCK.sleep_ms(SEARCH_MS_PER_DEVICE * (len(found) + 1))  # One pass per device plus the final empty one
+        return found
+
+    crc8 = staticmethod(crc8)
@@ -0,0 +1,133 @@
+"""
+Run main.py against simulated hardware on a virtual clock.
+
+    python -m sim.run                      # 24 virtual hours, summary only
+    python -m sim.run --hours 2 --verbose  # Stream the controller's console
+    python -m sim.run --outage 3600:600    # Drop WiFi for 10 min after 1 h
+
+The controller's console goes to console.log in the work directory (a fresh
+temp dir unless --workdir is given), alongside config.json and temp_logs.csv.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import runpy
+import sys
+import tempfile
+import time
+
+import sim
+from sim.clock import CLOCK
+from sim.loop import VirtualLoopPolicy
+
+def sim_config(path=None, web_port=0):
+    """config.json for the run: the example config with Discord disabled."""
+    with open(path or os.path.join(sim.REPO_ROOT, 'config.json.Example')) as f:
+        config = json.load(f)
+    config['ssid'] = 'sim-ap'
+    config['password'] = 'sim-password'
+    config['discord_webhook_url'] = None
+    config['discord_alert_webhook_url'] = None
+    config['web_port'] = web_port  # 0 = any free port
+    return config
+
+def build_world(plant=None):
+    """
+    Default plant: greenhouse model, inside probe on GPIO 10, outside probe on GPIO 11.
+    plant: Optional Greenhouse keyword overrides (e.g. {'lag_s': 300})
+    """
+    from sim.ds18x20 import SimProbe, attach, make_rom
+    from sim.greenhouse import Greenhouse
+    greenhouse = Greenhouse(**(plant or {}))
+    attach(10, SimProbe(make_rom(0x0A01), greenhouse.inside_c))
+    attach(11, SimProbe(make_rom(0x0B01), greenhouse.outside_c))
+    return greenhouse
+
+def c_to_f(c):
+    return c * 9 / 5 + 32
+
+def run(hours=24, workdir=None, config=None, ticks_start=0, outages=(), verbose=False, web_port=0, plant=None):
+    """
+    Boot main.py and run it for `hours` of virtual time.
+    Returns a dict of results (main.py's globals under 'main').
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix='auto-garden-sim-')
+    CLOCK.ticks_start = ticks_start
+    sim.install(workdir)
+    import sim.machine as machine
+    import sim.network as network
+
+    with open(os.path.join(workdir, 'config.json'), 'w') as f:
+        json.dump(sim_config(config, web_port), f)
+    for start_s, duration_s in outages:
+        network.schedule_outage(start_s, duration_s)
+    greenhouse = build_world(plant)
+
+    policy = VirtualLoopPolicy(CLOCK, end_ms=hours * 3600 * 1000)
+    asyncio.set_event_loop_policy(policy)
+
+    started = time.perf_counter()
+    with open(os.path.join(workdir, 'console.log'), 'w') as log:
+        out = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(log)
+        with out:
+            main_globals = runpy.run_path(os.path.join(sim.REPO_ROOT, 'main.py'), run_name='__main__')
+    elapsed = time.perf_counter() - started
+
+    def relay(pin_id):
+        pin = machine.PINS.get(pin_id)
+        if pin is None:
+            return 0, 0
+        return sum(1 for _, v in pin.transitions if v), pin.on_ms() / 3600000
+
+    runtime = main_globals.get('runtime')
+    return {
+        'workdir': workdir,
+        'virtual_h': CLOCK.now_ms / 3600000,
+        'real_s': elapsed,
+        'loop_polls': sum(loop.sim_selector.polls for loop in policy.loops),
+        'wakeups': runtime.wakeups if runtime else 0,
+        'timer_calls': CLOCK.timer_calls,
+        'ac': relay(15),
+        'heater': relay(16),
+        'inside_f': (c_to_f(greenhouse.low), c_to_f(greenhouse.high)),
+        'greenhouse': greenhouse,
+        'main': main_globals,
+    }
+
+def print_summary(r):
+    print("=" * 50)
+    print("Simulation complete")
+    print("=" * 50)
+    print("Virtual time:   {:.2f} h in {:.2f} s real ({:.0f}x)".format(
+        r['virtual_h'], r['real_s'], r['virtual_h'] * 3600 / max(r['real_s'], 1e-9)))
+    print("Event loop:     {} polls, {} runtime wakeups, {} timer callbacks".format(
+        r['loop_polls'], r['wakeups'], r['timer_calls']))
+    print("AC relay:       {} starts, {:.2f} h on".format(*r['ac']))
+    print("Heater relay:   {} starts, {:.2f} h on".format(*r['heater']))
+    print("Inside temp:    {:.1f}°F .. {:.1f}°F".format(*r['inside_f']))
+    print("Work dir:       {}".format(r['workdir']))
+    print("=" * 50)
+
+def _outage(text):
+    start, duration = text.split(':')
+    return float(start), float(duration)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hours', type=float, default=24, help='virtual hours to run (default 24)')
+    parser.add_argument('--workdir', help='flash directory (default: new temp dir)')
+    parser.add_argument('--config', help='config.json to start from (default: config.json.Example)')
+    parser.add_argument('--ticks-start', type=int, default=0, help='initial ticks_ms (try 1073000000 to cross the wrap)')
+    parser.add_argument('--outage', type=_outage, action='append', default=[], metavar='START:SECONDS',
+                        help='drop the access point at START virtual seconds for SECONDS')
+    parser.add_argument('--web-port', type=int, default=0, help='web server port (default: any free port)')
+    parser.add_argument('--verbose', action='store_true', help='stream the controller console')
+    args = parser.parse_args(argv)
+    result = run(hours=args.hours, workdir=args.workdir, config=args.config, ticks_start=args.ticks_start,
+                 outages=args.outage, verbose=args.verbose, web_port=args.web_port)
+    print_summary(result)
+
+if __name__ == '__main__':
+    sys.exit(main())
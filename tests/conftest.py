@@ -0,0 +1,15 @@
+"""
+Host tests for the pure-logic firmware modules.
+
+The sim backend is installed before anything under scripts/ is imported, so
+the modules see the MicroPython time API (virtual clock, ticks wrap at 2**30)
+and the `scripts` package alias, exactly as in a sim run.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sim  # noqa: E402
+
+sim.install()
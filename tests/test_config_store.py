@@ -0,0 +1,100 @@
+import json
+
+from sim.clock import CLOCK
+from scripts.config_store import ConfigStore, FLUSH_DELAY_MS, FLUSH_MAX_DELAY_MS
+
+def make_store(tmp_path, data=None):
+    path = str(tmp_path / 'config.json')
+    with open(path, 'w') as f:
+        json.dump(data or {'ac_target': 75.0, 'schedules': []}, f)
+    store = ConfigStore(path=path)
+    assert store.load()
+    return store
+
+def on_flash(store):
+    with open(store.path) as f:
+        return json.load(f)
+
+def test_set_versions_and_subscribers(tmp_path):
+    store = make_store(tmp_path)
+    seen = []
+    store.subscribe(lambda s, key: seen.append(key), ('ac_target',))
+    version = store.version
+    assert store.set('ac_target', 76.0)
+    assert not store.set('ac_target', 76.0)      # Equal value: no change
+    store['heater_target'] = 70.0                # Not subscribed
+    schedules = store['schedules']
+    schedules.append({'time': '06:00'})
+    assert store.set('schedules', schedules)     # Same object: edited in place
+    assert seen == ['ac_target']
+    assert store.version == version + 3
+    assert store.update({'ac_target': 76.0, 'ac_swing': 1.0}) == ['ac_swing']
+
+def test_typed_accessors(tmp_path):
+    store = make_store(tmp_path, {'a': '2.5', 'b': '7', 'c': 'true', 'd': None, 'e': 'x'})
+    assert store.get_float('a') == 2.5
+    assert store.get_int('b') == 7
+    assert store.get_int('e', 3) == 3
+    assert store.get_bool('c') and not store.get_bool('missing')
+    assert store.get_str('d', '-') == '-'
+
+def test_flush_waits_for_changes_to_settle(tmp_path):
+    store = make_store(tmp_path)
+    store['ac_target'] = 80.0
+    CLOCK.advance(FLUSH_DELAY_MS - 2000)
+    store['heater_target'] = 60.0
+    CLOCK.advance(FLUSH_DELAY_MS - 2000)
+    assert not store.flush()                     # Still inside the window of the last change
+    CLOCK.advance(2000)
+    assert store.flush()
+    assert store.writes == 1
+    assert on_flash(store)['heater_target'] == 60.0
+    assert not store.flush(force=True)           # Nothing left to write
+
+def test_flush_max_delay_under_constant_changes(tmp_path):
+    store = make_store(tmp_path)
+    waited = 0
+    while not store.flush():
+        store['ac_swing'] = waited
+        CLOCK.advance(1000)
+        waited += 1000
+    assert FLUSH_MAX_DELAY_MS <= waited <= FLUSH_MAX_DELAY_MS + 1000
+
+def test_hold_state_stays_in_ram(tmp_path):
+    store = make_store(tmp_path)
+    store['schedule_enabled'] = False
+    store['temp_hold_start_time'] = 123
+    assert store.dirty_since is None
+    store['ac_target'] = 70.0
+    assert store.flush(force=True)
+    saved = on_flash(store)
+    assert 'schedule_enabled' not in saved and 'temp_hold_start_time' not in saved
+    assert store['schedule_enabled'] is False
+
+def test_failed_write_stays_dirty(tmp_path):
+    store = make_store(tmp_path)
+    store.path = str(tmp_path / 'missing' / 'config.json')
+    store['ac_target'] = 70.0
+    assert not store.flush(force=True)
+    assert store.dirty_since is not None and store.writes == 0
+
+def test_write_replaces_file_without_removing_it(tmp_path, monkeypatch):
+    """rename() replaces config.json in one step: there is never a moment with no file."""
+    import os
+    store = make_store(tmp_path)
+    monkeypatch.setattr(os, 'remove', lambda path: (_ for _ in ()).throw(AssertionError("remove() called")))
+    store['ac_target'] = 71.0
+    assert store.flush(force=True)
+    assert on_flash(store)['ac_target'] == 71.0
+    assert not os.path.exists(store.path + '.tmp')
+
+def test_load_falls_back_to_tmp(tmp_path):
+    """A FAT write cut between remove() and rename() leaves only config.json.tmp."""
+    import os
+    store = make_store(tmp_path)
+    store['ac_target'] = 72.0
+    store.flush(force=True)
+    os.rename(store.path, store.path + '.tmp')
+    again = ConfigStore(path=store.path)
+    assert again.load() and again['ac_target'] == 72.0
+    assert not ConfigStore(path=str(tmp_path / 'none.json')).load()
@@ -0,0 +1,44 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import scripts.discord_webhook as discord_webhook
+from scripts.runtime import Runtime
+from sim.clock import CLOCK
+from test_runtime import run_for
+
+class _Webhook(BaseHTTPRequestHandler):
+    bodies = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.bodies.append(body)
+        self.send_response(500 if b'fail' in body else 204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def test_split_url():
+    assert discord_webhook._split_url(' "https://discord.com/api/webhooks/1/x" ') == ('discord.com', 443, '/api/webhooks/1/x', True)
+    assert discord_webhook._split_url('http://127.0.0.1:8080/hook') == ('127.0.0.1', 8080, '/hook', False)
+
+def test_outbox_posts_in_background_and_retries():
+    server = HTTPServer(('127.0.0.1', 0), _Webhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        discord_webhook.set_config({'discord_webhook_url': 'http://127.0.0.1:{}/api/webhooks/1/x'.format(server.server_port)})
+        for message in ('one', 'fail', 'two "quoted"'):
+            discord_webhook.queue_discord_message(message)
+        runtime = Runtime()
+        ticks = []
+        runtime.every("Discord", 1, discord_webhook.send_pending)
+        runtime.every("Climate", 0.1, lambda: ticks.append(CLOCK.now_ms))
+        run_for(runtime, 30000)
+    finally:
+        server.shutdown()
+        discord_webhook.set_config(None)
+    assert discord_webhook._OUTBOX == []
+    assert len(_Webhook.bodies) == 5   # 'fail' tried _MAX_ATTEMPTS times, then dropped
+    assert _Webhook.bodies[-1] == b'{"content":"two \\"quoted\\"","username":"Auto Garden Bot"}'
+    # The control job kept its cadence while posts were in flight
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) <= 100
@@ -0,0 +1,45 @@
+from scripts.filters import SensorFilter, SlopeEstimator
+
+def test_median_drops_single_spike():
+    f = SensorFilter(window=5, alpha_pct=100)
+    for v in (7000, 7010, 7020, 7030, 7040):
+        f.push(v)
+    assert f.push(18500) == 7030    # 85 °C power-on value never gets through
+    assert f.raw == 18500
+
+def test_ema_converges_on_step():
+    f = SensorFilter(window=3, alpha_pct=25)
+    assert f.push(7000) == 7000
+    values = [f.push(8000) for _ in range(30)]
+    assert all(a <= b for a, b in zip(values, values[1:]))
+    assert values[-1] >= 7999      # Integer EMA settles within 1 centi-°F
+
+def test_reset_restarts_window():
+    f = SensorFilter(window=3)
+    f.push(7000)
+    f.reset()
+    assert f.push(5000) == 5000
+
+def least_squares(ys):
+    n = len(ys)
+    mx = (n - 1) / 2
+    my = sum(ys) / n
+    return sum((x - mx) * (y - my) for x, y in enumerate(ys)) / sum((x - mx) ** 2 for x in range(n))
+
+def test_slope_matches_least_squares_while_sliding():
+    est = SlopeEstimator(6)
+    samples = [7000, 7003, 7001, 7010, 7015, 7012, 7020, 7031, 7025, 6990, 6980, 6985]
+    for i, y in enumerate(samples):
+        est.push(y)
+        if i < 5:
+            assert est.slope() is None and not est.ready()
+            continue
+        want = least_squares(samples[i - 5:i + 1])
+        assert abs(est.slope(1000) - want * 1000) <= 1
+
+def test_slope_reset():
+    est = SlopeEstimator(3)
+    for y in (1, 2, 3):
+        est.push(y)
+    est.reset()
+    assert est.slope() is None
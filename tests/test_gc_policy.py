@@ -0,0 +1,31 @@
+import scripts.gc_policy as gc_policy
+from sim.clock import CLOCK, TICKS_MAX
+
+def _fresh_stats(monkeypatch):
+    monkeypatch.setattr(gc_policy, '_STATS', {'count': 0, 'forced': 0, 'total_us': 0,
+                                              'worst_us': 0, 'skipped': 0, 'auto': 0})
+
+def test_pause_spans_ticks_us_wrap(monkeypatch):
+    _fresh_stats(monkeypatch)
+    monkeypatch.setattr(CLOCK, 'ticks_start', 0)
+    us_left = TICKS_MAX + 1 - CLOCK.ticks_us()
+    monkeypatch.setattr(CLOCK, 'ticks_start', us_left // 1000)  # ticks_us() now <1 ms before the wrap
+    monkeypatch.setattr(gc_policy.gc, 'collect', lambda: CLOCK.advance(3))
+    assert gc_policy.collect() == 3000
+    assert gc_policy.stats()['worst_us'] == 3000
+
+def test_threshold_collections_counted_as_auto(monkeypatch):
+    _fresh_stats(monkeypatch)
+    heap = {'alloc': 30000}
+    monkeypatch.setattr(gc_policy, '_mem_alloc', lambda: heap['alloc'])
+    monkeypatch.setattr(gc_policy, '_mem_free', lambda: 150000)
+    monkeypatch.setattr(gc_policy, '_last_alloc', 20000)
+    monkeypatch.setattr(gc_policy, '_last_check_ms', 0)
+    monkeypatch.setattr(gc_policy, '_rate', 0)
+    assert not gc_policy.maybe_collect()
+    heap['alloc'] = 12000  # gc.threshold() collected since the last check
+    CLOCK.advance(5000)
+    assert not gc_policy.maybe_collect()
+    result = gc_policy.stats()
+    assert result['auto'] == 1
+    assert result['count'] == 0 and result['total_us'] == 0
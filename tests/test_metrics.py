@@ -0,0 +1,21 @@
+import scripts.metrics as metrics
+
+def test_histogram_buckets_and_render():
+    m = metrics.task("test-histogram")
+    for us in (50, 100, 101, 3000, 10 ** 7):
+        m.observe(us)
+    m.drift(-5)
+    m.drift(12)
+    assert m.runs == 5 and m.max_us == 10 ** 7
+    assert m.drift_ms == 12 and m.drift_total_ms == 12
+    assert metrics.task("test-histogram") is m
+    metrics.gauge("test_gauge", lambda: 42)
+    metrics.gauge("test_broken", lambda: 1 // 0)
+    text = metrics.render()
+    label = 'task="test-histogram"'
+    assert "test_gauge 42" in text
+    assert "# test_broken error" in text
+    assert 'task_latency_us_bucket{{{},le="100"}} 2'.format(label) in text
+    assert 'task_latency_us_bucket{{{},le="250"}} 3'.format(label) in text
+    assert 'task_latency_us_bucket{{{},le="+Inf"}} 5'.format(label) in text
+    assert "task_latency_us_count{{{}}} 5".format(label) in text
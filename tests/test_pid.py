@@ -0,0 +1,31 @@
+from scripts.pid import TimeProportionalPID, DUTY_MAX
+
+def test_proportional_duty():
+    pid = TimeProportionalPID(kp=30.0, ki=0.0, kd=0.0)
+    assert pid.update(7000, 6900, now=0) == 3000   # 1 °F low x 30 %/°F
+    assert pid.update(7000, 7100, now=1000) == 0    # Above target: off
+    assert pid.update(7000, 3000, now=2000) == DUTY_MAX
+
+def test_integral_accumulates_and_clamps():
+    pid = TimeProportionalPID(kp=0.0, ki=1.0, kd=0.0)
+    pid.update(7000, 6900, now=0)
+    duty = pid.update(7000, 6900, now=60000)   # 1 °F low for a minute = 1 %
+    assert duty == 100
+    for minute in range(2, 400):
+        duty = pid.update(7000, 5000, now=minute * 60000)
+    assert duty == DUTY_MAX
+    # Anti-windup: the integral comes back as soon as the error flips
+    duty = pid.update(7000, 7200, now=400 * 60000)
+    assert duty < DUTY_MAX
+
+def test_window_respects_min_on_and_min_off():
+    pid = TimeProportionalPID(kp=10.0, ki=0.0, kd=0.0, window=600, min_on=120, min_off=120)
+    pid.update(7000, 6990, now=0)            # 1 % duty = 6 s on: below min_on
+    assert not pid.output(now=0)
+    pid.update(7000, 6100, now=600000)       # 90 % duty = 60 s off: below min_off
+    assert pid.output(now=600000)
+    assert pid.output(now=600000 + 599000)   # Full window on
+    pid.update(7000, 6500, now=1200000)      # 50 %
+    assert pid.output(now=1200000)           # New window
+    assert pid.output(now=1200000 + 299000)
+    assert not pid.output(now=1200000 + 301000)
@@ -0,0 +1,35 @@
+import json
+import os
+
+import scripts.relay_stats as relay_stats
+from scripts.relay_stats import RelayStats
+from sim.clock import CLOCK
+
+class _Relay:
+    def __init__(self):
+        self.stats = RelayStats()
+
+def test_flush_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'relay_stats.json')
+    relays = {'ac': _Relay(), 'heater': _Relay()}
+    start = CLOCK.ticks_ms()
+    relays['ac'].stats.started(start)
+    relays['ac'].stats.stopped(start + 90000)
+    relays['heater'].stats.blocked(True)
+    assert relay_stats.flush(path, relays)
+    assert not relay_stats.flush(path, relays)  # Nothing changed since
+    assert not os.path.exists(path + '.tmp')
+    restored = {'ac': _Relay(), 'heater': _Relay()}
+    assert relay_stats.load(path, restored)
+    assert restored['ac'].stats.on_ms == 90000 and restored['ac'].stats.cycles == 1
+    assert restored['heater'].stats.blocked_on == 1
+
+def test_cut_short_write_keeps_last_totals(tmp_path):
+    path = str(tmp_path / 'relay_stats.json')
+    with open(path, 'w') as f:
+        json.dump({'ac': {'on_s': 3600, 'cycles': 7}}, f)
+    with open(path + '.tmp', 'w') as f:
+        f.write('{"ac": {"on_s": 36')  # Power cut before the rename
+    relays = {'ac': _Relay()}
+    assert relay_stats.load(path, relays)
+    assert relays['ac'].stats.cycles == 7
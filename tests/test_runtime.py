@@ -0,0 +1,104 @@
+from sim.clock import CLOCK
+from sim.loop import VirtualEventLoop, SimulationComplete
+from scripts.runtime import Runtime, TimerQueue, _REBASE_MS
+
+class _Job:
+    def __init__(self, name):
+        self.name = name
+
+def run_for(runtime, ms):
+    """Drive the dispatcher on a virtual-clock loop for `ms` virtual milliseconds."""
+    loop = VirtualEventLoop(CLOCK, end_ms=CLOCK.now_ms + ms)
+    try:
+        loop.run_until_complete(runtime._dispatch())
+    except SimulationComplete:
+        pass
+    finally:
+        loop.close()
+
+# ===== START: TimerQueue =====
+def test_pop_due_in_deadline_order_ties_keep_push_order():
+    q = TimerQueue()
+    a, b, c = _Job('a'), _Job('b'), _Job('c')
+    q.push(20, a)
+    q.push(10, b)
+    q.push(20, c)
+    assert q.pop_due(5) is None
+    assert q.idle_ms(5) == 5
+    assert q.pop_due(30) == (10, b)
+    assert q.pop_due(30) == (20, a)
+    assert q.pop_due(30) == (20, c)
+    assert q.idle_ms(30) is None
+
+def test_move_changes_deadline():
+    q = TimerQueue()
+    a, b = _Job('a'), _Job('b')
+    q.push(100, a)
+    q.push(50, b)
+    assert q.move(a, 10)
+    assert q.pop_due(10) == (10, a)
+    assert not q.move(a, 0)  # No longer queued
+
+def test_rebase_shifts_every_deadline():
+    q = TimerQueue()
+    a, b = _Job('a'), _Job('b')
+    q.push(_REBASE_MS + 5, a)
+    q.push(_REBASE_MS + 1, b)
+    q.rebase(_REBASE_MS)
+    assert q.idle_ms(0) == 1
+    assert q.pop_due(5) == (1, b)
+    assert q.pop_due(5) == (5, a)
+# ===== END: TimerQueue =====
+
+# ===== START: Runtime =====
+def test_slow_job_keeps_running_across_rebase():
+    """A job that is running when the clock crosses _REBASE_MS must be re-queued on the new base."""
+    runtime = Runtime()
+    runtime._now = _REBASE_MS - 20
+    runs = {'slow': 0, 'fast': 0}
+
+    def slow():
+        runs['slow'] += 1
+        CLOCK.advance(50)  # Runs past the rebase point
+
+    def fast():
+        runs['fast'] += 1
+
+    runtime.every("slow", 1, slow)
+    runtime.every("fast", 1, fast)
+    run_for(runtime, 10500)
+    assert runtime._now < _REBASE_MS
+    assert runs['fast'] >= 10
+    assert runs['slow'] >= 10
+
+def test_cadence_and_next_delay():
+    class Sleepy:
+        interval = 1
+        last_check_ms = 0
+
+        def __init__(self):
+            self.runs = 0
+
+        def run(self):
+            self.runs += 1
+
+        def next_delay_ms(self):
+            return 5000
+
+    runtime = Runtime()
+    sleepy = Sleepy()
+    runs = []
+    runtime.add(sleepy)
+    runtime.every("tick", 0.5, lambda: runs.append(runtime.now()))
+    run_for(runtime, 10250)
+    assert len(runs) == 21
+    assert sleepy.runs == 3  # 0 s, 5 s, 10 s
+
+def test_wake_runs_job_at_next_wakeup():
+    runtime = Runtime()
+    runs = []
+    job = runtime.every("hourly", 3600, lambda: runs.append(runtime.now()))
+    runtime.every("tick", 1, lambda: runtime.wake(job) if len(runs) == 1 and runtime.now() >= 2000 else None)
+    run_for(runtime, 5000)
+    assert len(runs) == 2
+# ===== END: Runtime =====
@@ -0,0 +1,129 @@
+import calendar
+
+from scripts.scheduler import (ScheduleIndex, ScheduleTable, SetpointRamp, parse_date, parse_days, _Ranges,
+                               day_number, ALL_DAYS)
+
+def at(y, mo, d, h=12, mi=0):
+    """Epoch seconds for a local time (the RTC holds local time)."""
+    return calendar.timegm((y, mo, d, h, mi, 0))
+
+def name_at(index, *when):
+    schedule = index.active(at(*when))
+    return schedule['name'] if schedule else None
+
+PLAIN = [
+    {'time': '06:00', 'name': 'Day', 'heater_target': 70.0},
+    {'time': '22:00', 'name': 'Night', 'heater_target': 62.0},
+]
+WINTER = [
+    {'time': '07:00', 'name': 'WinterDay', 'from': '12-01', 'until': '02-28', 'heater_target': 66.0},
+]
+
+# ===== START: Parsing =====
+def test_parse_days_and_dates():
+    assert parse_days(None) == ALL_DAYS
+    assert parse_days('Mon, sat') == 0b0100001
+    assert parse_date('2025-12-24') == (True, day_number(2025, 12, 24))
+    assert parse_date('12-24') == (False, 12 * 32 + 24)
+    assert parse_date('13-01') is None
+    assert day_number(2000, 1, 1) == 0
+    assert day_number(2025, 3, 1) - day_number(2025, 2, 28) == 1
+    assert day_number(2024, 3, 1) - day_number(2024, 2, 28) == 2
+# ===== END: Parsing =====
+
+# ===== START: ScheduleTable =====
+def test_table_before_after_and_equal_times():
+    a = {'time': '08:00', 'name': 'A'}
+    b = {'time': '08:00', 'name': 'B'}
+    c = {'time': '18:30', 'name': 'C'}
+    table = ScheduleTable([c, a, b, {'time': 'bad'}])
+    assert len(table) == 3
+    assert table.before(7 * 60) is None
+    assert table.before(8 * 60) is b  # Later entry at the same minute wins
+    assert table.after(8 * 60) == (18 * 60 + 30, c)
+    assert table.after(0) == (8 * 60, b)
+    assert table.after(19 * 60) is None
+# ===== END: ScheduleTable =====
+
+# ===== START: ScheduleIndex =====
+def test_yearly_range_wraps_past_new_year():
+    index = ScheduleIndex(PLAIN + WINTER)
+    assert name_at(index, 2025, 11, 30) == 'Day'
+    assert name_at(index, 2025, 12, 1, 12) == 'WinterDay'
+    assert name_at(index, 2025, 12, 31, 23, 59) == 'WinterDay'
+    assert name_at(index, 2026, 1, 1, 12) == 'WinterDay'
+    assert name_at(index, 2026, 2, 28, 12) == 'WinterDay'
+    assert name_at(index, 2026, 3, 1, 12) == 'Day'
+
+def test_before_first_transition_previous_day_carries_over():
+    index = ScheduleIndex(PLAIN + WINTER)
+    assert name_at(index, 2025, 12, 1, 3) == 'Night'       # Nov 30 (plain) ended on Night
+    assert name_at(index, 2026, 1, 1, 3) == 'WinterDay'    # Dec 31 is winter too
+    assert name_at(index, 2026, 3, 1, 3) == 'WinterDay'    # Feb 28's last entry
+    assert name_at(index, 2026, 3, 1, 6) == 'Day'
+
+def test_dated_beats_yearly_beats_plain():
+    vacation = {'time': '00:00', 'name': 'Away', 'from': '2025-12-20', 'until': '2026-01-03'}
+    index = ScheduleIndex(PLAIN + WINTER + [vacation])
+    assert name_at(index, 2025, 12, 19, 12) == 'WinterDay'
+    assert name_at(index, 2025, 12, 20, 12) == 'Away'
+    assert name_at(index, 2026, 1, 3, 23) == 'Away'
+    assert name_at(index, 2026, 1, 4, 12) == 'WinterDay'
+    # One-off ranges don't repeat the next year
+    assert name_at(index, 2026, 12, 25, 12) == 'WinterDay'
+
+def test_weekday_filter_and_shared_tables():
+    weekend = {'time': '09:00', 'name': 'Lazy', 'days': ['sat', 'sun']}
+    index = ScheduleIndex(PLAIN + [weekend])
+    # 2025-06-07 is a Saturday
+    assert name_at(index, 2025, 6, 6, 10) == 'Day'
+    assert name_at(index, 2025, 6, 7, 10) == 'Lazy'
+    assert name_at(index, 2025, 6, 9, 10) == 'Day'
+    assert index.tables == 2  # Weekdays share one table, the weekend another
+
+def test_bad_range_skipped():
+    index = ScheduleIndex(PLAIN + [{'time': '07:00', 'name': 'X', 'from': '2025-05-01', 'until': '2025-04-01'}])
+    assert len(index) == 2
+
+def test_next_change_crosses_days():
+    weekend = {'time': '09:00', 'name': 'Lazy', 'days': ['sat']}
+    index = ScheduleIndex([weekend])
+    minutes, schedule = index.next_change(at(2025, 6, 5, 10))   # Thursday 10:00
+    assert schedule is weekend
+    assert minutes == 2 * 1440 - 60
+    assert ScheduleIndex([]).next_change(at(2025, 6, 5)) == (None, None)
+    assert ScheduleIndex([]).active(at(2025, 6, 5)) is None
+# ===== END: ScheduleIndex =====
+
+def close(ramp, got, want):
+    """Slopes are truncated to centi-°F per 1000 s, so values may trail by up to span / 1000 centi-°F."""
+    return all(abs(g - w) <= ramp.span // 1000 + 1 for g, w in zip(got, want))
+
+def test_setpoint_ramp_endpoints():
+    ramp = SetpointRamp(None, 1000, 1000 + 3600, 8000, 7500, 6000, 7200)
+    assert ramp.at(0) == (8000, 6000)
+    assert close(ramp, ramp.at(1000 + 1800), (7750, 6600))
+    assert close(ramp, ramp.at(1000 + 3600), (7500, 7200))
+    assert ramp.at(10 ** 6) == ramp.at(1000 + 3600)
+
+def test_ranges_resolve_overlaps_in_one_search():
+    # 84 past one-day exceptions, a long range with a nested one, and a tie on start
+    ranges = [(day_number(2025, 1, 1) + 2 * n, day_number(2025, 1, 1) + 2 * n, 'day{}'.format(n))
+              for n in range(84)]
+    season = (day_number(2025, 3, 1), day_number(2025, 12, 31), 'season')
+    nested = (day_number(2025, 6, 1), day_number(2025, 6, 10), 'nested')
+    tie = (day_number(2025, 6, 1), day_number(2025, 6, 3), 'tie')
+    ranges += [season, nested, tie]
+    table = _Ranges(ranges)
+
+    def brute(key):
+        covering = [(start, n, week) for n, (start, end, week) in enumerate(ranges) if start <= key <= end]
+        return max(covering)[2] if covering else None
+
+    for key in range(day_number(2024, 12, 1), day_number(2026, 2, 1)):
+        assert table.find(key) == brute(key)
+    assert table.find(day_number(2025, 6, 1)) == 'tie'
+    assert table.find(day_number(2025, 6, 5)) == 'nested'
+    assert table.find(day_number(2025, 6, 11)) == 'season'
+    assert len(table) == 87
+    assert len(table.starts) <= 2 * len(ranges)